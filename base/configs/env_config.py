@@ -1,4 +1,4 @@
-from typing import Dict, Literal
+from typing import Dict, List, Literal
 from urllib.parse import urlparse, urlunparse
 from autogen_ext.tools.mcp import (
     McpServerParams,
@@ -49,6 +49,41 @@ class PMCAEnvConfig(BaseSettings):
         ...,
         description="LLM服务类型: 'openai' (适用于所有在线/VLLM服务) 或 'ollama' (本地)",
     )
+    # 按 (provider, model, base_url) 复用 LLM 客户端及其 HTTP 连接池
+    LLM_CLIENT_POOL: bool = True
+    # 确定性调用的响应缓存：none / redis / disk；按能力开启，也可由智能体元数据 llm_cache 单独指定
+    LLM_CACHE_BACKEND: Literal["none", "redis", "disk"] = "none"
+    LLM_CACHE_ABILITIES: List[str] = []
+    LLM_CACHE_TTL_SECONDS: int = 7 * 86400
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_PATH: str = ".cache/llm_cache.sqlite"
+    # 逐次调用计量（token / 时延 / 首 token 时延），按任务与智能体聚合
+    LLM_METRICS: bool = True
+    # 调用治理：按 provider 的 RPM / TPM 令牌桶与在途并发上限排队，优先级 critical > normal > bulk
+    # 默认不限制；例：{"deepseek": {"rpm": 60, "tpm": 200000}, "ollama": {"concurrency": 1}}
+    # （ollama 设 concurrency=1 会串行化进程内全部 Ollama 调用，仅在单卡本地部署需要时开启）
+    LLM_GOVERNOR: bool = True
+    LLM_PROVIDER_LIMITS: Dict[str, Dict[str, int]] = {}
+    # 对冲请求：主模型首 token 超过其近期时延的 LLM_HEDGE_PERCENTILE 分位时，同时请求备用模型
+    LLM_HEDGE: bool = False
+    LLM_HEDGE_PERCENTILE: float = 0.95
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_DEFAULT_DEADLINE: float = 8.0
+    # 显式指定对冲目标，例：{"deepseek:deepseek-chat": "qwen:qwen-max-latest"}
+    LLM_HEDGE_TARGETS: Dict[str, str] = {}
+    # 录制 / 回放：record 把每次调用追加到 LLM_RECORD_PATH，replay 从中回放而不访问模型服务
+    LLM_RECORD_MODE: Literal["off", "record", "replay"] = "off"
+    LLM_RECORD_PATH: str = ".cache/llm_records.jsonl"
+    # 回放时键未命中是否报错；false 时按同一模型的录制顺序回放
+    LLM_REPLAY_STRICT: bool = True
+    LLM_REPLAY_LATENCY: Literal["none", "recorded", "lognormal"] = "none"
+    LLM_REPLAY_LATENCY_SCALE: float = 1.0
+    # 上下文管理：unbounded / window / head_tail / summary；智能体元数据可单独覆盖
+    LLM_CONTEXT_STRATEGY: Literal["unbounded", "window", "head_tail", "summary"] = (
+        "unbounded"
+    )
+    # 历史消息预算占模型上下文窗口的比例
+    LLM_CONTEXT_BUDGET_RATIO: float = 0.5
 
     # --- 不同能力的默认模型分配 ---
     DEFAULT_PROVIDER: str
@@ -74,7 +109,16 @@ class PMCAEnvConfig(BaseSettings):
     # --- Routing 配置 ---
     TRIAGE_MAX_TURNS: int
     COMPLEX_EXECUTOR_MAX_TURNS: int
+    # 复杂任务执行团队：能由规则确定下一发言人时不调用 LLM 选择器
+    COMPLEX_EXECUTOR_RULE_SELECTOR: bool = True
+    # 复杂任务执行团队：同时构建的 swarm 团队数量上限
+    COMPLEX_EXECUTOR_SETUP_CONCURRENCY: int = 4
     SWARM_MAX_TURNS: int
+    # swarm 内的智能体惰性构建：只有实际发言的智能体才会创建模型客户端 / 记忆 / 工具
+    SWARM_LAZY_ASSISTANTS: bool = True
+    # 分诊过程中投机预热被点到的智能体（模型客户端 / 记忆 / MCP 会话），分诊结果产出后丢弃未选中的
+    ASSISTANT_PREWARM: bool = True
+    ASSISTANT_PREWARM_CONCURRENCY: int = 4
 
     # --- Redis Cache配置信息 ---
     REDIS_HOST: str
@@ -82,8 +126,47 @@ class PMCAEnvConfig(BaseSettings):
     REDIS_DB: int
     REDIS_PASSWORD: str | None
 
+    # --- Task Workbench 配置 ---
+    # redis：跨进程共享；memory：进程内存储（单机部署/基准测试，无需 Redis）
+    WORKBENCH_BACKEND: Literal["redis", "memory"] = "redis"
+    WORKBENCH_CODEC: Literal["json", "orjson", "msgpack"] = "orjson"
+    WORKBENCH_COMPRESSION: Literal["none", "zstd", "lz4"] = "zstd"
+    WORKBENCH_COMPRESSION_THRESHOLD: int = 4096
+    # 进程内读穿缓存（跨进程写入经 Redis Pub/Sub 失效）
+    WORKBENCH_LOCAL_CACHE: bool = False
+    # 生命周期：写入时刷新 TTL（0 不过期）；单任务字节预算（0 不限制）
+    WORKBENCH_TTL_SECONDS: int = 86400
+    WORKBENCH_MAX_BYTES: int = 0
+    # 已结束任务的 SQLite 归档文件（为空则不归档）
+    WORKBENCH_ARCHIVE_PATH: str | None = None
+
+    # --- Mem0 记忆配置 ---
+    # 各智能体集合的 mem0 Memory 共享嵌入模型 / LLM / 图存储 / 历史库 / Qdrant 客户端
+    MEM0_SHARE_CLIENTS: bool = True
+    # 启动时的记忆初始化：lazy 首次使用时创建；prewarm 在线程池中并发预热，
+    # 最多等待 MEM0_INIT_DEADLINE_SECONDS（0 表示等全部完成），未完成的在后台继续
+    MEM0_INIT_MODE: Literal["lazy", "prewarm"] = "lazy"
+    MEM0_INIT_CONCURRENCY: int = 4
+    MEM0_INIT_DEADLINE_SECONDS: float = 30.0
+    # 嵌入向量缓存：键为 (嵌入模型, 归一化文本 hash)，进程内 LRU + 可选持久层（disk / redis）
+    # LRU 中向量按 float32 存放，1024 维约 4 KiB/条（5000 条约 20 MiB）
+    MEM0_EMBED_CACHE: bool = True
+    MEM0_EMBED_CACHE_MAX_ENTRIES: int = 5000
+    MEM0_EMBED_CACHE_BACKEND: Literal["none", "disk", "redis"] = "none"
+    MEM0_EMBED_CACHE_TTL_SECONDS: int = 30 * 86400
+    MEM0_EMBED_CACHE_PATH: str = ".cache/embedding_cache.sqlite"
+    # 检索结果缓存：按集合缓存，记忆工具写入时失效；TTL 兜底其他进程的写入（0 不过期）
+    MEM0_SEARCH_CACHE: bool = True
+    MEM0_SEARCH_CACHE_MAX_ENTRIES: int = 256
+    MEM0_SEARCH_CACHE_TTL_SECONDS: int = 300
+
     # Mcp-Server Infos
     MCP_TIMEOUT: int
+    # 进程级 MCP 会话池：每个服务只连接一次，跨任务共享
+    MCP_POOL: bool = True
+    MCP_POOL_MAX_CONCURRENCY: int = 4
+    MCP_POOL_TOOLS_TTL_SECONDS: int = 300
+    MCP_POOL_KEEPALIVE_SECONDS: int = 60
     FUNCTIONAL_MCP_SERVER: str
 
     MCP_SERVER_EXCEL: str
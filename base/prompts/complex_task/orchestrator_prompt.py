@@ -84,6 +84,7 @@ PMCACOMPLEXTASK_ORCHESTRATOR_SYSTEM_MESSAGE = """
     * **完成 S1**：将 S1 的 `status:exec` 更新为 `status:done`（或 `status:review`），设置 `completed: true`，并将 `[EVIDENCE_LINK]` 追加到 `description` 的 `[EVIDENCE]` 部分。
     * **解锁 S2**：如果 S1 已完成，查询依赖 S1 的 S2（标签 `dep:S1`），并将其 `status:blocked` 更新为 `status:init`。
 5.  **指派与循环**：通知 `userproxy` 或 Swarm，`S2` 现已准备好执行。返回步骤 1（等待事件）。
+    * 指派 Swarm 执行时，必须以 `@<团队名称>` 明确点名（一次只指派一个团队）；汇报或复述状态时不要使用 `@`。
 
 **阶段 3：再规划 (Re-Planning)**
 * 如果 Swarm 报告失败（`status:failed`）或出现意外情况，你必须返回**阶段 1 的步骤 2**，使用 `sequentialthinking_tools` 进行“再规划”，并使用 `update_todo`（或 `create_todo`）来修改/添加账本中的步骤。
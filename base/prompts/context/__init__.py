@@ -0,0 +1,5 @@
+from .summary_prompt import PMCACONTEXT_SUMMARY_PROMPT
+
+__all__ = [
+    "PMCACONTEXT_SUMMARY_PROMPT",
+]
@@ -2,23 +2,38 @@ from .task_context import PMCATaskContext
 from .system_workbench import (
     PMCATaskWorkbenchManager,
     PMCATaskWorkbench,
+    PMCAWorkbenchInvalidator,
+    PMCAWorkbenchPolicy,
 )
+from .workbench_archive import PMCAWorkbenchArchiver
+from .workbench_memory import PMCAInMemoryTaskWorkbench
+from .workbench_codec import PMCAValueCodec
 from .system_runtime import PMCARuntime
 from .system_blackboard import (
     PMCABlackboardManager,
     PMCABlackboardRuntime,
     init_task_blackboard,
 )
-from .blackboard_router import BlackboardCondition, RouterPolicy
+from .blackboard_router import (
+    BlackboardCondition,
+    RouterDecisionTrace,
+    RouterPolicy,
+)
 
 __all__ = [
     "PMCATaskContext",
     "PMCATaskWorkbenchManager",
     "PMCATaskWorkbench",
+    "PMCAInMemoryTaskWorkbench",
+    "PMCAWorkbenchInvalidator",
+    "PMCAWorkbenchPolicy",
+    "PMCAWorkbenchArchiver",
+    "PMCAValueCodec",
     "PMCARuntime",
     "PMCABlackboardManager",
     "PMCABlackboardRuntime",
     "BlackboardCondition",
     "RouterPolicy",
+    "RouterDecisionTrace",
     "init_task_blackboard",
 ]
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
+
+from loguru import logger
 
 from .task_context import PMCATaskContext
 
@@ -19,16 +23,76 @@ class BlackboardCondition:
         self.predicate = predicate
         self.timeout = timeout
         self.poll_interval = poll_interval
+        # 每个任务已检查过的最后一条事件 id（增量游标）
+        self._cursors: Dict[str, str] = {}
+
+    def release(self, task_id: str) -> None:
+        """丢弃某个任务的游标；任务结束（PMCATaskContext.close）时自动调用。"""
+        self._cursors.pop(task_id, None)
+
+    def _evaluate(self, event: Optional[Dict[str, Any]]) -> bool:
+        if not event:
+            return False
+        try:
+            return bool(self.predicate(event))
+        except Exception:
+            return False
+
+    async def _check_new_events(self, ctx: PMCATaskContext, manager: Any) -> bool:
+        """Evaluate the predicate against events newer than the cursor.
+
+        The first check for a task only looks at the latest event, which
+        matches the behaviour of the original polling implementation.
+        """
+        cursor = self._cursors.get(ctx.task_id)
+        try:
+            if cursor is None:
+                latest = await manager.get_latest_entry(self.topic_type)
+                entries = [latest] if latest else []
+                # 空历史：之后的任何事件都算“新事件”，从头读取
+                self._cursors[ctx.task_id] = ""
+                ctx.add_close_callback(lambda: self.release(ctx.task_id))
+            else:
+                entries = await manager.get_range(self.topic_type, since=cursor or None)
+        except Exception:
+            return False
+
+        for entry_id, event in entries:
+            self._cursors[ctx.task_id] = entry_id
+            if self._evaluate(event):
+                return True
+        return False
 
     async def __call__(self, ctx: PMCATaskContext) -> bool:
-        """Evaluate the predicate against the latest event.
+        """Evaluate the predicate against events the condition has not seen yet.
 
         If ``timeout`` > 0, this method waits for up to ``timeout``
-        seconds for an event of the specified type to appear in the
-        workbench.  If no event is found after the timeout, the
-        condition returns ``False``.
+        seconds for a matching event of the specified type.  Waiting is
+        driven by the blackboard's in-process write notifications, so the
+        condition wakes up as soon as an event is stored instead of
+        polling Redis.  If no matching event arrives before the timeout,
+        the condition returns ``False``.
+
+        Without an initialised blackboard on ``ctx`` the condition falls
+        back to polling the workbench every ``poll_interval`` seconds.
         """
+        manager = getattr(ctx, "_blackboard_manager", None)
+        if manager is None:
+            return await self._poll_workbench(ctx)
 
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(self.timeout, 0.0)
+        while True:
+            # 先记录版本号再读取，避免读取与等待之间的写入被漏掉
+            seen_version = manager.version(self.topic_type)
+            if await self._check_new_events(ctx, manager):
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await manager.wait_for_update(self.topic_type, seen_version, remaining)
+
+    async def _poll_workbench(self, ctx: PMCATaskContext) -> bool:
         async def get_latest() -> Optional[Dict[str, Any]]:
             try:
                 key = f"BLACKBOARD:{self.topic_type}"
@@ -36,41 +100,82 @@ class BlackboardCondition:
             except Exception:
                 return None
 
-        async def evaluate(event: Optional[Dict[str, Any]]) -> bool:
-            if not event:
-                return False
-            try:
-                return bool(self.predicate(event))
-            except Exception:
-                return False
-
         # If no wait is requested, check once and return
         if self.timeout <= 0:
-            event = await get_latest()
-            return await evaluate(event)
+            return self._evaluate(await get_latest())
 
         # Otherwise poll until a matching event or timeout
         deadline = asyncio.get_event_loop().time() + self.timeout
         while True:
-            event = await get_latest()
-            if await evaluate(event):
+            if self._evaluate(await get_latest()):
                 return True
             if asyncio.get_event_loop().time() >= deadline:
                 return False
             await asyncio.sleep(self.poll_interval)
 
 
+# sequential：按顺序逐条 await（原始行为）
+# concurrent：并发评估全部规则，按优先级（注册顺序）短路返回
+# first_event：并发评估全部规则，最先为 True 的规则胜出
+RouterMode = Literal["sequential", "concurrent", "first_event"]
+
+
+@dataclass
+class RuleTrace:
+    """Outcome of a single rule within one ``RouterPolicy.decide`` call."""
+
+    target: str
+    status: str = "pending"  # matched / unmatched / error / cancelled / pending
+    elapsed: Optional[float] = None
+
+
+@dataclass
+class RouterDecisionTrace:
+    """Per-decision latency trace produced by ``RouterPolicy.decide``."""
+
+    mode: str
+    winner: Optional[str] = None
+    elapsed: float = 0.0
+    rules: List[RuleTrace] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "winner": self.winner,
+            "elapsed": self.elapsed,
+            "rules": [
+                {"target": r.target, "status": r.status, "elapsed": r.elapsed}
+                for r in self.rules
+            ],
+        }
+
+
 class RouterPolicy:
     """Implements a simple conditional router over multiple branches.
 
     A ``RouterPolicy`` holds an ordered list of condition/target pairs.
-    When ``decide`` is called, each condition is awaited in sequence
-    and, if it evaluates to ``True``, the corresponding target name is
-    returned.  If no conditions match, ``RuntimeError`` is raised.
+    The registration order is the rule priority.  How ``decide``
+    evaluates the rules depends on ``mode``:
+
+    - ``"sequential"``: each condition is awaited in sequence and the
+      first one that evaluates to ``True`` wins.
+    - ``"concurrent"``: all conditions run concurrently; the
+      highest-priority matching target is returned as soon as every
+      higher-priority rule has evaluated to ``False``, and the remaining
+      conditions are cancelled.  Worst-case latency is the longest
+      timeout rather than their sum.
+    - ``"first_event"``: all conditions run concurrently and whichever
+      evaluates to ``True`` first wins, regardless of priority.  Useful
+      for routers driven by blackboard topics.
+
+    If no conditions match, ``RuntimeError`` is raised.  The trace of the
+    most recent decision is available as ``last_trace``.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, mode: RouterMode = "sequential") -> None:
         self._rules: List[Tuple[Callable[[PMCATaskContext], Awaitable[bool]], str]] = []
+        self.mode: RouterMode = mode
+        self.last_trace: Optional[RouterDecisionTrace] = None
 
     def when(
         self, condition: Callable[[PMCATaskContext], Awaitable[bool]], goto: str
@@ -96,7 +201,7 @@ class RouterPolicy:
         return self
 
     async def decide(self, ctx: PMCATaskContext) -> str:
-        """Evaluate routing rules and return the first matching target.
+        """Evaluate routing rules and return the matching target.
 
         Parameters
         ----------
@@ -113,11 +218,81 @@ class RouterPolicy:
         RuntimeError
             If none of the conditions match.
         """
-        for cond, target in self._rules:
-            try:
-                if await cond(ctx):
-                    return target
-            except Exception:
-                # Skip faulty conditions
-                continue
-        raise RuntimeError("RouterPolicy: no rule matched")
+        trace = RouterDecisionTrace(
+            mode=self.mode, rules=[RuleTrace(target) for _, target in self._rules]
+        )
+        started = time.perf_counter()
+        try:
+            if self.mode == "sequential":
+                winner = await self._decide_sequential(ctx, trace, started)
+            else:
+                winner = await self._decide_concurrent(ctx, trace, started)
+            trace.winner = winner
+        finally:
+            trace.elapsed = time.perf_counter() - started
+            self.last_trace = trace
+            logger.debug(f"[RouterPolicy] decision trace: {trace.to_dict()}")
+
+        if winner is None:
+            raise RuntimeError("RouterPolicy: no rule matched")
+        return winner
+
+    @staticmethod
+    async def _evaluate_rule(
+        cond: Callable[[PMCATaskContext], Awaitable[bool]],
+        ctx: PMCATaskContext,
+        rule: RuleTrace,
+        started: float,
+    ) -> bool:
+        try:
+            matched = bool(await cond(ctx))
+            rule.status = "matched" if matched else "unmatched"
+            return matched
+        except asyncio.CancelledError:
+            rule.status = "cancelled"
+            raise
+        except Exception:
+            # Faulty conditions count as unmatched
+            rule.status = "error"
+            return False
+        finally:
+            rule.elapsed = time.perf_counter() - started
+
+    async def _decide_sequential(
+        self, ctx: PMCATaskContext, trace: RouterDecisionTrace, started: float
+    ) -> Optional[str]:
+        for (cond, target), rule in zip(self._rules, trace.rules):
+            if await self._evaluate_rule(cond, ctx, rule, started):
+                return target
+        return None
+
+    async def _decide_concurrent(
+        self, ctx: PMCATaskContext, trace: RouterDecisionTrace, started: float
+    ) -> Optional[str]:
+        tasks = [
+            asyncio.ensure_future(self._evaluate_rule(cond, ctx, rule, started))
+            for (cond, _), rule in zip(self._rules, trace.rules)
+        ]
+        try:
+            if self.mode == "first_event":
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    # 同一轮完成的多个规则中仍按优先级取胜者
+                    for index, task in enumerate(tasks):
+                        if task in done and task.result():
+                            return self._rules[index][1]
+                return None
+
+            # concurrent：按优先级依次等待，较高优先级规则未决时不返回
+            for index, task in enumerate(tasks):
+                if await task:
+                    return self._rules[index][1]
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,6 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Type, TYPE_CHECKING
+import asyncio
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
+)
 
 from autogen_core import (
     RoutedAgent,
@@ -22,23 +34,29 @@ if TYPE_CHECKING:
 _BLACKBOARD_META_KEY = "blackboard:__meta__"
 _MAX_BLACKBOARD_HISTORY_LEN = 500
 
+# stream：每个事件一次 XADD（带 MAXLEN 裁剪），读取按需增量
+# list：旧模式，整表读出 -> 追加 -> 截断 -> 整表写回（保留以兼容已有数据）
+BlackboardStorageMode = Literal["stream", "list"]
+
 
 async def init_task_blackboard(
     ctx: "PMCATaskContext",
     event_classes: List[Type[PMCAEvent]],
     *,
     max_inbox: int = 1000,
+    storage_mode: BlackboardStorageMode = "stream",
 ) -> None:
     """
     初始化黑板：为 ctx 创建并注册 PMCABlackboardManager。
     event_classes: 需要订阅的事件类型列表。
+    storage_mode: 事件历史的存储方式（见 BlackboardStorageMode）。
     若已初始化，则直接返回。
     """
     # 若已经有 manager，直接返回
     if hasattr(ctx, "_blackboard_manager") and ctx._blackboard_manager:  # type: ignore
         return
 
-    manager = PMCABlackboardManager(ctx, enable_storage=True)
+    manager = PMCABlackboardManager(ctx, enable_storage=True, storage_mode=storage_mode)
     # 注册事件类型
     for evt_cls in event_classes:
         manager.register_event_type(evt_cls)
@@ -90,15 +108,27 @@ class BlackboardStorage:
 
 
 class PMCABlackboardManager:
-    def __init__(self, ctx: PMCATaskContext, *, enable_storage: bool = True) -> None:
+    def __init__(
+        self,
+        ctx: PMCATaskContext,
+        *,
+        enable_storage: bool = True,
+        storage_mode: BlackboardStorageMode = "stream",
+        max_history_len: int = _MAX_BLACKBOARD_HISTORY_LEN,
+    ) -> None:
         self._ctx = ctx
         self._runtime: SingleThreadedAgentRuntime = ctx.task_runtime
         self._enable_storage = enable_storage
+        self._storage_mode = storage_mode
+        self._max_history_len = max_history_len
         self._registered: bool = False
         self._event_types: Dict[str, Type[PMCAEvent]] = {}
         self._on_receive: Optional[
             Callable[[PMCAEvent, MessageContext], Awaitable[None]]
         ] = None
+        # 写入通知：每个 topic 一个单调递增版本号 + asyncio.Condition
+        self._versions: Dict[str, int] = {}
+        self._conditions: Dict[str, asyncio.Condition] = {}
 
     def register_event_type(self, event_cls: Type[PMCAEvent]) -> None:
         """
@@ -124,18 +154,36 @@ class PMCABlackboardManager:
         topic = TopicId(type=pmca_event.topic_type, source=pmca_event.task_id)
         await self._runtime.publish_message(pmca_event, topic_id=topic)
 
+    @staticmethod
+    def _history_key(topic_type: str) -> str:
+        return f"BLACKBOARD:{topic_type}"
+
+    @staticmethod
+    def _seq_key(topic_type: str) -> str:
+        # list 模式下该类事件累计写入的条数（不随截断回退），用于计算单调递增的 entry_id
+        return f"BLACKBOARD_SEQ:{topic_type}"
+
     async def _store_event(self, pmca_event: PMCAEvent) -> None:
         if not self._enable_storage:
             return
         wb = self._ctx.task_workbench
-        key = f"BLACKBOARD:{pmca_event.topic_type}"
         try:
-            history: List[Dict[str, Any]] = (await wb.get_item(key)) or []
+            if self._storage_mode == "stream":
+                await wb.append_event(
+                    pmca_event.topic_type,
+                    pmca_event.to_dict(),
+                    maxlen=self._max_history_len,
+                )
+                return
+
+            key = self._history_key(pmca_event.topic_type)
+            seq_key = self._seq_key(pmca_event.topic_type)
+            history, total = await self._load_history_with_total(pmca_event.topic_type)
             history.append(pmca_event.to_dict())
-            # Keep only the most recent 500 events per type to bound memory
-            if len(history) > _MAX_BLACKBOARD_HISTORY_LEN:
-                history = history[-_MAX_BLACKBOARD_HISTORY_LEN:]
-            await wb.set_item(key, history)
+            # Keep only the most recent events per type to bound memory
+            if len(history) > self._max_history_len:
+                history = history[-self._max_history_len :]
+            await wb.set_many({key: history, seq_key: total + 1})
         except Exception as exc:
             try:
                 from loguru import logger  # type: ignore
@@ -146,6 +194,108 @@ class PMCABlackboardManager:
             except Exception:
                 print(f"[Blackboard] failed to store event {pmca_event}: {exc}")
 
+    async def _load_history(self, topic_type: str) -> List[Dict[str, Any]]:
+        """list 模式下读取整表历史。"""
+        return (
+            await self._ctx.task_workbench.get_item(self._history_key(topic_type))
+        ) or []
+
+    async def _load_history_with_total(
+        self, topic_type: str
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        list 模式下读取整表历史及累计写入条数；history[i] 的序号为 total - len(history) + i。
+        旧数据没有计数键时按未截断处理（序号即下标）。
+        """
+        key, seq_key = self._history_key(topic_type), self._seq_key(topic_type)
+        items = await self._ctx.task_workbench.get_many([key, seq_key])
+        history: List[Dict[str, Any]] = items.get(key) or []
+        total = items.get(seq_key)
+        return history, max(int(total or 0), len(history))
+
+    async def _sequenced_history(
+        self, topic_type: str
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        history, total = await self._load_history_with_total(topic_type)
+        first = total - len(history)
+        return [(first + i, evt) for i, evt in enumerate(history)]
+
+    async def get_latest(self, topic_type: str) -> Optional[Dict[str, Any]]:
+        """
+        读取某类事件的最新一条；stream 模式下不加载历史。
+        """
+        entry = await self.get_latest_entry(topic_type)
+        return entry[1] if entry else None
+
+    async def get_latest_entry(
+        self, topic_type: str
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        同 get_latest，但连同 entry_id 一起返回，便于后续以 get_range(since) 增量读取。
+        """
+        if self._storage_mode == "stream":
+            return await self._ctx.task_workbench.latest_event(topic_type)
+        history = await self._sequenced_history(topic_type)
+        return (str(history[-1][0]), history[-1][1]) if history else None
+
+    async def get_range(
+        self, topic_type: str, since: Optional[str] = None
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        读取 since 之后（不含）的事件，返回 (entry_id, event) 列表。
+        since 取自上一次返回的 entry_id；为空时返回全部保留的历史。
+        list 模式下 entry_id 为该类事件的写入序号（单调递增，截断历史后不变）。
+        """
+        if self._storage_mode == "stream":
+            return await self._ctx.task_workbench.events_since(topic_type, since)
+        history = await self._sequenced_history(topic_type)
+        start = int(since) + 1 if since is not None else 0
+        return [(str(seq), evt) for seq, evt in history if seq >= start]
+
+    async def count(self, topic_type: str) -> int:
+        """
+        当前保留的某类事件条数；stream 模式下为 XLEN。
+        """
+        if self._storage_mode == "stream":
+            return await self._ctx.task_workbench.event_count(topic_type)
+        return len(await self._load_history(topic_type))
+
+    def _condition(self, topic_type: str) -> asyncio.Condition:
+        cond = self._conditions.get(topic_type)
+        if cond is None:
+            cond = self._conditions[topic_type] = asyncio.Condition()
+        return cond
+
+    def version(self, topic_type: str) -> int:
+        """
+        某类事件在本进程内的写入版本号；每存储一条事件加一。
+        """
+        return self._versions.get(topic_type, 0)
+
+    async def _notify_event(self, topic_type: str) -> None:
+        cond = self._condition(topic_type)
+        async with cond:
+            self._versions[topic_type] = self.version(topic_type) + 1
+            cond.notify_all()
+
+    async def wait_for_update(
+        self, topic_type: str, seen_version: int, timeout: Optional[float]
+    ) -> bool:
+        """
+        等待某类事件的版本号超过 seen_version（即有新事件写入），不轮询 Redis。
+        超时返回 False。
+        """
+        cond = self._condition(topic_type)
+        async with cond:
+            try:
+                await asyncio.wait_for(
+                    cond.wait_for(lambda: self.version(topic_type) != seen_version),
+                    timeout,
+                )
+                return True
+            except asyncio.TimeoutError:
+                return False
+
     async def register_runtime(
         self,
         agent_type: str = "PMCABlackboard",
@@ -207,6 +357,7 @@ class PMCABlackboardRuntime(RoutedAgent):
             self._inbox = self._inbox[-self._max_inbox :]
 
         await self._manager._store_event(event)
+        await self._manager._notify_event(event.topic_type)
 
         if self._manager._on_receive:
             try:
@@ -1,12 +1,16 @@
 import asyncio
-from typing import TYPE_CHECKING, List, Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Type
 import uuid
 from autogen_core import SingleThreadedAgentRuntime
 from loguru import logger
 from redis import asyncio as aioredis
 
 from base.configs import PMCASystemEnvConfig
+from core.client.instrumentation import context_metrics, llm_metrics
 from core.client.llm_factory import LLMFactory
+from core.client.response_cache import create_llm_cache_store
+from core.tools.common.mcp_pool import close_mcp_session_pool
 from core.tools.factory.tool_registry import PMCAToolRegistry
 from core.tools.memory.mem0.provider import PMCAMem0ToolsProvider
 
@@ -16,7 +20,13 @@ if TYPE_CHECKING:
 from core.memory.factory.mem0 import PMCAMem0LocalService
 
 from .task_context import PMCATaskContext
-from .system_workbench import PMCATaskWorkbenchManager
+from .system_workbench import (
+    PMCATaskWorkbenchManager,
+    PMCAWorkbenchInvalidator,
+    PMCAWorkbenchPolicy,
+)
+from .workbench_archive import PMCAWorkbenchArchiver
+from .workbench_codec import PMCAValueCodec
 from .system_blackboard import init_task_blackboard
 
 from .event.system_event import PMCAEvent
@@ -28,7 +38,11 @@ class PMCARuntime:
     _instance = None
     _init_lock = asyncio.Lock()
 
-    redis: aioredis.Redis
+    redis: Optional[aioredis.Redis] = None
+    workbench_codec: PMCAValueCodec
+    workbench_invalidator: Optional[PMCAWorkbenchInvalidator] = None
+    workbench_policy: PMCAWorkbenchPolicy
+    workbench_archiver: Optional[PMCAWorkbenchArchiver] = None
     llm_factory: LLMFactory
 
     def __new__(cls):
@@ -41,17 +55,33 @@ class PMCARuntime:
             if getattr(self, "_initialized", False):
                 return
 
-            self.redis = aioredis.Redis(
-                host=PMCASystemEnvConfig.REDIS_HOST,
-                port=PMCASystemEnvConfig.REDIS_PORT,
-                db=PMCASystemEnvConfig.REDIS_DB,
-                password=PMCASystemEnvConfig.REDIS_PASSWORD,
-                decode_responses=True,
+            if PMCASystemEnvConfig.WORKBENCH_BACKEND == "redis":
+                self.redis = aioredis.Redis(
+                    host=PMCASystemEnvConfig.REDIS_HOST,
+                    port=PMCASystemEnvConfig.REDIS_PORT,
+                    db=PMCASystemEnvConfig.REDIS_DB,
+                    password=PMCASystemEnvConfig.REDIS_PASSWORD,
+                    # 工作台的值由 PMCAValueCodec 编码为 bytes（可能被压缩）
+                    decode_responses=False,
+                )
+                await self.redis.ping()
+                logger.success("Redis connected.")
+            else:
+                logger.info("Workbench backend: in-process memory (Redis skipped).")
+
+            self.workbench_codec = PMCAValueCodec.from_config(PMCASystemEnvConfig)
+            self.workbench_policy = PMCAWorkbenchPolicy.from_config(PMCASystemEnvConfig)
+            self.workbench_archiver = PMCAWorkbenchArchiver.from_config(
+                PMCASystemEnvConfig
             )
-            await self.redis.ping()
-            logger.success("Redis connected.")
+            if self.redis is not None and PMCASystemEnvConfig.WORKBENCH_LOCAL_CACHE:
+                self.workbench_invalidator = PMCAWorkbenchInvalidator(self.redis)
+                await self.workbench_invalidator.start()
 
             self.llm_factory = LLMFactory()
+            LLMFactory.set_response_cache(
+                create_llm_cache_store(PMCASystemEnvConfig, self.redis)
+            )
 
             await self._initialize_assistants_registry()
             await self._initialize_assistants_memories()
@@ -60,6 +90,45 @@ class PMCARuntime:
             self._initialized = True
             logger.success("PMCARuntime initialized.")
 
+    async def shutdown(self) -> None:
+        """释放进程级资源：LLM 客户端池、缓存失效监听、归档文件与 Redis 连接。"""
+        async with self._init_lock:
+            if not getattr(self, "_initialized", False):
+                return
+
+            await LLMFactory.close_all()
+            await close_mcp_session_pool()
+            # lazy 模式下的记忆实例在运行期间创建，退出时再汇总一次耗时
+            self._log_memory_init_timings()
+            PMCAMem0LocalService.close_all()
+            logger.info(f"LLM client pool closed: {LLMFactory.pool_stats()}")
+            governor = LLMFactory.governor()
+            if governor is not None:
+                logger.info(f"LLM governor queue wait: {governor.stats()}")
+            if PMCASystemEnvConfig.LLM_HEDGE:
+                logger.info(f"LLM hedge stats: {LLMFactory.hedger().stats()}")
+            if PMCASystemEnvConfig.LLM_RECORD_MODE != "off":
+                logger.info(
+                    f"LLM {PMCASystemEnvConfig.LLM_RECORD_MODE} stats: "
+                    f"{LLMFactory.record_store().stats.to_dict()}"
+                )
+            if LLMFactory._response_cache is not None:
+                logger.info(f"LLM cache stats: {LLMFactory.response_cache_stats()}")
+                await LLMFactory._response_cache.close()
+                LLMFactory.set_response_cache(None)
+            if self.workbench_invalidator is not None:
+                await self.workbench_invalidator.close()
+                self.workbench_invalidator = None
+            if self.workbench_archiver is not None:
+                self.workbench_archiver.close()
+                self.workbench_archiver = None
+            if self.redis is not None:
+                await self.redis.aclose()
+                self.redis = None
+
+            self._initialized = False
+            logger.success("PMCARuntime shut down.")
+
     def _log_registered_assistants(self):
         """打印日志，验证所有智能体是否已成功注册。"""
         from core.assistant.factory import PMCAAssistantFactory
@@ -76,20 +145,84 @@ class PMCARuntime:
         """读取 AgentFactory 注册表并缓存。"""
         from core.assistant.factory import PMCAAssistantFactory
 
-        self._registered_assistants = PMCAAssistantFactory.all_registered_assistants()
-        logger.info(f"Registered agents: {list(self._registered_assistants.keys())}")
+        # 构建注册表快照：元数据实例与核心智能体提示词只渲染一次，跨任务复用
+        snapshot = PMCAAssistantFactory.snapshot()
+        self._registered_assistants = dict(snapshot.metadata)
+        logger.info(
+            f"Registered agents (v{snapshot.version}): "
+            f"{list(self._registered_assistants.keys())}"
+        )
 
     async def _initialize_assistants_memories(self) -> None:
-        """为每个已注册智能体初始化 mem0。"""
-        for agent_name in self._registered_assistants.keys():
-            PMCAMem0LocalService.memory(agent_name)
+        """
+        按 MEM0_INIT_MODE 初始化各智能体的 mem0：
+        - lazy：只登记各智能体的集合，记忆实例在首次使用（智能体或记忆工具）时创建
+        - prewarm：在线程池中并发创建，最多等待 MEM0_INIT_DEADLINE_SECONDS，超时部分在后台继续
+        """
+        PMCAMem0LocalService.register_assistants(self._registered_assistants.keys())
+        if PMCASystemEnvConfig.MEM0_INIT_MODE == "lazy":
+            logger.info("Mem0 memories will be created lazily on first use.")
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, PMCASystemEnvConfig.MEM0_INIT_CONCURRENCY),
+            thread_name_prefix="mem0-init",
+        )
+        futures = {
+            loop.run_in_executor(
+                executor, PMCAMem0LocalService.memory, agent_name
+            ): agent_name
+            for agent_name in self._registered_assistants.keys()
+        }
+
+        def _report(future: asyncio.Future, name: str) -> None:
+            if not future.cancelled() and future.exception() is not None:
+                logger.warning(f"Mem0 init for {name} failed: {future.exception()}")
+
+        for future, agent_name in futures.items():
+            future.add_done_callback(lambda f, name=agent_name: _report(f, name))
+        # 不阻塞等待后台线程；已提交的任务会继续执行完
+        executor.shutdown(wait=False)
+        if not futures:
+            return
+
+        deadline = PMCASystemEnvConfig.MEM0_INIT_DEADLINE_SECONDS or None
+        _, pending = await asyncio.wait(futures, timeout=deadline)
+        if pending:
+            logger.warning(
+                f"Mem0 prewarm deadline ({deadline}s) reached, still initializing "
+                f"in background: {sorted(futures[f] for f in pending)}"
+            )
+        self._log_memory_init_timings()
+
+    def _log_memory_init_timings(self) -> None:
+        """打印各智能体记忆实例的创建耗时表（按耗时降序）。"""
+        timings = PMCAMem0LocalService.init_timings()
+        if not timings:
+            return
+        width = max(len(name) for name in timings)
+        rows = "\n".join(
+            f"  {name:<{width}}  {seconds:8.3f}s" for name, seconds in timings.items()
+        )
+        logger.info(f"Mem0 init timings ({len(timings)} assistants):\n{rows}")
 
     def create_task_context(self, mission: str = "") -> PMCATaskContext:
         """创建任务上下文（任务隔离）。"""
         from core.assistant.factory import PMCAAssistantFactory
+        from core.assistant.factory.prewarm import PMCAAssistantPrewarmer
 
         task_id = uuid.uuid4().hex[:8]
-        workbench = PMCATaskWorkbenchManager.create_workbench(task_id, self.redis)
+        workbench = PMCATaskWorkbenchManager.create_workbench(
+            task_id,
+            self.redis,
+            codec=self.workbench_codec,
+            backend=PMCASystemEnvConfig.WORKBENCH_BACKEND,
+            local_cache=PMCASystemEnvConfig.WORKBENCH_LOCAL_CACHE,
+            invalidator=self.workbench_invalidator,
+            policy=self.workbench_policy,
+            archiver=self.workbench_archiver,
+        )
         runtime = SingleThreadedAgentRuntime()
 
         task_ctx = PMCATaskContext(
@@ -103,11 +236,43 @@ class PMCARuntime:
 
         assistant_factory = PMCAAssistantFactory(ctx=task_ctx)
         task_ctx.assistant_factory = assistant_factory
+        if PMCASystemEnvConfig.ASSISTANT_PREWARM:
+            task_ctx.assistant_prewarmer = PMCAAssistantPrewarmer(
+                assistant_factory, PMCASystemEnvConfig.ASSISTANT_PREWARM_CONCURRENCY
+            )
 
         logger.success(f"Task context [{task_id}] created successfully.")
 
         return task_ctx
 
+    async def collect_task_metrics(self, ctx: PMCATaskContext) -> None:
+        """
+        把该任务的 LLM 调用计量（键 llm_metrics / context_metrics）与任务内登记的其他统计
+        （如 selector_stats）写入任务工作台，便于事后查询。
+        """
+        # 全部键一次往返写入
+        await ctx.task_workbench.set_many(
+            {
+                **llm_metrics.workbench_items(ctx.task_id),
+                **context_metrics.workbench_items(ctx.task_id),
+                **ctx.metrics_items(),
+            }
+        )
+        # 已写入工作台：释放进程级收集器中该任务的数据
+        llm_metrics.pop_task(ctx.task_id)
+        context_metrics.pop_task(ctx.task_id)
+
+    async def archive_task_context(self, ctx: PMCATaskContext) -> int:
+        """
+        任务结束后将其工作台移入磁盘归档；未配置归档路径时不做处理。
+        应在 collect_task_metrics 之后调用，计量键随工作台一并归档。
+        """
+        if self.workbench_archiver is None:
+            return 0
+        return await PMCATaskWorkbenchManager.archive_workbench(
+            ctx.task_workbench, self.workbench_archiver
+        )
+
     async def create_task_context_with_blackboard(
         self, mission: str, event_classes: List[Type[PMCAEvent]]
     ) -> PMCATaskContext:
@@ -1,30 +1,346 @@
-import json
+import asyncio
+import copy
+import re
+import time
+import uuid
+import weakref
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, List
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Literal,
+    Optional,
+    List,
+    Tuple,
+    Union,
+)
 
 from loguru import logger
 from redis.asyncio import Redis
 from autogen_core.tools import StaticWorkbench
 
 from base.configs.env_config import PMCAEnvConfig
+from .workbench_codec import PMCAValueCodec
+
+if TYPE_CHECKING:
+    from .workbench_archive import PMCAWorkbenchArchiver
+
+
+# redis：跨进程共享（默认）；memory：进程内存储，单机部署与基准测试免去 Redis 往返
+WorkbenchBackend = Literal["redis", "memory"]
+
+
+def _to_str(v: Union[bytes, str]) -> str:
+    return v.decode("utf-8") if isinstance(v, bytes) else v
+
+
+# 写入 + 字节计数 + 写入顺序 + TTL 刷新，原子执行、一次往返
+# KEYS: data hash, sizes hash, order zset；ARGV: now, ttl, f1, v1, f2, v2 ...
+_SET_WITH_ACCOUNTING_LUA = """
+local total = 0
+for i = 3, #ARGV, 2 do
+    local field, value = ARGV[i], ARGV[i + 1]
+    local old = tonumber(redis.call('HGET', KEYS[2], field) or '0')
+    local new = string.len(value)
+    redis.call('HSET', KEYS[1], field, value)
+    redis.call('HSET', KEYS[2], field, new)
+    total = redis.call('HINCRBY', KEYS[2], '__total__', new - old)
+    redis.call('ZADD', KEYS[3], ARGV[1], field)
+end
+if tonumber(ARGV[2]) > 0 then
+    for i = 1, 3 do redis.call('EXPIRE', KEYS[i], ARGV[2]) end
+end
+return total
+"""
+
+# 按写入时间从旧到新淘汰可淘汰字段（匹配任一模式），直到总字节数不超过预算；跳过受保护字段（含本次写入的字段）
+# KEYS: data hash, sizes hash, order zset
+# ARGV: budget, 模式个数 n, pattern1 .. patternN, protected1, protected2 ...
+_EVICT_OLDEST_LUA = """
+local budget = tonumber(ARGV[1])
+local npatterns = tonumber(ARGV[2])
+local patterns, protected = {}, {}
+for i = 3, 2 + npatterns do table.insert(patterns, ARGV[i]) end
+for i = 3 + npatterns, #ARGV do protected[ARGV[i]] = true end
+local function evictable(field)
+    if protected[field] then return false end
+    for _, pattern in ipairs(patterns) do
+        if string.find(field, pattern) then return true end
+    end
+    return false
+end
+local total = tonumber(redis.call('HGET', KEYS[2], '__total__') or '0')
+local evicted = {}
+if total <= budget then return evicted end
+for _, field in ipairs(redis.call('ZRANGE', KEYS[3], 0, -1)) do
+    if total <= budget then break end
+    if evictable(field) then
+        local size = tonumber(redis.call('HGET', KEYS[2], field) or '0')
+        redis.call('HDEL', KEYS[1], field)
+        redis.call('HDEL', KEYS[2], field)
+        redis.call('ZREM', KEYS[3], field)
+        total = redis.call('HINCRBY', KEYS[2], '__total__', -size)
+        table.insert(evicted, field)
+    end
+end
+return evicted
+"""
+
+
+@dataclass
+class PMCAWorkbenchPolicy:
+    """任务工作台的生命周期策略。"""
+
+    # 每次写入刷新的过期时间（秒）；0 表示不过期
+    ttl_seconds: int = 0
+    # 单任务字节预算（按编码后的值计）；0 表示不限制
+    max_bytes: int = 0
+    # 超出预算时只淘汰历史 / 记录类字段（黑板 list 历史、编排器事件暂存、swarm 记录）；
+    # 运行时会读回的功能性字段（triage_result、BLACKBOARD_SEQ、context_summary 等）不参与淘汰。
+    # 模式同时按 Lua string.find 与 Python re.search 匹配，只使用 ^ / $ 与普通字符
+    evictable_patterns: Tuple[str, ...] = (
+        "^BLACKBOARD:",
+        "_events$",
+        "^swarm_transcript",
+    )
+    # 即使匹配 evictable_patterns 也不会被淘汰的字段
+    protected_keys: Tuple[str, ...] = ("triage_result", "team_state")
+
+    def evictable(self, field: str) -> bool:
+        return field not in self.protected_keys and any(
+            re.search(pattern, field) for pattern in self.evictable_patterns
+        )
+
+    @classmethod
+    def from_config(cls, env: Any) -> "PMCAWorkbenchPolicy":
+        return cls(
+            ttl_seconds=env.WORKBENCH_TTL_SECONDS,
+            max_bytes=env.WORKBENCH_MAX_BYTES,
+        )
+
+
+# 已归档任务的标记字段：归档清理 Redis 后写入，Redis 未命中时据此决定是否查询归档
+_ARCHIVED_MARKER = "__archived__"
+
+
+def _check_budget(encoded: Dict[str, bytes], policy: PMCAWorkbenchPolicy) -> None:
+    """单个值超过整个字节预算时无法保留（写入后只能被立即淘汰），直接报错。"""
+    if not policy.max_bytes:
+        return
+    for k, raw in encoded.items():
+        if len(raw) > policy.max_bytes:
+            raise ValueError(
+                f"workbench value '{k}' is {len(raw)}B, "
+                f"exceeds WORKBENCH_MAX_BYTES ({policy.max_bytes}B)"
+            )
 
 
 class _RedisKV:
-    """任务级 KV 存储：pmca:task:{task_id} -> Hash"""
+    """
+    任务级 KV 存储：
+    - pmca:task:{task_id}        -> Hash（值）
+    - pmca:task:{task_id}:sizes  -> Hash（字段字节数，__total__ 为合计）
+    - pmca:task:{task_id}:order  -> ZSet（字段最近写入时间，用于按旧淘汰）
+    """
 
-    def __init__(self, redis: Redis, task_id: str):
+    def __init__(
+        self,
+        redis: Redis,
+        task_id: str,
+        codec: PMCAValueCodec,
+        policy: PMCAWorkbenchPolicy,
+    ):
         self.redis = redis
         self.key = f"pmca:task:{task_id}"
+        self.sizes_key = f"{self.key}:sizes"
+        self.order_key = f"{self.key}:order"
+        self.codec = codec
+        self.policy = policy
+        self._set_script = redis.register_script(_SET_WITH_ACCOUNTING_LUA)
+        self._evict_script = redis.register_script(_EVICT_OLDEST_LUA)
+
+    @property
+    def keys(self) -> List[str]:
+        return [self.key, self.sizes_key, self.order_key]
 
-    async def set(self, k: str, v: Any):
-        await self.redis.hset(self.key, k, json.dumps(v, ensure_ascii=False))
+    async def set(self, k: str, v: Any) -> List[str]:
+        return await self.set_many({k: v})
 
     async def get(self, k: str) -> Any:
         v = await self.redis.hget(self.key, k)
-        return json.loads(v) if v else None
+        return self.codec.decode(v)
+
+    async def set_many(self, mapping: Dict[str, Any]) -> List[str]:
+        """
+        写入多个字段（一次往返）；返回因超出字节预算而被淘汰的字段。
+        本次写入的字段不参与淘汰；单个值超过整个预算时拒绝写入。
+        """
+        encoded = {k: self.codec.encode(v) for k, v in mapping.items()}
+        _check_budget(encoded, self.policy)
+        args: List[Any] = [time.time(), self.policy.ttl_seconds]
+        for k, raw in encoded.items():
+            args.extend((k, raw))
+        total = await self._set_script(keys=self.keys, args=args)
+        if self.policy.max_bytes and int(total) > self.policy.max_bytes:
+            return await self.evict(self.policy.max_bytes, keep=encoded)
+        return []
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        values = await self.redis.hmget(self.key, keys)
+        return [self.codec.decode(v) for v in values]
+
+    async def get_all_raw(self) -> Dict[str, bytes]:
+        return {_to_str(k): v for k, v in (await self.redis.hgetall(self.key)).items()}
+
+    async def evict(self, budget: int, keep: Iterable[str] = ()) -> List[str]:
+        patterns = self.policy.evictable_patterns
+        evicted = await self._evict_script(
+            keys=self.keys,
+            args=[budget, len(patterns), *patterns, *self.policy.protected_keys, *keep],
+        )
+        return [_to_str(f) for f in evicted]
+
+    async def size(self) -> int:
+        return int(await self.redis.hget(self.sizes_key, "__total__") or 0)
+
+    async def sizes(self) -> Dict[str, int]:
+        raw = await self.redis.hgetall(self.sizes_key)
+        return {_to_str(k): int(v) for k, v in raw.items() if _to_str(k) != "__total__"}
 
     async def clear(self):
-        await self.redis.delete(self.key)
+        await self.redis.delete(*self.keys)
+
+
+class _RedisStream:
+    """任务级事件流：pmca:task:{task_id}:stream:{topic} -> Stream（仅追加）"""
+
+    _FIELD = "data"
+
+    def __init__(
+        self,
+        redis: Redis,
+        task_id: str,
+        codec: PMCAValueCodec,
+        policy: PMCAWorkbenchPolicy,
+    ):
+        self.redis = redis
+        self.prefix = f"pmca:task:{task_id}:stream:"
+        self.codec = codec
+        self.policy = policy
+
+    def key(self, topic: str) -> str:
+        return f"{self.prefix}{topic}"
+
+    def _decode(self, entry: Tuple[Any, Dict[Any, Any]]) -> Tuple[str, Any]:
+        entry_id, fields = entry
+        raw = fields.get(self._FIELD, fields.get(self._FIELD.encode()))
+        return _to_str(entry_id), self.codec.decode(raw)
+
+    async def append(self, topic: str, v: Any, *, maxlen: Optional[int]) -> str:
+        # XADD + 近似 MAXLEN 裁剪：单条命令完成写入与截断，O(1) 且无读改写竞态
+        key = self.key(topic)
+        fields = {self._FIELD: self.codec.encode(v)}
+        if not self.policy.ttl_seconds:
+            entry_id = await self.redis.xadd(
+                key, fields, maxlen=maxlen, approximate=True
+            )
+            return _to_str(entry_id)
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(key, fields, maxlen=maxlen, approximate=True)
+            pipe.expire(key, self.policy.ttl_seconds)
+            entry_id, _ = await pipe.execute()
+        return _to_str(entry_id)
+
+    async def latest(self, topic: str) -> Optional[Tuple[str, Any]]:
+        entries = await self.redis.xrevrange(self.key(topic), count=1)
+        return self._decode(entries[0]) if entries else None
+
+    async def range(
+        self, topic: str, since: Optional[str] = None, *, count: Optional[int] = None
+    ) -> List[Tuple[str, Any]]:
+        # since 为排他起点（"(" 前缀，Redis >= 6.2）；为空时从头读取
+        start = f"({since}" if since else "-"
+        entries = await self.redis.xrange(self.key(topic), min=start, count=count)
+        return [self._decode(e) for e in entries]
+
+    async def count(self, topic: str) -> int:
+        return await self.redis.xlen(self.key(topic))
+
+    async def topics(self) -> List[str]:
+        return [
+            _to_str(k)[len(self.prefix) :]
+            async for k in self.redis.scan_iter(match=f"{self.prefix}*")
+        ]
+
+    async def clear(self) -> None:
+        keys = [self.key(t) for t in await self.topics()]
+        if keys:
+            await self.redis.delete(*keys)
+
+
+class PMCAWorkbenchInvalidator:
+    """
+    跨进程的工作台本地缓存失效通知（Redis Pub/Sub）：
+    - 写入方发布 pmca:wb:invalidate:{task_id}，消息体为 "{origin}|{key1}\x1f{key2}..."
+    - 进程内仅一个 psubscribe 监听，按 task_id 分发给已注册的工作台
+    - 忽略本进程自己发出的消息（本进程写入时已直接更新缓存）
+    """
+
+    CHANNEL_PREFIX = "pmca:wb:invalidate:"
+    _SEP = "\x1f"
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.origin = uuid.uuid4().hex
+        self._workbenches: "weakref.WeakValueDictionary[str, PMCATaskWorkbench]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._listener: Optional[asyncio.Task] = None
+        self._pubsub = None
+
+    def register(self, workbench: "PMCATaskWorkbench") -> None:
+        self._workbenches[workbench.task_id] = workbench
+
+    async def publish(self, task_id: str, keys: Iterable[str]) -> None:
+        payload = f"{self.origin}|{self._SEP.join(keys)}"
+        await self.redis.publish(f"{self.CHANNEL_PREFIX}{task_id}", payload)
+
+    async def start(self) -> None:
+        if self._listener is not None:
+            return
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        async for message in self._pubsub.listen():  # type: ignore[union-attr]
+            if message.get("type") != "pmessage":
+                continue
+            try:
+                channel = _to_str(message["channel"])
+                origin, _, keys = _to_str(message["data"]).partition("|")
+                if origin == self.origin:
+                    continue
+                workbench = self._workbenches.get(channel[len(self.CHANNEL_PREFIX) :])
+                if workbench is not None:
+                    workbench.invalidate_local(keys.split(self._SEP))
+            except Exception as e:
+                logger.warning(f"[WB] handle invalidation failed: {e}")
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
 
 
 class PMCATaskWorkbench(StaticWorkbench):
@@ -32,32 +348,260 @@ class PMCATaskWorkbench(StaticWorkbench):
     任务工作台：
     - 组合 StaticWorkbench（注册工具）与 Redis 持久 KV（状态）
     - 提供 async set_item / get_item，供 Selector/Swarm/MagOne 持久化 state
+    - 提供 append_event / latest_event / events_since / event_count，供黑板按流追加与增量读取
+    - 值的序列化/压缩由 PMCAValueCodec 负责（Redis 客户端需 decode_responses=False）
+    - 可选的进程内读穿缓存（local_cache=True）：本工作台写入时直接更新缓存，
+      其他进程写入时经 PMCAWorkbenchInvalidator 失效；缓存存取均为深拷贝，调用方修改取回的对象不会影响缓存
+    - 生命周期（PMCAWorkbenchPolicy）：写入时刷新 TTL、按字节计数；超出预算时按写入先后淘汰旧字段
+    - 已归档的任务（PMCAWorkbenchArchiver）在 Redis 未命中时仍可通过 get_item 读回；
+      只有带归档标记（__archived__ 字段或本进程内已归档）的任务才查询归档，未归档任务的未命中不访问 SQLite
     """
 
-    def __init__(self, redis: Redis, task_id: str, tools: Optional[List[Any]] = None):
+    def __init__(
+        self,
+        redis: Redis,
+        task_id: str,
+        tools: Optional[List[Any]] = None,
+        *,
+        codec: Optional[PMCAValueCodec] = None,
+        local_cache: bool = False,
+        invalidator: Optional[PMCAWorkbenchInvalidator] = None,
+        policy: Optional[PMCAWorkbenchPolicy] = None,
+        archiver: Optional["PMCAWorkbenchArchiver"] = None,
+    ):
         super().__init__(tools=tools or [])
-        self._kv = _RedisKV(redis, task_id)
+        codec = codec or PMCAValueCodec()
+        policy = policy or PMCAWorkbenchPolicy()
+        self._kv, self._stream = self._create_backends(redis, task_id, codec, policy)
+        self._archiver = archiver
+        # 本进程内已将该任务归档（归档标记随 TTL 过期后仍可读回）
+        self._archived = False
         self.task_id = task_id
+        self.policy = policy
+        self._cache: Optional[Dict[str, Any]] = {} if local_cache else None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._invalidator = invalidator
+        if invalidator is not None and local_cache:
+            invalidator.register(self)
+
+    def _create_backends(
+        self,
+        redis: Redis,
+        task_id: str,
+        codec: PMCAValueCodec,
+        policy: PMCAWorkbenchPolicy,
+    ) -> Tuple[Any, Any]:
+        """创建 KV 与事件流后端；子类可替换为其他存储。"""
+        return (
+            _RedisKV(redis, task_id, codec, policy),
+            _RedisStream(redis, task_id, codec, policy),
+        )
 
     async def set_item(self, key: str, value: Any):
-        await self._kv.set(key, value)
+        evicted = await self._kv.set(key, value)
+        await self._after_write({key: value}, evicted)
         logger.debug(f"[WB:{self.task_id}] SET {key}.")
 
     async def get_item(self, key: str) -> Any:
-        v = await self._kv.get(key)
+        if self._cache is not None and key in self._cache:
+            self._cache_hits += 1
+            return copy.deepcopy(self._cache[key])
+        if self._archiver is None:
+            v = await self._kv.get(key)
+        else:
+            # 归档标记与值一次往返读取
+            v, archived = await self._kv.get_many([key, _ARCHIVED_MARKER])
+            if v is None and (archived or self._archived):
+                v = await self._archiver.get_item(self.task_id, key)
+        self._remember({key: v})
         logger.debug(f"[WB:{self.task_id}] GET {key} -> {type(v)}")
         return v
 
+    async def set_many(self, items: Dict[str, Any]):
+        """一次往返写入多个键。"""
+        if not items:
+            return
+        evicted = await self._kv.set_many(items)
+        await self._after_write(items, evicted)
+        logger.debug(f"[WB:{self.task_id}] SET {list(items)}.")
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """一次往返（HMGET）读取多个键；命中本地缓存的键不访问 Redis。"""
+        keys = list(dict.fromkeys(keys))
+        result: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            if self._cache is not None and key in self._cache:
+                self._cache_hits += 1
+                result[key] = copy.deepcopy(self._cache[key])
+            else:
+                missing.append(key)
+        if missing:
+            if self._archiver is None:
+                fetched = dict(zip(missing, await self._kv.get_many(missing)))
+            else:
+                *values, archived = await self._kv.get_many(
+                    [*missing, _ARCHIVED_MARKER]
+                )
+                fetched = dict(zip(missing, values))
+                if archived or self._archived:
+                    for key in [k for k, v in fetched.items() if v is None]:
+                        fetched[key] = await self._archiver.get_item(self.task_id, key)
+            self._remember(fetched)
+            result.update(fetched)
+            logger.debug(f"[WB:{self.task_id}] HMGET {missing}")
+        return {key: result[key] for key in keys}
+
+    def _remember(self, items: Dict[str, Any]) -> None:
+        if self._cache is None:
+            return
+        self._cache_misses += len(items)
+        # 不缓存缺失值：键可能稍后由其他节点写入；存副本，返回给调用方的对象与缓存互不影响
+        self._cache.update(
+            {k: copy.deepcopy(v) for k, v in items.items() if v is not None}
+        )
+
+    async def _after_write(
+        self, items: Dict[str, Any], evicted: Optional[List[str]] = None
+    ) -> None:
+        if evicted:
+            logger.info(
+                f"[WB:{self.task_id}] over budget ({self.policy.max_bytes}B), evicted {evicted}"
+            )
+        if self._cache is None:
+            return
+        # 调用方之后可能继续修改传入的对象，缓存存副本
+        self._cache.update({k: copy.deepcopy(v) for k, v in items.items()})
+        self.invalidate_local(evicted or [])
+        if self._invalidator is not None:
+            try:
+                await self._invalidator.publish(
+                    self.task_id, [*items.keys(), *(evicted or [])]
+                )
+            except Exception as e:
+                logger.warning(f"[WB:{self.task_id}] publish invalidation failed: {e}")
+
+    def invalidate_local(self, keys: Optional[Iterable[str]] = None) -> None:
+        """丢弃本地缓存中的指定键（None 表示全部）。"""
+        if self._cache is None:
+            return
+        if keys is None:
+            self._cache.clear()
+            return
+        for key in keys:
+            self._cache.pop(key, None)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._cache or {}),
+        }
+
+    async def size_bytes(self) -> int:
+        """当前任务 KV 的编码后总字节数（O(1)）。"""
+        return await self._kv.size()
+
+    async def size_breakdown(self) -> Dict[str, int]:
+        """各字段编码后的字节数。"""
+        return await self._kv.sizes()
+
+    async def export_raw(self) -> Tuple[Dict[str, bytes], Dict[str, List[Any]]]:
+        """导出编码后的 KV 与全部事件流，供归档使用。"""
+        streams = {
+            topic: await self._stream.range(topic, None)
+            for topic in await self._stream.topics()
+        }
+        return await self._kv.get_all_raw(), streams
+
+    def decode(self, raw: Any) -> Any:
+        return self._kv.codec.decode(raw)
+
+    async def clear(self) -> None:
+        """删除该任务在 Redis 中的全部键（KV、计数、事件流）。"""
+        await self._kv.clear()
+        await self._stream.clear()
+        self.invalidate_local()
+
+    async def release(self) -> None:
+        """
+        任务结束时释放进程内资源（PMCATaskContext.close 调用）。
+        Redis 中的数据按 TTL 保留以便事后查询，这里只丢弃本地缓存。
+        """
+        self.invalidate_local()
+
     async def save_team_state(self, state: Dict[str, Any]):
         await self.set_item("team_state", state)
 
     async def load_team_state(self) -> Optional[Dict[str, Any]]:
         return await self.get_item("team_state")
 
+    async def append_event(
+        self, topic: str, event: Dict[str, Any], *, maxlen: Optional[int] = None
+    ) -> str:
+        """向 topic 对应的事件流追加一条事件，返回流条目 id。"""
+        entry_id = await self._stream.append(topic, event, maxlen=maxlen)
+        logger.debug(f"[WB:{self.task_id}] XADD {topic} -> {entry_id}")
+        return entry_id
+
+    async def latest_event(self, topic: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """读取 topic 最新一条事件 (entry_id, event)，不加载历史。"""
+        return await self._stream.latest(topic)
+
+    async def events_since(
+        self, topic: str, since: Optional[str] = None, *, count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """读取 entry_id 严格大于 since 的事件；since 为空时从最早一条开始。"""
+        return await self._stream.range(topic, since, count=count)
+
+    async def event_count(self, topic: str) -> int:
+        """topic 事件流当前长度（XLEN，O(1)）。"""
+        return await self._stream.count(topic)
+
 
 class PMCATaskWorkbenchManager:
     """简单工厂：创建任务隔离的 Workbench"""
 
     @staticmethod
-    def create_workbench(task_id: str, redis: Redis) -> PMCATaskWorkbench:
-        return PMCATaskWorkbench(redis, task_id, tools=[])
+    def create_workbench(
+        task_id: str,
+        redis: Optional[Redis],
+        codec: Optional[PMCAValueCodec] = None,
+        *,
+        backend: WorkbenchBackend = "redis",
+        local_cache: bool = False,
+        invalidator: Optional[PMCAWorkbenchInvalidator] = None,
+        policy: Optional[PMCAWorkbenchPolicy] = None,
+        archiver: Optional["PMCAWorkbenchArchiver"] = None,
+    ) -> PMCATaskWorkbench:
+        if backend == "memory":
+            from .workbench_memory import PMCAInMemoryTaskWorkbench
+
+            return PMCAInMemoryTaskWorkbench(
+                task_id, tools=[], codec=codec, policy=policy, archiver=archiver
+            )
+        return PMCATaskWorkbench(
+            redis,
+            task_id,
+            tools=[],
+            codec=codec,
+            local_cache=local_cache,
+            invalidator=invalidator,
+            policy=policy,
+            archiver=archiver,
+        )
+
+    @staticmethod
+    async def archive_workbench(
+        workbench: PMCATaskWorkbench, archiver: "PMCAWorkbenchArchiver"
+    ) -> int:
+        """将已结束任务的工作台移入磁盘归档并清理 Redis，返回归档的条目数。"""
+        kv, streams = await workbench.export_raw()
+        count = await archiver.archive(workbench.task_id, kv, streams, workbench.decode)
+        await workbench.clear()
+        # 留下归档标记：之后的未命中（含其他进程）才会查询归档
+        await workbench.set_item(_ARCHIVED_MARKER, True)
+        workbench._archived = True
+        logger.info(f"[WB:{workbench.task_id}] archived {count} entries")
+        return count
@@ -1,10 +1,11 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 from autogen_core import SingleThreadedAgentRuntime
 
 if TYPE_CHECKING:
     from core.assistant.factory import PMCAAssistantFactory
+    from core.assistant.factory.prewarm import PMCAAssistantPrewarmer
     from base.runtime.system_workbench import PMCATaskWorkbench
     from base.configs import PMCAEnvConfig
     from core.client import LLMFactory
@@ -33,6 +34,12 @@ class PMCATaskContext:
         self.task_workbench = task_workbench
         self.llm_factory = llm_factory
         self.assistant_factory: Optional["PMCAAssistantFactory"] = None
+        # 分诊阶段的执行团队投机预热（ASSISTANT_PREWARM 关闭时为空）
+        self.assistant_prewarmer: Optional["PMCAAssistantPrewarmer"] = None
+        # 任务结束时回调（释放按 task_id 保存的进程级状态，如黑板条件游标）
+        self._close_callbacks: List[Callable[[], None]] = []
+        # 任务级统计来源（如选择器规则命中），由 PMCARuntime.collect_task_metrics 在任务结束时一次写入工作台
+        self._metrics_sources: List[Callable[[], Dict[str, Any]]] = []
 
     async def start_runtime(self) -> None:
         """幂等启动 SingleThreadedAgentRuntime。"""
@@ -46,6 +53,30 @@ class PMCATaskContext:
             await self.task_runtime.stop_when_idle()
             self._runtime_started = False
 
+    def add_close_callback(self, callback: Callable[[], None]) -> None:
+        """注册任务结束（close）时执行的回调。"""
+        self._close_callbacks.append(callback)
+
+    def add_metrics_source(self, source: Callable[[], Dict[str, Any]]) -> None:
+        """注册任务级统计来源：返回 {工作台键: 值}，任务结束时随 LLM 计量一起写入。"""
+        self._metrics_sources.append(source)
+
+    def metrics_items(self) -> Dict[str, Any]:
+        items: Dict[str, Any] = {}
+        for source in self._metrics_sources:
+            items.update(source())
+        return items
+
+    async def close(self) -> None:
+        """释放任务级资源（未被取用的预热资源、进程内工作台存储等），并关闭运行时。"""
+        callbacks, self._close_callbacks = self._close_callbacks, []
+        for callback in callbacks:
+            callback()
+        if self.assistant_prewarmer is not None:
+            await self.assistant_prewarmer.close()
+        await self.task_workbench.release()
+        await self.stop_runtime()
+
     async def ensure_runtime_started(self) -> None:
         """需要时再懒启动（对上层最友好）。"""
         if not self._runtime_started:
@@ -57,5 +88,5 @@ class PMCATaskContext:
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> Optional[bool]:
-        await self.stop_runtime()
+        await self.close()
         return None
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .workbench_codec import PMCAValueCodec, zstandard
+
+
+class PMCAWorkbenchArchiver:
+    """
+    已结束任务的工作台归档（SQLite 单文件）：
+    - 表 workbench_archive(task_id, key, value)，value 为带头部的编码值（默认 zstd 压缩）
+    - 事件流以 "STREAM:{topic}" 为键归档为 [(entry_id, event), ...]
+    - 读取经 asyncio.to_thread 执行，不阻塞事件循环
+    """
+
+    STREAM_PREFIX = "STREAM:"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        codec: Optional[PMCAValueCodec] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 归档是冷数据：总是压缩；未安装 zstandard 时退化为不压缩
+        self.codec = codec or PMCAValueCodec(
+            codec="json",
+            compression="zstd" if zstandard is not None else "none",
+            compress_threshold=0,
+        )
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS workbench_archive ("
+                " task_id TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value BLOB NOT NULL,"
+                " PRIMARY KEY (task_id, key))"
+            )
+
+    @classmethod
+    def from_config(cls, env: Any) -> Optional["PMCAWorkbenchArchiver"]:
+        path = env.WORKBENCH_ARCHIVE_PATH
+        return cls(path) if path else None
+
+    async def archive(
+        self,
+        task_id: str,
+        kv: Dict[str, bytes],
+        streams: Dict[str, List[Any]],
+        decode: Callable[[Any], Any],
+    ) -> int:
+        rows = [(task_id, k, self.codec.encode(decode(v))) for k, v in kv.items()]
+        rows.extend(
+            (task_id, f"{self.STREAM_PREFIX}{topic}", self.codec.encode(entries))
+            for topic, entries in streams.items()
+        )
+        await asyncio.to_thread(self._write, rows)
+        return len(rows)
+
+    async def get_item(self, task_id: str, key: str) -> Any:
+        raw = await asyncio.to_thread(self._read, task_id, key)
+        return self.codec.decode(raw)
+
+    async def get_events(self, task_id: str, topic: str) -> List[Any]:
+        return (await self.get_item(task_id, f"{self.STREAM_PREFIX}{topic}")) or []
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, rows: List[tuple]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO workbench_archive (task_id, key, value)"
+                " VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def _read(self, task_id: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM workbench_archive WHERE task_id = ? AND key = ?",
+                (task_id, key),
+            ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 可选依赖
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 可选依赖
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 可选依赖
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - 可选依赖
+    lz4_frame = None
+
+
+# 编码后的值以固定头部开始：MAGIC + codec_id + compression_id。
+# 旧数据是裸 JSON 文本，首字节不可能是 \x00，因此可以无歧义地兼容解码。
+_MAGIC = b"\x00PW"
+_HEADER_LEN = len(_MAGIC) + 2
+
+
+class PMCAWorkbenchCodec(ABC):
+    """工作台值的序列化器：Python 对象 <-> bytes"""
+
+    name: str
+    codec_id: int
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes: ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any: ...
+
+
+class PMCAJsonCodec(PMCAWorkbenchCodec):
+    name = "json"
+    codec_id = 1
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PMCAOrjsonCodec(PMCAWorkbenchCodec):
+    name = "orjson"
+    codec_id = 2
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("WORKBENCH_CODEC=orjson 需要安装 orjson")
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class PMCAMsgpackCodec(PMCAWorkbenchCodec):
+    name = "msgpack"
+    codec_id = 3
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise RuntimeError("WORKBENCH_CODEC=msgpack 需要安装 msgpack")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class PMCAWorkbenchCompressor(ABC):
+    name: str
+    compression_id: int
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes: ...
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes: ...
+
+
+class PMCANoCompressor(PMCAWorkbenchCompressor):
+    name = "none"
+    compression_id = 0
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class PMCAZstdCompressor(PMCAWorkbenchCompressor):
+    name = "zstd"
+    compression_id = 1
+
+    def __init__(self, level: int = 3) -> None:
+        if zstandard is None:
+            raise RuntimeError("WORKBENCH_COMPRESSION=zstd 需要安装 zstandard")
+        self._level = level
+
+    def compress(self, data: bytes) -> bytes:
+        # ZstdCompressor 非线程安全，按次创建（开销远小于网络往返）
+        return zstandard.ZstdCompressor(level=self._level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class PMCALz4Compressor(PMCAWorkbenchCompressor):
+    name = "lz4"
+    compression_id = 2
+
+    def __init__(self) -> None:
+        if lz4_frame is None:
+            raise RuntimeError("WORKBENCH_COMPRESSION=lz4 需要安装 lz4")
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+_CODECS: Dict[str, Type[PMCAWorkbenchCodec]] = {
+    c.name: c for c in (PMCAJsonCodec, PMCAOrjsonCodec, PMCAMsgpackCodec)
+}
+_COMPRESSORS: Dict[str, Type[PMCAWorkbenchCompressor]] = {
+    c.name: c for c in (PMCANoCompressor, PMCAZstdCompressor, PMCALz4Compressor)
+}
+_CODECS_BY_ID = {c.codec_id: c for c in _CODECS.values()}
+_COMPRESSORS_BY_ID = {c.compression_id: c for c in _COMPRESSORS.values()}
+
+
+class PMCAValueCodec:
+    """
+    工作台值编解码：
+    - 写入：按配置的 codec 序列化；超过 compress_threshold 字节时再压缩
+    - 每个值都带头部记录 codec/压缩方式，读取时按头部解码，与当前配置无关
+    - 无头部的值视为旧版 JSON 文本
+    """
+
+    def __init__(
+        self,
+        codec: str = "json",
+        compression: str = "none",
+        compress_threshold: int = 4096,
+    ) -> None:
+        if codec not in _CODECS:
+            raise ValueError(f"未知的 workbench codec: {codec}")
+        if compression not in _COMPRESSORS:
+            raise ValueError(f"未知的 workbench compression: {compression}")
+        self.codec = _CODECS[codec]()
+        self.compressor = _COMPRESSORS[compression]()
+        self.compress_threshold = compress_threshold
+        self._decoders: Dict[int, PMCAWorkbenchCodec] = {
+            self.codec.codec_id: self.codec
+        }
+        self._decompressors: Dict[int, PMCAWorkbenchCompressor] = {
+            self.compressor.compression_id: self.compressor
+        }
+
+    @classmethod
+    def from_config(cls, env: Any) -> "PMCAValueCodec":
+        return cls(
+            codec=env.WORKBENCH_CODEC,
+            compression=env.WORKBENCH_COMPRESSION,
+            compress_threshold=env.WORKBENCH_COMPRESSION_THRESHOLD,
+        )
+
+    def encode(self, value: Any) -> bytes:
+        payload = self.codec.dumps(value)
+        compressor = self.compressor
+        if compressor.compression_id and len(payload) >= self.compress_threshold:
+            payload = compressor.compress(payload)
+        else:
+            compressor = _NO_COMPRESSION
+        return (
+            _MAGIC + bytes((self.codec.codec_id, compressor.compression_id)) + payload
+        )
+
+    def decode(self, raw: Optional[Union[bytes, str]]) -> Any:
+        if not raw:
+            return None
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        if not raw.startswith(_MAGIC):
+            return json.loads(raw)
+
+        codec_id, compression_id = raw[len(_MAGIC)], raw[len(_MAGIC) + 1]
+        payload = raw[_HEADER_LEN:]
+        if compression_id:
+            payload = self._decompressor(compression_id).decompress(payload)
+        return self._decoder(codec_id).loads(payload)
+
+    def _decoder(self, codec_id: int) -> PMCAWorkbenchCodec:
+        decoder = self._decoders.get(codec_id)
+        if decoder is None:
+            if codec_id not in _CODECS_BY_ID:
+                raise ValueError(f"未知的 workbench codec id: {codec_id}")
+            decoder = self._decoders[codec_id] = _CODECS_BY_ID[codec_id]()
+        return decoder
+
+    def _decompressor(self, compression_id: int) -> PMCAWorkbenchCompressor:
+        decompressor = self._decompressors.get(compression_id)
+        if decompressor is None:
+            if compression_id not in _COMPRESSORS_BY_ID:
+                raise ValueError(f"未知的 workbench compression id: {compression_id}")
+            decompressor = self._decompressors[compression_id] = _COMPRESSORS_BY_ID[
+                compression_id
+            ]()
+        return decompressor
+
+
+_NO_COMPRESSION = PMCANoCompressor()
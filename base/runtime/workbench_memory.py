@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from .system_workbench import PMCATaskWorkbench, PMCAWorkbenchPolicy, _check_budget
+from .workbench_codec import PMCAValueCodec
+
+if TYPE_CHECKING:
+    from .workbench_archive import PMCAWorkbenchArchiver
+
+
+@dataclass
+class _MemoryTaskStore:
+    """单个任务在进程内的全部数据，对应 Redis 中 pmca:task:{task_id}* 的各个键。"""
+
+    values: Dict[str, bytes] = field(default_factory=dict)
+    # 字段 -> 最近写入时间；dict 保持插入顺序，重写时先删除再插入即为写入先后
+    order: Dict[str, float] = field(default_factory=dict)
+    streams: Dict[str, List[Tuple[Tuple[int, int], Any]]] = field(default_factory=dict)
+    total: int = 0
+    expires_at: Optional[float] = None
+
+
+# 进程级存储：同一 task_id 的多个工作台实例共享数据，语义与 Redis 后端一致
+_STORES: Dict[str, _MemoryTaskStore] = {}
+# 过期任务的清扫间隔（秒）：任一任务访问存储时顺带清理，已结束的任务不会常驻进程
+_SWEEP_INTERVAL_SECONDS = 60.0
+_last_sweep = 0.0
+
+
+def _sweep_expired(now: float) -> None:
+    global _last_sweep
+    if now - _last_sweep < _SWEEP_INTERVAL_SECONDS:
+        return
+    _last_sweep = now
+    expired = [
+        task_id
+        for task_id, store in _STORES.items()
+        if store.expires_at is not None and store.expires_at <= now
+    ]
+    for task_id in expired:
+        del _STORES[task_id]
+
+
+def _store(task_id: str) -> _MemoryTaskStore:
+    """取出任务存储；TTL 过期在访问时惰性处理（写入时由 _touch 刷新），并定期清扫其他已过期的任务。"""
+    now = time.time()
+    _sweep_expired(now)
+    store = _STORES.get(task_id)
+    if store is None or (store.expires_at is not None and store.expires_at <= now):
+        store = _STORES[task_id] = _MemoryTaskStore()
+    return store
+
+
+def _touch(store: _MemoryTaskStore, policy: PMCAWorkbenchPolicy) -> None:
+    if policy.ttl_seconds:
+        store.expires_at = time.time() + policy.ttl_seconds
+
+
+def _format_id(entry_id: Tuple[int, int]) -> str:
+    return f"{entry_id[0]}-{entry_id[1]}"
+
+
+def _parse_id(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class _MemoryKV:
+    """进程内 KV，接口与 _RedisKV 一致；值仍经 codec 编码，保证读写对象隔离与字节计数一致。"""
+
+    def __init__(
+        self, task_id: str, codec: PMCAValueCodec, policy: PMCAWorkbenchPolicy
+    ):
+        self.task_id = task_id
+        self.codec = codec
+        self.policy = policy
+
+    @property
+    def _s(self) -> _MemoryTaskStore:
+        return _store(self.task_id)
+
+    async def set(self, k: str, v: Any) -> List[str]:
+        return await self.set_many({k: v})
+
+    async def get(self, k: str) -> Any:
+        return self.codec.decode(self._s.values.get(k))
+
+    async def set_many(self, mapping: Dict[str, Any]) -> List[str]:
+        encoded = {k: self.codec.encode(v) for k, v in mapping.items()}
+        _check_budget(encoded, self.policy)
+        store, now = self._s, time.time()
+        for k, raw in encoded.items():
+            old = store.values.get(k)
+            store.total += len(raw) - (len(old) if old is not None else 0)
+            store.values[k] = raw
+            store.order.pop(k, None)
+            store.order[k] = now
+        _touch(store, self.policy)
+        if self.policy.max_bytes and store.total > self.policy.max_bytes:
+            return await self.evict(self.policy.max_bytes, keep=encoded)
+        return []
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        values = self._s.values
+        return [self.codec.decode(values.get(k)) for k in keys]
+
+    async def get_all_raw(self) -> Dict[str, bytes]:
+        return dict(self._s.values)
+
+    async def evict(self, budget: int, keep: Iterable[str] = ()) -> List[str]:
+        store = self._s
+        keep = set(keep)
+        evicted: List[str] = []
+        for k in list(store.order):
+            if store.total <= budget:
+                break
+            if k in keep or not self.policy.evictable(k):
+                continue
+            store.total -= len(store.values.pop(k))
+            del store.order[k]
+            evicted.append(k)
+        return evicted
+
+    async def size(self) -> int:
+        return self._s.total
+
+    async def sizes(self) -> Dict[str, int]:
+        return {k: len(v) for k, v in self._s.values.items()}
+
+    async def clear(self) -> None:
+        store = self._s
+        store.values.clear()
+        store.order.clear()
+        store.total = 0
+
+
+class _MemoryStream:
+    """进程内事件流，接口与 _RedisStream 一致；条目 id 采用与 Redis 相同的 "<ms>-<seq>" 形式。"""
+
+    def __init__(
+        self, task_id: str, codec: PMCAValueCodec, policy: PMCAWorkbenchPolicy
+    ):
+        self.task_id = task_id
+        self.codec = codec
+        self.policy = policy
+
+    @property
+    def _s(self) -> _MemoryTaskStore:
+        return _store(self.task_id)
+
+    def _entry(self, entry: Tuple[Tuple[int, int], Any]) -> Tuple[str, Any]:
+        return _format_id(entry[0]), self.codec.decode(entry[1])
+
+    async def append(self, topic: str, v: Any, *, maxlen: Optional[int]) -> str:
+        store = self._s
+        entries = store.streams.setdefault(topic, [])
+        ms = int(time.time() * 1000)
+        if entries and entries[-1][0][0] >= ms:
+            entry_id = (entries[-1][0][0], entries[-1][0][1] + 1)
+        else:
+            entry_id = (ms, 0)
+        entries.append((entry_id, self.codec.encode(v)))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        _touch(store, self.policy)
+        return _format_id(entry_id)
+
+    async def latest(self, topic: str) -> Optional[Tuple[str, Any]]:
+        entries = self._s.streams.get(topic)
+        return self._entry(entries[-1]) if entries else None
+
+    async def range(
+        self, topic: str, since: Optional[str] = None, *, count: Optional[int] = None
+    ) -> List[Tuple[str, Any]]:
+        entries = self._s.streams.get(topic, [])
+        start = 0
+        if since:
+            start = bisect.bisect_right([e[0] for e in entries], _parse_id(since))
+        selected = entries[start : start + count if count else None]
+        return [self._entry(e) for e in selected]
+
+    async def count(self, topic: str) -> int:
+        return len(self._s.streams.get(topic, []))
+
+    async def topics(self) -> List[str]:
+        return list(self._s.streams)
+
+    async def clear(self) -> None:
+        self._s.streams.clear()
+
+
+class PMCAInMemoryTaskWorkbench(PMCATaskWorkbench):
+    """
+    进程内任务工作台：
+    - 与 PMCATaskWorkbench 相同的 set_item / get_item / save_team_state 与事件流接口
+    - 数据保存在当前进程，无 Redis 网络往返；适用于单机部署与基准测试
+    - 存储本身即在进程内，因此不启用本地缓存与跨进程失效
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        tools: Optional[List[Any]] = None,
+        *,
+        codec: Optional[PMCAValueCodec] = None,
+        policy: Optional[PMCAWorkbenchPolicy] = None,
+        archiver: Optional["PMCAWorkbenchArchiver"] = None,
+    ):
+        super().__init__(
+            None,  # type: ignore[arg-type]
+            task_id,
+            tools,
+            codec=codec,
+            policy=policy,
+            archiver=archiver,
+        )
+
+    def _create_backends(
+        self,
+        redis: Any,
+        task_id: str,
+        codec: PMCAValueCodec,
+        policy: PMCAWorkbenchPolicy,
+    ) -> Tuple[_MemoryKV, _MemoryStream]:
+        return _MemoryKV(task_id, codec, policy), _MemoryStream(task_id, codec, policy)
+
+    async def clear(self) -> None:
+        await super().clear()
+        _STORES.pop(self.task_id, None)
+
+    async def release(self) -> None:
+        # 进程内存储没有其他读者：任务结束即丢弃（WORKBENCH_TTL_SECONDS=0 时不会被清扫）
+        _STORES.pop(self.task_id, None)
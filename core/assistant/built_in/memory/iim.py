@@ -47,32 +47,39 @@ class PMCAMasterOfMemory(PMCAAssistantMetadata):
    - 可选参数：metadata（建议至少包含 {"type": "observation"}；subject 可省略由 Provider 兜底）, run_id
    - 使用时机：新增知识或长期可复用的事实/规则/流程/FAQ/笔记。
 
-2) search_memories_for_other
+2) add_memories_for_other
+   - 作用：为目标智能体一次写入多条记忆（统一校验、一次嵌入、一次写入）。
+   - 必要参数：target_assistant, items（每条形如 {"content": "...", "metadata": {...}}）
+   - 可选参数：run_id（整批共用）
+   - 使用时机：一次需要写入多条记忆（如知识提炼产出的一批结论）时，优先使用本工具而不是逐条调用 add_memory_for_other；
+     回执中按 results 逐条说明成功的 ids 与失败原因。
+
+3) search_memories_for_other
    - 作用：在目标智能体的记忆库中检索。
    - 必要参数：target_assistant, query
    - 可选参数：filters（如按 type/subject 过滤）
    - 使用时机：回答问题前需要回忆；或验证是否已存在相同/相近记忆，避免重复写入。
 
-3) update_memory_for_other
+4) update_memory_for_other
    - 作用：基于 memory_id 更新已有记忆的内容。
    - 必要参数：target_assistant, memory_id, content
    - 使用时机：原内容有明确更正或补充；更新后请在回执中说明差异点。
 
-4) delete_memory_for_other
+5) delete_memory_for_other
    - 作用：删除单条记忆。
    - 必要参数：target_assistant, memory_id
    - 使用时机：明显错误、重复或过时且会误导时。
 
-5) delete_memories_for_other（高风险）
+6) delete_memories_for_other（高风险）
    - 作用：按条件批量删除（例如 run_id）。
    - 必须流程：先做二次确认（明确目标、范围、影响），确认后调用并传入 confirm=True。
    - 使用时机：任务结束后的批量清理，或发生错误导入需要回滚。
 
-6) provision_assistant
+7) provision_assistant
    - 作用：为目标智能体初始化或巡检其记忆集合（并建立必要索引）。
    - 使用时机：首次为新智能体启用记忆，或集合缺失/异常时。
 
-7) list_mem_collections
+8) list_mem_collections
    - 作用：列出已存在的记忆集合，便于巡检。
    - 使用时机：排查集合是否存在、名称是否正确。
 
@@ -1,8 +1,10 @@
 from .assistant_factory import PMCAAssistantFactory
 from .assistant_config import PMCAAssistantMetadata
+from .lazy_assistant import PMCALazyAssistant
 
 
 __all__ = [
     "PMCAAssistantFactory",
     "PMCAAssistantMetadata",
+    "PMCALazyAssistant",
 ]
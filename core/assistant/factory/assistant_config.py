@@ -22,6 +22,18 @@ class PMCAAssistantMetadata:
     # --- 模型与能力选择  ---
     # ------------------------------------------------------------------
     ability: AbilityType = AbilityType.DEFAULT
+    # 响应缓存：None 表示按 LLM_CACHE_ABILITIES 决定；仅对相同输入结果确定的智能体开启
+    llm_cache: Optional[bool] = None
+    # 调用治理中的排队优先级：critical > normal > bulk（swarm 批量执行）。
+    # 分诊 / 结构化 / 编排等阻塞整体流程的决策类智能体设为 critical，在 RPM / TPM / 并发受限时优先放行
+    llm_priority: Literal["critical", "normal", "bulk"] = "normal"
+    # 上下文管理：None 表示使用 LLM_CONTEXT_STRATEGY；预算 None 表示按模型上下文窗口推导
+    context_strategy: Optional[
+        Literal["unbounded", "window", "head_tail", "summary"]
+    ] = None
+    context_token_budget: Optional[int] = None
+    # head_tail / summary 策略下始终保留的开头消息数（通常是任务描述）
+    context_head_messages: int = 1
 
     # ------------------------------------------------------------------
     # --- 工具与 Workbench 控制  ---
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 from typing import TYPE_CHECKING, Any, Type, Dict, List, Optional
 from autogen_agentchat.agents import AssistantAgent
 from autogen_core.tools import BaseTool, Workbench
 from autogen_ext.tools.mcp import McpWorkbench
 from loguru import logger
 
-from core.tools.common import merge_functional_workbenches
+from core.tools.common import merge_functional_workbenches, mcp_session_pool
 from .assistant_config import PMCAAssistantMetadata
+from .assistant_snapshot import PMCAAssistantRegistrySnapshot
+from .lazy_assistant import PMCALazyAssistant
+from .model_context import build_model_context
 
 
 from core.memory.factory.mem0 import PMCAMem0LocalService
@@ -25,6 +30,9 @@ class PMCAAssistantFactory:
     """
 
     _registry: Dict[str, Type[PMCAAssistantMetadata]] = {}
+    # 注册版本号：每次 register 自增，用于使注册表快照失效
+    _registry_version: int = 0
+    _snapshot: Optional[PMCAAssistantRegistrySnapshot] = None
 
     def __init__(self, ctx: "PMCATaskContext"):
         """
@@ -38,39 +46,48 @@ class PMCAAssistantFactory:
     def register(cls, biz_type: str):
         def decorator(meta_cls: Type[PMCAAssistantMetadata]):
             cls._registry[biz_type] = meta_cls
+            cls._registry_version += 1
             return meta_cls
 
         return decorator
 
+    @classmethod
+    def snapshot(cls) -> PMCAAssistantRegistrySnapshot:
+        """
+        获取注册表快照（元数据实例与预渲染提示词）；注册版本变化时重建。
+        """
+        snapshot = cls._snapshot
+        if snapshot is None or snapshot.version != cls._registry_version:
+            snapshot = cls._snapshot = PMCAAssistantRegistrySnapshot.build(
+                cls._registry, cls._registry_version
+            )
+        return snapshot
+
     @classmethod
     def all_registered_assistants(cls) -> Dict[str, PMCAAssistantMetadata]:
         """
-        获取所有已注册智能体的完整元数据对象信息
+        获取所有已注册智能体的完整元数据对象信息。
+        返回快照实例的副本：调用方修改返回对象的字段不会影响快照及之后的任务
+        （类级的列表 / 字典默认值仍为共享对象，与直接实例化元数据类时相同）。
         """
 
-        return {biz_type: meta() for biz_type, meta in cls._registry.items()}
+        return {
+            biz_type: copy.copy(meta)
+            for biz_type, meta in cls.snapshot().metadata.items()
+        }
 
     @classmethod
     def professional_assistants_description(cls) -> str:
         """
         为 Planner 获取特定智能体的“中文名”,“职能描述”,“元数据”字符串。
         """
-        from core.team.core_assistants import PMCACoreAssistants
-
-        all_assistants = cls.all_registered_assistants()
-        desc_parts = [
-            f"- {meta.chinese_name} ({name})\n{meta.duty}元数据:{meta.metadata}\n"
-            for name, meta in all_assistants.items()
-            if not PMCACoreAssistants.is_core_assistant(name)
-        ]
-        return "\n".join(desc_parts)
+        return cls.snapshot().professional_description
 
     def _create_tools(self, biz_type: str) -> Dict[str, Any]:
         """
         根据智能体的业务类型，为其创建 Workbench 或从 ToolFactory 获取 Tools。
         """
-        meta_cls = self._registry[biz_type]
-        meta = meta_cls()
+        meta = self.snapshot().metadata[biz_type]
         assistant_name = meta.name or biz_type
 
         if meta.tools_type == "workbench":
@@ -88,7 +105,11 @@ class PMCAAssistantFactory:
                 if params is None:
                     missing.append(key)
                     continue
-                workbenches.append(McpWorkbench(server_params=mcp_servers[key]))
+                # 默认从进程级会话池租用，MCP 服务在进程内只连接一次
+                if self.ctx.task_env.MCP_POOL:
+                    workbenches.append(mcp_session_pool().lease(key, params))
+                else:
+                    workbenches.append(McpWorkbench(server_params=params))
             if missing:
                 logger.warning(f"[{assistant_name}] 缺失 MCP server keys: {missing}")
 
@@ -109,10 +130,14 @@ class PMCAAssistantFactory:
         self,
         biz_type: str,
         dynamic_hadoffs: Optional[List[str]] = None,
+        *,
+        llm_priority: Optional[str] = None,
+        memory: Optional[List[Any]] = None,
         **override_kwargs,
     ) -> AssistantAgent:
         """
         基于元数据构建一个 AssistantAgent 实例。
+        memory 为空时同步取用（必要时构建）该智能体的 Mem0 记忆。
         """
 
         from .assistant_filter import PMCAAssistantFilter
@@ -120,14 +145,35 @@ class PMCAAssistantFactory:
         if biz_type not in self._registry:
             raise ValueError(f"未知的业务类型: {biz_type}")
 
-        meta = self._registry[biz_type]()
+        meta = self.snapshot().metadata[biz_type]
+
+        model_client = self.ctx.llm_factory.client(
+            meta.ability,
+            cache=meta.llm_cache,
+            assistant=meta.name or biz_type,
+            task_id=self.ctx.task_id,
+            priority=llm_priority or meta.llm_priority,
+        )
 
         assistant_params = {
             "name": meta.name or biz_type,
-            "model_client": self.ctx.llm_factory.client(meta.ability),
+            "model_client": model_client,
+            "model_context": build_model_context(
+                self.ctx,
+                meta.name or biz_type,
+                meta.ability,
+                model_client,
+                strategy=meta.context_strategy,
+                token_budget=meta.context_token_budget,
+                head=meta.context_head_messages,
+            ),
             "description": meta.description,
             "system_message": meta.system_message,
-            "memory": [PMCAMem0LocalService.memory(meta.name or biz_type)],
+            "memory": (
+                memory
+                if memory is not None
+                else [PMCAMem0LocalService.memory(meta.name or biz_type)]
+            ),
             "model_client_stream": meta.model_client_stream,
             "reflect_on_tool_use": meta.reflect_on_tool_use,
             "max_tool_iterations": meta.max_tool_iterations,
@@ -140,9 +186,62 @@ class PMCAAssistantFactory:
         assistant_params = PMCAAssistantFilter(self).build_params(
             biz_type, assistant_params
         )
-        assistant_params.update(self._create_tools(biz_type))
+        # 分诊阶段已预热（MCP 会话已连接）的工具优先取用
+        prewarmer = self.ctx.assistant_prewarmer
+        tools = prewarmer.claim_tools(biz_type) if prewarmer else None
+        assistant_params.update(
+            tools if tools is not None else self._create_tools(biz_type)
+        )
         assistant_params.update(override_kwargs)
 
         final_params = {k: v for k, v in assistant_params.items() if v is not None}
 
         return AssistantAgent(**final_params)
+
+    async def acreate_assistant(
+        self,
+        biz_type: str,
+        dynamic_hadoffs: Optional[List[str]] = None,
+        **kwargs,
+    ) -> AssistantAgent:
+        """
+        create_assistant 的异步版本：只把阻塞的 Mem0 记忆构建放到工作线程，
+        其余（客户端池、模型上下文、工具租用、AssistantAgent）在事件循环线程中构建。
+        """
+        if biz_type not in self._registry:
+            raise ValueError(f"未知的业务类型: {biz_type}")
+
+        meta = self.snapshot().metadata[biz_type]
+        memory = await asyncio.to_thread(
+            PMCAMem0LocalService.memory, meta.name or biz_type
+        )
+        return self.create_assistant(
+            biz_type, dynamic_hadoffs, memory=[memory], **kwargs
+        )
+
+    def create_lazy_assistant(
+        self,
+        biz_type: str,
+        *,
+        handoffs: Optional[List[str]] = None,
+        llm_priority: Optional[str] = None,
+        **override_kwargs,
+    ) -> PMCALazyAssistant:
+        """
+        创建惰性智能体：立即返回名称 / 描述 / handoffs，首次发言时才调用 acreate_assistant 构建。
+        """
+        if biz_type not in self._registry:
+            raise ValueError(f"未知的业务类型: {biz_type}")
+
+        meta = self.snapshot().metadata[biz_type]
+        return PMCALazyAssistant(
+            meta.name or biz_type,
+            meta.description,
+            lambda: self.acreate_assistant(
+                biz_type,
+                handoffs=handoffs,
+                llm_priority=llm_priority,
+                **override_kwargs,
+            ),
+            handoffs=handoffs,
+        )
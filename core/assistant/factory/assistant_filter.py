@@ -50,30 +50,55 @@ class PMCAAssistantFilter:
         # 如果不是核心智能体，则直接返回原始参数
         return base_params
 
+    @staticmethod
+    def render_system_messages(available_assistants: str) -> Dict[str, str]:
+        """
+        渲染核心智能体的系统提示词（由注册表快照在构建时调用一次并缓存）。
+        """
+        from core.team.core_assistants import PMCACoreAssistants
+
+        return {
+            PMCACoreAssistants.TRIAGE.value: PMCATRIAGE_SYSTEM_MESSAGE.format(
+                available_assistants=available_assistants
+            ),
+            PMCACoreAssistants.TRIAGE_REVIEWER.value: PMCATRIAGE_REVIEWER_SYSTEM_MESSAGE.format(
+                available_assistants=available_assistants
+            ),
+            PMCACoreAssistants.TRIAGE_STRUCTURED.value: PMCATRIAGE_STRUCTURED_SYSTEM_MESSAGE,
+        }
+
+    def _system_message(self, biz_type: str) -> str:
+        return self._factory.snapshot().system_messages[biz_type]
+
     def _build_triage_params(self, base_params: Dict[str, Any]) -> Dict[str, Any]:
-        """为 PMCATriage 动态构建提示词。"""
-        final_system_message = PMCATRIAGE_SYSTEM_MESSAGE.format(
-            available_assistants=self._factory.professional_assistants_description()
-        )
+        """为 PMCATriage 设置（按注册表快照预渲染的）提示词。"""
+        from core.team.core_assistants import PMCACoreAssistants
 
-        base_params["system_message"] = final_system_message
+        base_params["system_message"] = self._system_message(
+            PMCACoreAssistants.TRIAGE.value
+        )
         return base_params
 
     def _build_triage_reviewer_params(
         self, base_params: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """为 PMCATriageReviewer 动态构建提示词。"""
-        final_system_message = PMCATRIAGE_REVIEWER_SYSTEM_MESSAGE.format(
-            available_assistants=self._factory.professional_assistants_description()
+        """为 PMCATriageReviewer 设置（按注册表快照预渲染的）提示词。"""
+        from core.team.core_assistants import PMCACoreAssistants
+
+        base_params["system_message"] = self._system_message(
+            PMCACoreAssistants.TRIAGE_REVIEWER.value
         )
-        base_params["system_message"] = final_system_message
         return base_params
 
     def _build_triage_structured_params(
         self, base_params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """为 PMCATriageStructured 设置静态提示词。"""
-        base_params["system_message"] = PMCATRIAGE_STRUCTURED_SYSTEM_MESSAGE
+        from core.team.core_assistants import PMCACoreAssistants
+
+        base_params["system_message"] = self._system_message(
+            PMCACoreAssistants.TRIAGE_STRUCTURED.value
+        )
         # 还可以添加如此智能体专用的llm_config等
         # from core.client.llm_factory import PMCALLMFactory
         # base_params["llm_config"] = PMCALLMFactory.create_llm_config(temperature=0.0)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Type
+
+from .assistant_config import PMCAAssistantMetadata
+
+
+@dataclass(frozen=True)
+class PMCAAssistantRegistrySnapshot:
+    """
+    智能体注册表快照（只读）：
+    - metadata：每个业务类型一份共享的元数据实例，只读；需要可修改的对象请用
+      PMCAAssistantFactory.all_registered_assistants()（返回副本）
+    - professional_description：专业智能体名册文本（按业务类型排序，跨任务字节稳定）
+    - system_messages：核心智能体预先渲染好的系统提示词
+    version 对应 PMCAAssistantFactory 的注册版本号；运行期新注册智能体后快照会被重建。
+    稳定的提示词字节使 provider 侧的前缀缓存（prompt caching）能够跨任务命中。
+    """
+
+    version: int
+    metadata: Mapping[str, PMCAAssistantMetadata]
+    professional_description: str
+    system_messages: Mapping[str, str]
+
+    @classmethod
+    def build(
+        cls, registry: Mapping[str, Type[PMCAAssistantMetadata]], version: int
+    ) -> "PMCAAssistantRegistrySnapshot":
+        from core.team.core_assistants import PMCACoreAssistants
+
+        from .assistant_filter import PMCAAssistantFilter
+
+        metadata = {biz_type: meta_cls() for biz_type, meta_cls in registry.items()}
+        description = "\n".join(
+            f"- {meta.chinese_name} ({name})\n{meta.duty}元数据:{meta.metadata}\n"
+            for name, meta in sorted(metadata.items())
+            if not PMCACoreAssistants.is_core_assistant(name)
+        )
+        return cls(
+            version=version,
+            metadata=MappingProxyType(metadata),
+            professional_description=description,
+            system_messages=MappingProxyType(
+                PMCAAssistantFilter.render_system_messages(description)
+            ),
+        )
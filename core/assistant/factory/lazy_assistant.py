@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from autogen_agentchat.agents import AssistantAgent, BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    HandoffMessage,
+    TextMessage,
+    ToolCallSummaryMessage,
+)
+from autogen_core import CancellationToken
+from loguru import logger
+
+
+class PMCALazyAssistant(BaseChatAgent):
+    """
+    惰性构建的智能体代理：
+    - 构造时只登记名称、描述与 handoffs，团队（Swarm）可以立即完成注册
+    - 第一次轮到它发言时才调用（异步的）builder 构建真正的 AssistantAgent（模型客户端、Mem0 记忆、MCP 工具等）
+    - 未发言的智能体不会产生任何构建开销；构建前收到的 load_state 会在构建后再应用
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        builder: Callable[[], Awaitable[AssistantAgent]],
+        *,
+        handoffs: Optional[List[str]] = None,
+    ) -> None:
+        super().__init__(name=name, description=description)
+        self._builder = builder
+        self._handoffs = list(handoffs or [])
+        self._agent: Optional[AssistantAgent] = None
+        self._pending_state: Optional[Mapping[str, Any]] = None
+        self._lock = asyncio.Lock()
+        self.build_seconds: Optional[float] = None
+
+    @property
+    def materialized(self) -> bool:
+        return self._agent is not None
+
+    @property
+    def handoffs(self) -> List[str]:
+        return list(self._handoffs)
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        if self._agent is not None:
+            return self._agent.produced_message_types
+        # 与 AssistantAgent（未配置结构化输出时）一致
+        return [TextMessage, ToolCallSummaryMessage, HandoffMessage]
+
+    async def materialize(self) -> AssistantAgent:
+        if self._agent is not None:
+            return self._agent
+        async with self._lock:
+            if self._agent is None:
+                started = time.perf_counter()
+                # 阻塞部分（Mem0 记忆构建）由 builder 自行放到工作线程
+                agent = await self._builder()
+                if self._pending_state is not None:
+                    await agent.load_state(self._pending_state)
+                    self._pending_state = None
+                self._agent = agent
+                self.build_seconds = round(time.perf_counter() - started, 3)
+                logger.debug(
+                    f"[LazyAssistant] {self.name} materialized in {self.build_seconds}s"
+                )
+        return self._agent
+
+    async def on_messages(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> Response:
+        agent = await self.materialize()
+        return await agent.on_messages(messages, cancellation_token)
+
+    async def on_messages_stream(
+        self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken
+    ) -> AsyncGenerator[BaseAgentEvent | BaseChatMessage | Response, None]:
+        agent = await self.materialize()
+        async for message in agent.on_messages_stream(messages, cancellation_token):
+            yield message
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        self._pending_state = None
+        if self._agent is not None:
+            await self._agent.on_reset(cancellation_token)
+
+    async def on_pause(self, cancellation_token: CancellationToken) -> None:
+        if self._agent is not None:
+            await self._agent.on_pause(cancellation_token)
+
+    async def on_resume(self, cancellation_token: CancellationToken) -> None:
+        if self._agent is not None:
+            await self._agent.on_resume(cancellation_token)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        if self._agent is not None:
+            return await self._agent.save_state()
+        return dict(self._pending_state or {})
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        if self._agent is not None:
+            await self._agent.load_state(state)
+        elif state:
+            # 尚未构建：暂存，构建后再应用
+            self._pending_state = state
+
+    async def close(self) -> None:
+        if self._agent is not None:
+            await self._agent.close()
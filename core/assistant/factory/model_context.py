@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Mapping, Optional
+
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import (
+    ChatCompletionClient,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    UserMessage,
+)
+from loguru import logger
+
+from base.configs import PMCASystemEnvConfig
+from base.prompts.context import PMCACONTEXT_SUMMARY_PROMPT
+from core.client import AbilityType, LLMFactory
+from core.client.instrumentation import context_metrics
+from core.client.model_info import context_budget
+
+if TYPE_CHECKING:
+    from base.runtime import PMCATaskContext
+
+
+# unbounded：不裁剪（AutoGen 默认行为）；window：只保留最近的消息；
+# head_tail：保留开头的任务消息与最近的消息；summary：在 head_tail 基础上把被裁掉的中段滚动摘要
+ContextStrategy = Literal["unbounded", "window", "head_tail", "summary"]
+
+
+def _render(message: LLMMessage, limit: int = 2000) -> str:
+    source = getattr(message, "source", None) or type(message).__name__
+    content = message.content
+    if isinstance(content, list):
+        content = "; ".join(str(c) for c in content)
+    text = str(content)
+    return f"{source}: {text[:limit]}"
+
+
+class PMCATokenBudgetContext(ChatCompletionContext):
+    """
+    按 token 预算裁剪的模型上下文：
+    - 保留开头 head 条消息（通常是任务描述）与预算内尽可能多的最近消息
+    - 裁剪边界不会落在工具调用与其执行结果之间
+    - strategy="summary" 时，被裁掉的中段由 LLM 滚动合并为一条摘要消息，并写入任务工作台
+    """
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        token_budget: int,
+        *,
+        strategy: ContextStrategy = "head_tail",
+        head: int = 1,
+        owner: str = "unknown",
+        task_id: Optional[str] = None,
+        workbench: Any = None,
+        summary_client: Optional[ChatCompletionClient] = None,
+        initial_messages: List[LLMMessage] | None = None,
+    ) -> None:
+        super().__init__(initial_messages)
+        self._client = model_client
+        self._budget = token_budget
+        self._strategy = strategy
+        self._head = 0 if strategy == "window" else head
+        self._owner = owner
+        self._task_id = task_id
+        self._workbench = workbench
+        self._summary_client = summary_client
+        self._summary = ""
+        # 摘要已覆盖到的消息下标（不含）
+        self._covered = 0
+        self._counts: List[int] = [self._count([m]) for m in self._messages]
+
+    def _count(self, messages: List[LLMMessage]) -> int:
+        try:
+            return self._client.count_tokens(messages)
+        except Exception:
+            # 无法精确计数时按字符数粗估
+            return sum(len(str(m.content)) for m in messages) // 3
+
+    async def add_message(self, message: LLMMessage) -> None:
+        await super().add_message(message)
+        self._counts.append(self._count([message]))
+
+    async def clear(self) -> None:
+        await super().clear()
+        self._counts = []
+        self._summary = ""
+        self._covered = 0
+
+    def _head_end(self) -> int:
+        end = min(self._head, len(self._messages))
+        while end < len(self._messages) and isinstance(
+            self._messages[end], FunctionExecutionResultMessage
+        ):
+            end += 1
+        return end
+
+    def _tail_start(self, head_end: int, budget: int) -> int:
+        start, used = len(self._messages), 0
+        while start > head_end:
+            cost = self._counts[start - 1]
+            # 至少保留最后一条消息
+            if used + cost > budget and start < len(self._messages):
+                break
+            used += cost
+            start -= 1
+        # 不以孤立的工具执行结果开头：向前补上发起该调用的消息（允许略超预算）
+        while start > head_end and isinstance(
+            self._messages[start], FunctionExecutionResultMessage
+        ):
+            start -= 1
+        return start
+
+    async def get_messages(self) -> List[LLMMessage]:
+        total = sum(self._counts)
+        if total <= self._budget or self._strategy == "unbounded":
+            context_metrics.record(self._task_id, self._owner, total, total)
+            return list(self._messages)
+
+        head_end = self._head_end()
+        head_tokens = sum(self._counts[:head_end])
+        summary_reserve = self._budget // 8 if self._strategy == "summary" else 0
+        tail_budget = max(self._budget - head_tokens - summary_reserve, 0)
+        tail_start = self._tail_start(head_end, tail_budget)
+
+        messages = self._messages[:head_end]
+        summarized = False
+        if self._strategy == "summary" and tail_start > head_end:
+            summarized = await self._update_summary(
+                max(head_end, self._covered), tail_start
+            )
+            if self._summary:
+                messages.append(
+                    UserMessage(
+                        content=f"[早期对话摘要]\n{self._summary}",
+                        source="context_summary",
+                    )
+                )
+        messages.extend(self._messages[tail_start:])
+
+        context_metrics.record(
+            self._task_id, self._owner, total, self._count(messages), summarized
+        )
+        return messages
+
+    async def _update_summary(self, start: int, end: int) -> bool:
+        """把 [start, end) 范围内尚未摘要的消息合并进滚动摘要；失败时退化为 head_tail。"""
+        if end <= start or self._summary_client is None:
+            return False
+        prompt = PMCACONTEXT_SUMMARY_PROMPT.format(
+            max_words=max(self._budget // 16, 200),
+            summary=self._summary or "（无）",
+            messages="\n".join(_render(m) for m in self._messages[start:end]),
+        )
+        try:
+            result = await self._summary_client.create(
+                [UserMessage(content=prompt, source="context_manager")]
+            )
+        except Exception as e:
+            logger.warning(f"[ModelContext] {self._owner} summary failed: {e}")
+            return False
+        if not isinstance(result.content, str):
+            return False
+        self._summary, self._covered = result.content.strip(), end
+        if self._workbench is not None:
+            await self._workbench.set_item(
+                f"context_summary:{self._owner}",
+                {"summary": self._summary, "covered": self._covered},
+            )
+        return True
+
+    async def save_state(self) -> Mapping[str, Any]:
+        state = dict(await super().save_state())
+        state.update(summary=self._summary, covered=self._covered)
+        return state
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        await super().load_state(state)
+        self._counts = [self._count([m]) for m in self._messages]
+        self._summary = state.get("summary", "")
+        self._covered = state.get("covered", 0)
+
+
+def build_model_context(
+    ctx: "PMCATaskContext",
+    owner: str,
+    ability: AbilityType,
+    model_client: ChatCompletionClient,
+    *,
+    strategy: Optional[ContextStrategy] = None,
+    token_budget: Optional[int] = None,
+    head: int = 1,
+) -> Optional[PMCATokenBudgetContext]:
+    """
+    为智能体 / 团队选择器构建上下文管理器；strategy 为 unbounded 时返回 None（沿用 AutoGen 默认）。
+    预算未显式指定时按 MODEL_INFO 登记的上下文窗口 * LLM_CONTEXT_BUDGET_RATIO 推导。
+    """
+    strategy = strategy or PMCASystemEnvConfig.LLM_CONTEXT_STRATEGY
+    if strategy == "unbounded":
+        return None
+    if token_budget is None:
+        provider, model_name = LLMFactory.get_config_for_ability(ability)
+        token_budget = context_budget(
+            provider, model_name, PMCASystemEnvConfig.LLM_CONTEXT_BUDGET_RATIO
+        )
+
+    summary_client = None
+    if strategy == "summary":
+        summary_client = ctx.llm_factory.client(
+            ability,
+            cache=True,
+            assistant=f"{owner}.context_summary",
+            task_id=ctx.task_id,
+            priority="bulk",
+        )
+    return PMCATokenBudgetContext(
+        model_client,
+        token_budget,
+        strategy=strategy,
+        head=head,
+        owner=owner,
+        task_id=ctx.task_id,
+        workbench=ctx.task_workbench,
+        summary_client=summary_client,
+    )
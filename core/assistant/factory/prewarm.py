@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+from core.memory.factory.mem0 import PMCAMem0LocalService
+from core.tools.common.mcp_pool import PMCAPooledMcpWorkbench
+
+if TYPE_CHECKING:
+    from .assistant_factory import PMCAAssistantFactory
+
+
+@dataclass
+class PMCAPrewarmStats:
+    scheduled: int = 0
+    ready: int = 0
+    failed: int = 0
+    # 执行团队构建时直接取用了预热资源的智能体数
+    claimed: int = 0
+    # 分诊结果未选中、被丢弃的预热
+    discarded: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class PMCAAssistantPrewarmer:
+    """
+    执行团队的投机预热（每个任务一个）：
+    - 分诊讨论过程中，一旦消息里点到某个专业智能体，就在后台预热它的模型客户端、Mem0 记忆与 MCP 会话
+    - 分诊结构化结果产出后 commit：保留被选中的智能体的预热资源，其余丢弃（非池化的 MCP 连接会被关闭）
+    - 工厂构建智能体时通过 claim_tools 取用已就绪的工具；尚未就绪时照常新建，不等待
+    """
+
+    WORKBENCH_KEY = "prewarm_stats"
+
+    def __init__(self, factory: "PMCAAssistantFactory", concurrency: int = 4) -> None:
+        self._factory = factory
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # biz_type -> 已启动的工具参数（create_assistant 中 _create_tools 的返回值）
+        self._ready: Dict[str, Dict[str, Any]] = {}
+        # 构建可能在工作线程中进行（惰性智能体 / swarm 并发构建）
+        self._ready_lock = threading.Lock()
+        self._needed: Optional[Set[str]] = None
+        self.stats = PMCAPrewarmStats()
+
+    def candidates(self, text: str) -> List[str]:
+        """找出文本中点到的专业智能体（按业务类型名 / 智能体名 / 中文名匹配）。"""
+        from core.team.core_assistants import PMCACoreAssistants
+
+        found = []
+        for biz_type, meta in self._factory.snapshot().metadata.items():
+            if PMCACoreAssistants.is_core_assistant(biz_type):
+                continue
+            names = {biz_type, meta.name, meta.chinese_name}
+            if any(name and name in text for name in names):
+                found.append(biz_type)
+        return found
+
+    def observe(self, text: str) -> None:
+        """根据分诊过程中的一条消息安排预热；commit 之后不再接受新的候选。"""
+        if self._needed is not None or not text:
+            return
+        for biz_type in self.candidates(text):
+            self.schedule(biz_type)
+
+    def schedule(self, biz_type: str) -> None:
+        if biz_type in self._tasks:
+            return
+        self.stats.scheduled += 1
+        self._tasks[biz_type] = asyncio.get_running_loop().create_task(
+            self._prewarm(biz_type)
+        )
+        logger.debug(f"[Prewarm] scheduled {biz_type}")
+
+    async def _prewarm(self, biz_type: str) -> None:
+        async with self._slots:
+            try:
+                tools = await asyncio.to_thread(self._warm_sync, biz_type)
+                # 连接 MCP 服务并拉取工具列表（池化会话只在进程内首次使用时真正连接）
+                for workbench in tools.get("workbench", []):
+                    await workbench.list_tools()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                logger.warning(f"[Prewarm] {biz_type} failed: {e}")
+                return
+
+        if self._needed is not None and biz_type not in self._needed:
+            await self._discard(tools)
+            return
+        with self._ready_lock:
+            self._ready[biz_type] = tools
+        self.stats.ready += 1
+        logger.debug(f"[Prewarm] {biz_type} ready")
+
+    def _warm_sync(self, biz_type: str) -> Dict[str, Any]:
+        """阻塞部分：客户端池与 Mem0 实例均为进程级缓存，这里只是提前触发构建。"""
+        factory = self._factory
+        meta = factory.snapshot().metadata[biz_type]
+        factory.ctx.llm_factory.client(
+            meta.ability,
+            cache=meta.llm_cache,
+            assistant=meta.name or biz_type,
+            task_id=factory.ctx.task_id,
+        )
+        PMCAMem0LocalService.memory(meta.name or biz_type)
+        return factory._create_tools(biz_type)
+
+    def claim_tools(self, biz_type: str) -> Optional[Dict[str, Any]]:
+        """取走已就绪的预热工具（每个业务类型只能取用一次）。"""
+        with self._ready_lock:
+            tools = self._ready.pop(biz_type, None)
+        if tools is not None:
+            self.stats.claimed += 1
+        return tools
+
+    async def commit(self, needed: Iterable[str]) -> None:
+        """分诊结果已确定：丢弃未被选中的预热，并把统计写入任务工作台。"""
+        # 仍在进行的预热完成后会自行检查是否被选中（中途取消可能遗留已连接的会话）
+        self._needed = set(needed)
+        with self._ready_lock:
+            unused = [
+                self._ready.pop(biz_type)
+                for biz_type in list(self._ready)
+                if biz_type not in self._needed
+            ]
+        for tools in unused:
+            await self._discard(tools)
+
+        logger.info(f"[Prewarm] commit {sorted(self._needed)}: {self.stats.to_dict()}")
+        try:
+            await self._factory.ctx.task_workbench.set_item(
+                self.WORKBENCH_KEY, self.stats.to_dict()
+            )
+        except Exception as e:
+            logger.warning(f"[Prewarm] store stats failed: {e}")
+
+    async def _discard(self, tools: Dict[str, Any]) -> None:
+        self.stats.discarded += 1
+        for workbench in tools.get("workbench", []):
+            # 池化租约不持有连接；独占的 McpWorkbench 需要关闭
+            if isinstance(workbench, PMCAPooledMcpWorkbench):
+                continue
+            try:
+                await workbench.stop()
+            except Exception as e:
+                logger.debug(f"[Prewarm] stop workbench failed: {e}")
+
+    async def close(self) -> None:
+        """任务结束：取消仍在进行的预热并释放未被取用的资源。"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        with self._ready_lock:
+            unused, self._ready = list(self._ready.values()), {}
+        for tools in unused:
+            await self._discard(tools)
+
+
+def triage_assistants(triage_result: Optional[Dict[str, Any]]) -> List[str]:
+    """分诊结构化结果中实际选用的专业智能体。"""
+    if not triage_result:
+        return []
+    if triage_result.get("task_type") == "simple":
+        assistant = triage_result.get("assistant")
+        return [assistant] if assistant else []
+    return [
+        name
+        for team in triage_result.get("team") or []
+        for name in team.get("participants") or []
+    ]
@@ -1,8 +1,11 @@
 from .llm_factory import LLMFactory, ProviderType, AbilityType
 from .model_info import supports_structured_output
+from .instrumentation import llm_metrics, set_llm_node
 
 __all__ = [
     "LLMFactory",
     "ProviderType",
     "AbilityType",
+    "llm_metrics",
+    "set_llm_node",
 ]
@@ -0,0 +1,107 @@
+from typing import Any, AsyncGenerator, Literal, Mapping, Optional, Sequence, Union
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore[attr-defined]
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+
+class PMCAChatClientWrapper(ChatCompletionClient):
+    """
+    LLM 客户端装饰器基类：默认把全部调用原样转发给被包裹的客户端。
+    缓存、计量、限流等能力通过继承并覆盖 create / create_stream 叠加，
+    多层包裹时 close() 只会作用于最内层的真实客户端（由 LLMFactory 的客户端池统一关闭）。
+    """
+
+    def __init__(self, inner: ChatCompletionClient) -> None:
+        self._inner = inner
+
+    @property
+    def inner(self) -> ChatCompletionClient:
+        return self._inner
+
+    @property
+    def model_name(self) -> str:
+        """被包裹客户端的模型名（尽力而为，未知时返回 family）。"""
+        client: Any = self._inner
+        while isinstance(client, PMCAChatClientWrapper):
+            client = client.inner
+        create_args = getattr(client, "_create_args", None) or {}
+        return (
+            create_args.get("model")
+            or getattr(client, "_model_name", None)
+            or str(self.model_info.get("family", "unknown"))
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        return await self._inner.create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self._inner.create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+
+    async def close(self) -> None:
+        # 真实客户端由 LLMFactory.close_all() 统一关闭，包裹层不单独关闭共享连接
+        return None
+
+    def actual_usage(self) -> RequestUsage:
+        return self._inner.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self._inner.total_usage()
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._inner.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return self._inner.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore[override]
+        return self._inner.capabilities  # type: ignore[attr-defined]
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._inner.model_info
@@ -0,0 +1,289 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from loguru import logger
+from pydantic import BaseModel
+
+from .client_wrapper import PMCAChatClientWrapper
+
+# critical：分诊 / 选择器等阻塞全局流程的调用；normal：默认；bulk：swarm 内的大批量执行
+LLMPriority = Literal["critical", "normal", "bulk"]
+_PRIORITY_ORDER: Dict[str, int] = {"critical": 0, "normal": 1, "bulk": 2}
+
+
+class _TokenBucket:
+    """按分钟速率匀速补充的令牌桶；允许透支（实际用量超出预估时），透支部分在后续补充中偿还。"""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        # 单次请求超过桶容量时按满桶放行，避免永久阻塞
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= amount
+
+
+@dataclass
+class PMCAProviderLimits:
+    rpm: int = 0  # 每分钟请求数；0 不限制
+    tpm: int = 0  # 每分钟 token 数（prompt + completion）；0 不限制
+    concurrency: int = 0  # 同时在途请求数；0 不限制
+
+
+@dataclass
+class _WaitStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, waited: float) -> None:
+        self.count += 1
+        self.total += waited
+        self.max = max(self.max, waited)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "wait_total": round(self.total, 4),
+            "wait_avg": round(self.total / self.count, 4) if self.count else 0.0,
+            "wait_max": round(self.max, 4),
+        }
+
+
+class _ProviderGate:
+    """
+    单个 provider 的准入控制：
+    - 所有等待者按 (优先级, 到达顺序) 排成一个队列，只有队首能被放行
+    - 放行条件：在途数未达上限，且 RPM / TPM 令牌桶有足够余量
+    """
+
+    def __init__(self, limits: PMCAProviderLimits) -> None:
+        self.limits = limits
+        self._rpm = _TokenBucket(limits.rpm) if limits.rpm else None
+        self._tpm = _TokenBucket(limits.tpm) if limits.tpm else None
+        self._inflight = 0
+        self._waiters: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+
+    def _bucket_wait(self, tokens: int) -> float:
+        wait = 0.0
+        if self._rpm is not None:
+            wait = max(wait, self._rpm.wait_time(1))
+        if self._tpm is not None:
+            wait = max(wait, self._tpm.wait_time(tokens))
+        return wait
+
+    async def acquire(self, priority: int, tokens: int) -> None:
+        me = (priority, next(self._seq))
+        async with self._cond:
+            heapq.heappush(self._waiters, me)
+            try:
+                while True:
+                    timeout: Optional[float] = None
+                    if self._waiters[0] == me and (
+                        not self.limits.concurrency
+                        or self._inflight < self.limits.concurrency
+                    ):
+                        timeout = self._bucket_wait(tokens)
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                self._waiters.remove(me)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._waiters)
+            self._inflight += 1
+            if self._rpm is not None:
+                self._rpm.consume(1)
+            if self._tpm is not None:
+                self._tpm.consume(tokens)
+            # 让新的队首重新检查放行条件
+            self._cond.notify_all()
+
+    async def release(self, estimated: int, actual: Optional[int]) -> None:
+        async with self._cond:
+            self._inflight -= 1
+            if self._tpm is not None and actual is not None:
+                self._tpm.consume(actual - estimated)
+            self._cond.notify_all()
+
+
+class PMCALLMGovernor:
+    """
+    进程级 LLM 调用治理：按 provider 的 RPM / TPM 令牌桶与在途并发上限排队放行，
+    并按优先级（critical > normal > bulk）决定排队顺序；记录各 provider / 优先级的排队等待时间。
+    """
+
+    def __init__(self, limits: Mapping[str, PMCAProviderLimits]) -> None:
+        self._limits = dict(limits)
+        self._gates: Dict[str, _ProviderGate] = {}
+        self._stats: Dict[Tuple[str, str], _WaitStats] = defaultdict(_WaitStats)
+
+    @classmethod
+    def from_config(cls, env: Any) -> "PMCALLMGovernor":
+        return cls(
+            {
+                provider: PMCAProviderLimits(**cfg)
+                for provider, cfg in env.LLM_PROVIDER_LIMITS.items()
+            }
+        )
+
+    def governs(self, provider: str) -> bool:
+        limits = self._limits.get(provider)
+        return bool(limits and (limits.rpm or limits.tpm or limits.concurrency))
+
+    def _gate(self, provider: str) -> _ProviderGate:
+        gate = self._gates.get(provider)
+        if gate is None:
+            gate = self._gates[provider] = _ProviderGate(self._limits[provider])
+        return gate
+
+    @asynccontextmanager
+    async def slot(
+        self, provider: str, priority: LLMPriority, tokens: int
+    ) -> AsyncIterator["_SlotUsage"]:
+        gate = self._gate(provider)
+        started = time.perf_counter()
+        await gate.acquire(_PRIORITY_ORDER.get(priority, 1), tokens)
+        waited = time.perf_counter() - started
+        self._stats[(provider, priority)].add(waited)
+        if waited > 1.0:
+            logger.debug(
+                f"[LLMGovernor] {provider}/{priority} queued {waited:.2f}s before dispatch"
+            )
+        usage = _SlotUsage()
+        try:
+            yield usage
+        finally:
+            await gate.release(tokens, usage.actual_tokens)
+
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        out: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        for (provider, priority), s in self._stats.items():
+            out[provider][priority] = s.to_dict()
+        return dict(out)
+
+
+@dataclass
+class _SlotUsage:
+    actual_tokens: Optional[int] = None
+
+
+class PMCAGovernedChatClient(PMCAChatClientWrapper):
+    """经 PMCALLMGovernor 排队放行的客户端；流式调用在整个流结束前都占用并发名额。"""
+
+    def __init__(
+        self,
+        inner: ChatCompletionClient,
+        governor: PMCALLMGovernor,
+        provider: str,
+        priority: LLMPriority = "normal",
+    ) -> None:
+        super().__init__(inner)
+        self._governor = governor
+        self._provider = provider
+        self._priority = priority
+
+    def _estimate_tokens(
+        self, messages: Sequence[LLMMessage], tools: Sequence[Tool | ToolSchema]
+    ) -> int:
+        try:
+            return self.count_tokens(messages, tools=tools)
+        except Exception:
+            # 无法精确计数时按字符数粗估
+            return sum(len(str(m.content)) for m in messages) // 3
+
+    @staticmethod
+    def _used_tokens(result: Optional[CreateResult]) -> Optional[int]:
+        if result is None:
+            return None
+        return result.usage.prompt_tokens + result.usage.completion_tokens
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        tokens = self._estimate_tokens(messages, tools)
+        async with self._governor.slot(self._provider, self._priority, tokens) as usage:
+            result = await super().create(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+            usage.actual_tokens = self._used_tokens(result)
+            return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        tokens = self._estimate_tokens(messages, tools)
+        async with self._governor.slot(self._provider, self._priority, tokens) as usage:
+            async for chunk in super().create_stream(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            ):
+                if isinstance(chunk, CreateResult):
+                    usage.actual_tokens = self._used_tokens(chunk)
+                yield chunk
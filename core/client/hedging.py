@@ -0,0 +1,244 @@
+import asyncio
+import math
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from loguru import logger
+from pydantic import BaseModel
+
+from .client_wrapper import PMCAChatClientWrapper
+
+
+@dataclass
+class PMCAHedgeStats:
+    calls: int = 0
+    # 超过截止时间后发出了对冲请求的次数
+    hedged: int = 0
+    # 对冲请求先于主请求返回的次数
+    hedge_wins: int = 0
+    # 主请求失败后由备用请求兜底成功的次数
+    fallbacks: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+        }
+
+
+class PMCALLMHedger:
+    """
+    对冲策略与统计（进程级）：
+    - 按样本键（主模型 + ttft / total）记录最近的时延，截止时间取其 percentile 分位
+    - 主请求的每次完成都记录样本（包括输给备用请求的）；被取消的主请求记录取消时的已等待时长（截尾样本）
+    - 样本不足 min_samples 时使用 default_deadline
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        default_deadline: float = 8.0,
+        window: int = 200,
+    ) -> None:
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_deadline = default_deadline
+        self._window = window
+        self._samples: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self._window)
+        )
+        self._stats: Dict[str, PMCAHedgeStats] = defaultdict(PMCAHedgeStats)
+
+    @classmethod
+    def from_config(cls, env: Any) -> "PMCALLMHedger":
+        return cls(
+            percentile=env.LLM_HEDGE_PERCENTILE,
+            min_samples=env.LLM_HEDGE_MIN_SAMPLES,
+            default_deadline=env.LLM_HEDGE_DEFAULT_DEADLINE,
+        )
+
+    def deadline(self, key: str) -> float:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return self.default_deadline
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+    def observe(self, key: str, latency: float) -> None:
+        self._samples[key].append(latency)
+
+    def stats_for(self, key: str) -> PMCAHedgeStats:
+        return self._stats[key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {k: v.to_dict() for k, v in self._stats.items()}
+
+
+async def _cancel(task: "asyncio.Task[Any]") -> None:
+    if not task.done():
+        task.cancel()
+    try:
+        await task
+    except BaseException:
+        pass
+
+
+class PMCAHedgedChatClient(PMCAChatClientWrapper):
+    """
+    对冲请求：主请求在截止时间内未返回首 token 时，向能力兼容的备用模型发出同一请求，
+    先返回者胜出，另一路被取消；主请求在截止前失败时直接改发备用请求（兜底）。
+    """
+
+    def __init__(
+        self,
+        primary: ChatCompletionClient,
+        secondary: ChatCompletionClient,
+        hedger: PMCALLMHedger,
+        key: str,
+    ) -> None:
+        super().__init__(primary)
+        self._secondary = secondary
+        self._hedger = hedger
+        self._key = key
+
+    async def _race(
+        self,
+        start_primary,
+        start_secondary,
+        sample_key: str,
+    ) -> Tuple[Any, bool]:
+        """
+        运行主请求，必要时启动备用请求；返回 (胜出结果, 是否为备用请求)。
+        sample_key 为截止时间所用的时延样本键（create 与 create_stream 分开统计）。
+        """
+        stats = self._hedger.stats_for(self._key)
+        stats.calls += 1
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(start_primary())
+
+        def _record(task: "asyncio.Task[Any]") -> None:
+            # 成功完成（无论是否胜出）或被取消（截尾）都计入样本；失败不计
+            if task.cancelled() or task.exception() is None:
+                self._hedger.observe(sample_key, time.perf_counter() - started)
+
+        primary.add_done_callback(_record)
+        done, _ = await asyncio.wait(
+            {primary}, timeout=self._hedger.deadline(sample_key)
+        )
+        if primary in done and primary.exception() is None:
+            return primary.result(), False
+
+        if primary in done:
+            # 主请求在截止前失败：直接兜底
+            stats.fallbacks += 1
+            logger.warning(
+                f"[LLMHedge] {self._key} failed, falling back: {primary.exception()!r}"
+            )
+            return await start_secondary(), True
+
+        stats.hedged += 1
+        secondary = asyncio.ensure_future(start_secondary())
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in (primary, secondary):
+                    if task in done and task.exception() is None:
+                        if task is secondary:
+                            stats.hedge_wins += 1
+                        return task.result(), task is secondary
+            # 两路都失败：抛出主请求的异常
+            raise primary.exception()  # type: ignore[misc]
+        finally:
+            for task in (primary, secondary):
+                await _cancel(task)
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        kwargs = dict(
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        result, _ = await self._race(
+            lambda: self._inner.create(messages, **kwargs),
+            lambda: self._secondary.create(messages, **kwargs),
+            f"{self._key}:total",
+        )
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        kwargs = dict(
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        streams: Dict[bool, AsyncIterator[Union[str, CreateResult]]] = {}
+
+        def first_chunk(is_secondary: bool):
+            client = self._secondary if is_secondary else self._inner
+
+            async def _next() -> Union[str, CreateResult]:
+                stream = client.create_stream(messages, **kwargs)
+                streams[is_secondary] = stream
+                return await stream.__anext__()
+
+            return _next
+
+        # 对冲只比较首 token；胜出后继续消费该路的剩余输出，另一路关闭
+        chunk, won_secondary = await self._race(
+            first_chunk(False), first_chunk(True), f"{self._key}:ttft"
+        )
+        loser = streams.get(not won_secondary)
+        if loser is not None:
+            try:
+                await loser.aclose()  # type: ignore[attr-defined]
+            except Exception:
+                pass
+        yield chunk
+        async for chunk in streams[won_secondary]:
+            yield chunk
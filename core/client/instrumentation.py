@@ -0,0 +1,368 @@
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncGenerator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from pydantic import BaseModel
+
+from .client_wrapper import PMCAChatClientWrapper
+
+# 当前所在的图节点；由各节点包裹器在处理消息时设置，
+# 节点内团队的运行时任务在其后创建，因而会继承该值
+_current_llm_node: ContextVar[Optional[str]] = ContextVar("pmca_llm_node", default=None)
+
+
+def set_llm_node(node: Optional[str]) -> None:
+    """为当前异步上下文（及其后创建的子任务）标记图节点名。"""
+    _current_llm_node.set(node)
+
+
+def current_llm_node() -> Optional[str]:
+    return _current_llm_node.get()
+
+
+@dataclass
+class PMCALLMCallRecord:
+    task_id: Optional[str]
+    assistant: Optional[str]
+    node: Optional[str]
+    model: str
+    started_at: float
+    latency: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # 流式调用的首 token 时延（秒）；非流式为 None
+    ttft: Optional[float] = None
+    streaming: bool = False
+    cached: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _summarize(records: Iterable[PMCALLMCallRecord]) -> Dict[str, Any]:
+    calls = errors = cached = prompt = completion = 0
+    latency = 0.0
+    ttfts: List[float] = []
+    for r in records:
+        calls += 1
+        errors += r.error is not None
+        cached += r.cached
+        prompt += r.prompt_tokens
+        completion += r.completion_tokens
+        latency += r.latency
+        if r.ttft is not None:
+            ttfts.append(r.ttft)
+    return {
+        "calls": calls,
+        "errors": errors,
+        "cached": cached,
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "latency_total": round(latency, 4),
+        "latency_avg": round(latency / calls, 4) if calls else 0.0,
+        "ttft_avg": round(sum(ttfts) / len(ttfts), 4) if ttfts else None,
+    }
+
+
+def _trim_oldest(buckets: Dict[Any, Any], max_tasks: int) -> None:
+    """按插入顺序丢弃最早的任务，直到不超过 max_tasks（未被 pop_task 回收的任务的兜底）。"""
+    while max_tasks and len(buckets) > max_tasks:
+        buckets.pop(next(iter(buckets)))
+
+
+class PMCALLMMetrics:
+    """
+    进程级 LLM 调用记录：
+    - 每个任务保留最近 max_records_per_task 条明细；最多保留 max_tasks 个任务，超出时丢弃最早的任务
+      （正常情况下任务结束时由 PMCARuntime.collect_task_metrics 写入工作台后 pop_task）
+    - 按任务 / 智能体聚合，可导出 JSONL 与 Prometheus 文本格式
+    - 任务结束后可通过 flush_to_workbench 写入任务工作台，供事后查询
+    """
+
+    WORKBENCH_KEY = "llm_metrics"
+
+    def __init__(self, max_records_per_task: int = 5000, max_tasks: int = 256) -> None:
+        self._max = max_records_per_task
+        self._max_tasks = max_tasks
+        self._lock = threading.Lock()
+        self._records: Dict[Optional[str], Deque[PMCALLMCallRecord]] = {}
+
+    def record(self, rec: PMCALLMCallRecord) -> None:
+        with self._lock:
+            bucket = self._records.get(rec.task_id)
+            if bucket is None:
+                bucket = self._records[rec.task_id] = deque(maxlen=self._max)
+                _trim_oldest(self._records, self._max_tasks)
+            bucket.append(rec)
+
+    def records(self, task_id: Optional[str] = None) -> List[PMCALLMCallRecord]:
+        with self._lock:
+            if task_id is not None:
+                return list(self._records.get(task_id, ()))
+            return [r for bucket in self._records.values() for r in bucket]
+
+    def summary_by_task(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buckets = {k: list(v) for k, v in self._records.items()}
+        return {str(k): _summarize(v) for k, v in buckets.items()}
+
+    def summary_by_assistant(
+        self, task_id: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        grouped: Dict[str, List[PMCALLMCallRecord]] = defaultdict(list)
+        for r in self.records(task_id):
+            grouped[r.assistant or "unknown"].append(r)
+        return {k: _summarize(v) for k, v in grouped.items()}
+
+    def to_jsonl(self, task_id: Optional[str] = None) -> str:
+        return "".join(
+            json.dumps(r.to_dict(), ensure_ascii=False) + "\n"
+            for r in self.records(task_id)
+        )
+
+    def export_jsonl(
+        self, path: Union[str, Path], task_id: Optional[str] = None
+    ) -> None:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_jsonl(task_id))
+
+    def prometheus_text(self) -> str:
+        """Prometheus 文本格式；标签仅含 assistant / node / model，避免 task_id 造成高基数。"""
+        series: Dict[tuple, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for r in self.records():
+            s = series[(r.assistant or "unknown", r.node or "unknown", r.model)]
+            s["calls"] += 1
+            s["errors"] += r.error is not None
+            s["prompt"] += r.prompt_tokens
+            s["completion"] += r.completion_tokens
+            s["latency"] += r.latency
+            if r.ttft is not None:
+                s["ttft"] += r.ttft
+                s["ttft_count"] += 1
+
+        lines = [
+            "# TYPE pmca_llm_calls_total counter",
+            "# TYPE pmca_llm_errors_total counter",
+            "# TYPE pmca_llm_tokens_total counter",
+            "# TYPE pmca_llm_latency_seconds summary",
+            "# TYPE pmca_llm_ttft_seconds summary",
+        ]
+        for (assistant, node, model), s in sorted(series.items()):
+            labels = f'assistant="{assistant}",node="{node}",model="{model}"'
+            lines += [
+                f"pmca_llm_calls_total{{{labels}}} {s['calls']:g}",
+                f"pmca_llm_errors_total{{{labels}}} {s['errors']:g}",
+                f'pmca_llm_tokens_total{{{labels},kind="prompt"}} {s["prompt"]:g}',
+                f'pmca_llm_tokens_total{{{labels},kind="completion"}} {s["completion"]:g}',
+                f"pmca_llm_latency_seconds_sum{{{labels}}} {s['latency']:.6f}",
+                f"pmca_llm_latency_seconds_count{{{labels}}} {s['calls']:g}",
+                f"pmca_llm_ttft_seconds_sum{{{labels}}} {s['ttft']:.6f}",
+                f"pmca_llm_ttft_seconds_count{{{labels}}} {s['ttft_count']:g}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def workbench_items(self, task_id: str) -> Dict[str, Any]:
+        """任务的汇总与明细（工作台 llm_metrics 键的值）。"""
+        records = self.records(task_id)
+        return {
+            self.WORKBENCH_KEY: {
+                "summary": _summarize(records),
+                "by_assistant": self.summary_by_assistant(task_id),
+                "records": [r.to_dict() for r in records],
+            }
+        }
+
+    async def flush_to_workbench(self, workbench: Any, task_id: str) -> None:
+        """把任务的汇总与明细写入任务工作台 llm_metrics 键。"""
+        await workbench.set_many(self.workbench_items(task_id))
+
+    def pop_task(self, task_id: str) -> List[PMCALLMCallRecord]:
+        with self._lock:
+            return list(self._records.pop(task_id, ()))
+
+
+# 进程级默认收集器
+llm_metrics = PMCALLMMetrics()
+
+
+class PMCAContextMetrics:
+    """
+    按 (task_id, 上下文归属) 统计每次取上下文时的完整历史 token 与实际发送 token。
+    与 PMCALLMMetrics 相同：任务结束时 pop_task，最多保留 max_tasks 个任务。
+    """
+
+    WORKBENCH_KEY = "context_metrics"
+
+    def __init__(self, max_tasks: int = 256) -> None:
+        self._max_tasks = max_tasks
+        self._lock = threading.Lock()
+        self._stats: Dict[Optional[str], Dict[str, Dict[str, int]]] = defaultdict(
+            lambda: defaultdict(
+                lambda: {"calls": 0, "full_tokens": 0, "sent_tokens": 0, "summaries": 0}
+            )
+        )
+
+    def record(
+        self,
+        task_id: Optional[str],
+        owner: str,
+        full_tokens: int,
+        sent_tokens: int,
+        summarized: bool = False,
+    ) -> None:
+        with self._lock:
+            new_task = task_id not in self._stats
+            s = self._stats[task_id][owner]
+            if new_task:
+                _trim_oldest(self._stats, self._max_tasks)
+            s["calls"] += 1
+            s["full_tokens"] += full_tokens
+            s["sent_tokens"] += sent_tokens
+            s["summaries"] += summarized
+
+    def summary(self, task_id: Optional[str]) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.get(task_id, {}).items()}
+
+    def workbench_items(self, task_id: str) -> Dict[str, Any]:
+        stats = self.summary(task_id)
+        return {self.WORKBENCH_KEY: stats} if stats else {}
+
+    async def flush_to_workbench(self, workbench: Any, task_id: str) -> None:
+        await workbench.set_many(self.workbench_items(task_id))
+
+    def pop_task(self, task_id: str) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.pop(task_id, {}).items()}
+
+
+# 进程级默认收集器
+context_metrics = PMCAContextMetrics()
+
+
+class PMCAInstrumentedChatClient(PMCAChatClientWrapper):
+    """为每次调用记录 token、时延与首 token 时延（流式），标签为 task_id / 智能体 / 图节点 / 模型。"""
+
+    def __init__(
+        self,
+        inner: ChatCompletionClient,
+        *,
+        task_id: Optional[str] = None,
+        assistant: Optional[str] = None,
+        metrics: Optional[PMCALLMMetrics] = None,
+    ) -> None:
+        super().__init__(inner)
+        self._task_id = task_id
+        self._assistant = assistant
+        self._metrics = metrics or llm_metrics
+
+    def _record(
+        self,
+        started_at: float,
+        started: float,
+        result: Optional[CreateResult],
+        *,
+        ttft: Optional[float] = None,
+        streaming: bool = False,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        usage = result.usage if result is not None else None
+        self._metrics.record(
+            PMCALLMCallRecord(
+                task_id=self._task_id,
+                assistant=self._assistant,
+                node=current_llm_node(),
+                model=self.model_name,
+                started_at=started_at,
+                latency=time.perf_counter() - started,
+                prompt_tokens=usage.prompt_tokens if usage else 0,
+                completion_tokens=usage.completion_tokens if usage else 0,
+                ttft=ttft,
+                streaming=streaming,
+                cached=bool(result and result.cached),
+                error=type(error).__name__ if error is not None else None,
+            )
+        )
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        started_at, started = time.time(), time.perf_counter()
+        try:
+            result = await super().create(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            )
+        except BaseException as e:
+            self._record(started_at, started, None, error=e)
+            raise
+        self._record(started_at, started, result)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        started_at, started = time.time(), time.perf_counter()
+        ttft: Optional[float] = None
+        result: Optional[CreateResult] = None
+        try:
+            async for chunk in super().create_stream(
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                cancellation_token=cancellation_token,
+            ):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                if isinstance(chunk, CreateResult):
+                    result = chunk
+                yield chunk
+        except BaseException as e:
+            # 调用方提前结束迭代（GeneratorExit）不算作错误
+            error = None if isinstance(e, GeneratorExit) else e
+            self._record(
+                started_at, started, result, ttft=ttft, streaming=True, error=error
+            )
+            raise
+        self._record(started_at, started, result, ttft=ttft, streaming=True)
@@ -1,13 +1,24 @@
+import threading
 from enum import Enum
 from loguru import logger
-from typing import Union, Optional, Tuple
+from typing import Any, Dict, Union, Optional, Tuple
 
+from autogen_core.models import ChatCompletionClient
 from autogen_ext.models.ollama import OllamaChatCompletionClient
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
 # 导入单例配置实例
 from base.configs import PMCASystemEnvConfig
-from core.client.model_info import MODEL_INFO
+from core.client.model_info import MODEL_INFO, compatible_models
+from core.client.governor import LLMPriority, PMCAGovernedChatClient, PMCALLMGovernor
+from core.client.hedging import PMCAHedgedChatClient, PMCALLMHedger
+from core.client.instrumentation import PMCAInstrumentedChatClient
+from core.client.record_replay import (
+    PMCALLMRecordStore,
+    PMCARecordingChatClient,
+    PMCAReplayChatClient,
+)
+from core.client.response_cache import PMCACachedChatClient, PMCALLMCacheStore
 
 
 class ProviderType(str, Enum):
@@ -29,8 +40,18 @@ class AbilityType(str, Enum):
 class LLMFactory:
     """
     该工厂的逻辑核心是：根据能力（Ability）确定模型和提供商，再根据全局服务模式（LLM_TYPE）创建对应的客户端实例。
+    客户端按 (服务模式, provider, model, base_url) 缓存在进程级池中，跨智能体与任务复用。
     """
 
+    _pool: Dict[Tuple[str, str, str, Optional[str]], ChatCompletionClient] = {}
+    _pool_lock = threading.Lock()
+    _pool_hits = 0
+    _pool_misses = 0
+    _response_cache: Optional[PMCALLMCacheStore] = None
+    _governor: Optional[PMCALLMGovernor] = None
+    _hedger: Optional[PMCALLMHedger] = None
+    _record_store: Optional[PMCALLMRecordStore] = None
+
     @staticmethod
     def get_config_for_ability(ability: AbilityType) -> Tuple[ProviderType, str]:
         """从环境变量配置中，为指定的模型能力获取Provider和ModelName。"""
@@ -48,14 +69,23 @@ class LLMFactory:
         ability: AbilityType = AbilityType.DEFAULT,
         provider_override: Optional[ProviderType] = None,
         model_name_override: Optional[str] = None,
-    ) -> Union[OpenAIChatCompletionClient, OllamaChatCompletionClient]:
+        *,
+        cache: Optional[bool] = None,
+        assistant: Optional[str] = None,
+        task_id: Optional[str] = None,
+        priority: LLMPriority = "normal",
+    ) -> ChatCompletionClient:
         """
-        创建并返回一个配置好的LLM客户端实例。
+        返回一个配置好的LLM客户端实例（默认取自客户端池，调用方不应自行 close）。
 
         Args:
             ability (AbilityType): Agent的能力类型，用于从.env选择默认模型。
             provider_override (Optional[ProviderType]): (可选) 强制指定Provider，覆盖.env配置。
             model_name_override (Optional[str]): (可选) 强制指定模型名称，覆盖.env配置。
+            cache (Optional[bool]): (可选) 是否启用响应缓存；None 时按 LLM_CACHE_ABILITIES 决定。
+            assistant (Optional[str]): (可选) 调用方智能体名，用于调用计量。
+            task_id (Optional[str]): (可选) 所属任务，用于调用计量。
+            priority (LLMPriority): 调用治理中的排队优先级（critical / normal / bulk）。
 
         Returns:
             LLM客户端实例。
@@ -72,6 +102,241 @@ class LLMFactory:
         # 步骤 2: 根据全局LLM_TYPE，决定实例化哪种客户端
         service_mode = PMCASystemEnvConfig.LLM_TYPE.lower()
 
+        # 步骤 3: 取得（池化的）真实客户端，再按需叠加包裹层
+        client = LLMFactory._pooled_client(
+            ability, final_provider, final_model_name, service_mode
+        )
+        return LLMFactory._decorate(
+            client,
+            ability,
+            final_provider,
+            final_model_name,
+            service_mode,
+            cache=cache,
+            assistant=assistant,
+            task_id=task_id,
+            priority=priority,
+        )
+
+    @staticmethod
+    def _pooled_client(
+        ability: AbilityType,
+        final_provider: ProviderType,
+        final_model_name: str,
+        service_mode: str,
+    ) -> ChatCompletionClient:
+        # 回放：完全不创建真实客户端（录制在 _decorate 中叠加于缓存之上）
+        if PMCASystemEnvConfig.LLM_RECORD_MODE == "replay":
+            return LLMFactory._replay_client(final_provider, final_model_name)
+        return LLMFactory._shared_client(
+            ability, final_provider, final_model_name, service_mode
+        )
+
+    @staticmethod
+    def _shared_client(
+        ability: AbilityType,
+        final_provider: ProviderType,
+        final_model_name: str,
+        service_mode: str,
+    ) -> ChatCompletionClient:
+        # 同一 (服务模式, provider, model, base_url) 复用同一个客户端及其连接池
+        if not PMCASystemEnvConfig.LLM_CLIENT_POOL:
+            return LLMFactory._create_client(
+                ability, final_provider, final_model_name, service_mode
+            )
+
+        key = LLMFactory._pool_key(final_provider, final_model_name, service_mode)
+        with LLMFactory._pool_lock:
+            pooled = LLMFactory._pool.get(key)
+            if pooled is not None:
+                LLMFactory._pool_hits += 1
+                return pooled
+            LLMFactory._pool_misses += 1
+            client = LLMFactory._create_client(
+                ability, final_provider, final_model_name, service_mode
+            )
+            LLMFactory._pool[key] = client
+            logger.debug(f"[LLMFactory] pooled new client for {key}")
+            return client
+
+    @staticmethod
+    def _decorate(
+        client: ChatCompletionClient,
+        ability: AbilityType,
+        provider: ProviderType,
+        model_name: str,
+        service_mode: str,
+        *,
+        cache: Optional[bool] = None,
+        assistant: Optional[str] = None,
+        task_id: Optional[str] = None,
+        priority: LLMPriority = "normal",
+    ) -> ChatCompletionClient:
+        """按配置为真实客户端叠加包裹层（每次调用新建，包裹层本身很轻）。"""
+        # 治理放在最内层：缓存命中不占用限流配额
+        client = LLMFactory._governed(client, provider, priority)
+
+        # 对冲：主模型首 token 超过分位截止时间时，同时请求能力兼容的备用模型
+        if PMCASystemEnvConfig.LLM_HEDGE:
+            target = LLMFactory.hedge_target(provider, model_name, service_mode)
+            if target is not None:
+                secondary_provider, secondary_model = target
+                secondary = LLMFactory._governed(
+                    LLMFactory._pooled_client(
+                        ability, secondary_provider, secondary_model, service_mode
+                    ),
+                    secondary_provider,
+                    priority,
+                )
+                client = PMCAHedgedChatClient(
+                    client,
+                    secondary,
+                    LLMFactory.hedger(),
+                    f"{provider.value}:{model_name}",
+                )
+        if cache is None:
+            cache = ability.value in PMCASystemEnvConfig.LLM_CACHE_ABILITIES
+        # 回放本身已是确定且无开销的，不再叠加缓存：缓存层会补 temperature=0，改变回放键
+        record_mode = PMCASystemEnvConfig.LLM_RECORD_MODE
+        if cache and LLMFactory._response_cache is not None and record_mode != "replay":
+            _, _, _, base_url = LLMFactory._pool_key(provider, model_name, service_mode)
+            client = PMCACachedChatClient(
+                client, LLMFactory._response_cache, f"{provider.value}@{base_url}"
+            )
+        # 录制放在缓存之上：缓存命中的响应也会录制，录制键与回放时（无缓存层）一致
+        if record_mode == "record":
+            client = PMCARecordingChatClient(client, LLMFactory.record_store())
+        # 计量放在最外层：缓存命中也会以 cached=True 记录
+        if PMCASystemEnvConfig.LLM_METRICS:
+            client = PMCAInstrumentedChatClient(
+                client, task_id=task_id, assistant=assistant
+            )
+        return client
+
+    @staticmethod
+    def _governed(
+        client: ChatCompletionClient, provider: ProviderType, priority: LLMPriority
+    ) -> ChatCompletionClient:
+        governor = LLMFactory.governor()
+        if governor is not None and governor.governs(provider.value):
+            return PMCAGovernedChatClient(client, governor, provider.value, priority)
+        return client
+
+    @staticmethod
+    def record_store() -> PMCALLMRecordStore:
+        """进程级录制文件（LLM_RECORD_PATH）；录制与回放共用。"""
+        if LLMFactory._record_store is None:
+            LLMFactory._record_store = PMCALLMRecordStore(
+                PMCASystemEnvConfig.LLM_RECORD_PATH,
+                strict=PMCASystemEnvConfig.LLM_REPLAY_STRICT,
+            )
+        return LLMFactory._record_store
+
+    @staticmethod
+    def _replay_client(provider: ProviderType, model_name: str) -> ChatCompletionClient:
+        info = MODEL_INFO.get((provider.value, model_name))
+        return PMCAReplayChatClient(
+            LLMFactory.record_store(),
+            model_name,
+            info if info and "family" in info else None,
+            latency=PMCASystemEnvConfig.LLM_REPLAY_LATENCY,
+            scale=PMCASystemEnvConfig.LLM_REPLAY_LATENCY_SCALE,
+        )
+
+    @staticmethod
+    def hedger() -> PMCALLMHedger:
+        """进程级对冲策略与统计（按 LLM_HEDGE_* 惰性创建）。"""
+        if LLMFactory._hedger is None:
+            LLMFactory._hedger = PMCALLMHedger.from_config(PMCASystemEnvConfig)
+        return LLMFactory._hedger
+
+    @staticmethod
+    def hedge_target(
+        provider: ProviderType, model_name: str, service_mode: str
+    ) -> Optional[Tuple[ProviderType, str]]:
+        """
+        选择对冲目标：优先使用 LLM_HEDGE_TARGETS 中的显式配置（"provider:model" -> "provider:model"），
+        否则取 MODEL_INFO 中第一个能力兼容、且在当前服务模式下可用（ollama / 已配置 API Key）的模型。
+        """
+        explicit = PMCASystemEnvConfig.LLM_HEDGE_TARGETS.get(
+            f"{provider.value}:{model_name}"
+        )
+        if explicit:
+            target_provider, _, target_model = explicit.partition(":")
+            return ProviderType(target_provider), target_model
+
+        for target_provider, target_model in compatible_models(provider, model_name):
+            if service_mode == "ollama":
+                usable = target_provider == ProviderType.OLLAMA.value
+            else:
+                usable = target_provider != ProviderType.OLLAMA.value and bool(
+                    getattr(
+                        PMCASystemEnvConfig, f"{target_provider.upper()}_API_KEY", None
+                    )
+                )
+            if usable:
+                return ProviderType(target_provider), target_model
+        return None
+
+    @staticmethod
+    def governor() -> Optional[PMCALLMGovernor]:
+        """进程级调用治理器（按 LLM_PROVIDER_LIMITS 惰性创建）；LLM_GOVERNOR=false 时为 None。"""
+        if not PMCASystemEnvConfig.LLM_GOVERNOR:
+            return None
+        if LLMFactory._governor is None:
+            LLMFactory._governor = PMCALLMGovernor.from_config(PMCASystemEnvConfig)
+        return LLMFactory._governor
+
+    @staticmethod
+    def set_response_cache(store: Optional[PMCALLMCacheStore]) -> None:
+        """设置进程级 LLM 响应缓存存储（由 PMCARuntime 初始化时注入）。"""
+        LLMFactory._response_cache = store
+
+    @staticmethod
+    def response_cache_stats() -> Dict[str, Any]:
+        store = LLMFactory._response_cache
+        return store.stats.to_dict() if store is not None else {}
+
+    @staticmethod
+    def _pool_key(
+        provider: ProviderType, model_name: str, service_mode: str
+    ) -> Tuple[str, str, str, Optional[str]]:
+        if service_mode == "ollama":
+            base_url = PMCASystemEnvConfig.OLLAMA_HOST
+        else:
+            base_url = getattr(
+                PMCASystemEnvConfig, f"{provider.name.upper()}_BASE_URL", None
+            )
+        return service_mode, provider.value, model_name, base_url
+
+    @staticmethod
+    def pool_stats() -> Dict[str, int]:
+        """客户端池统计：命中/未命中次数与当前客户端数。"""
+        return {
+            "hits": LLMFactory._pool_hits,
+            "misses": LLMFactory._pool_misses,
+            "size": len(LLMFactory._pool),
+        }
+
+    @staticmethod
+    async def close_all() -> None:
+        """关闭并清空池中的全部客户端（释放 HTTP 连接）。"""
+        with LLMFactory._pool_lock:
+            clients = list(LLMFactory._pool.values())
+            LLMFactory._pool.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"[LLMFactory] close client failed: {e}")
+
+    @staticmethod
+    def _create_client(
+        ability: AbilityType,
+        final_provider: ProviderType,
+        final_model_name: str,
+        service_mode: str,
+    ) -> Union[OpenAIChatCompletionClient, OllamaChatCompletionClient]:
         # --- 使用Ollama本地服务 ---
         if service_mode == "ollama":
             if final_provider != ProviderType.OLLAMA:
@@ -1,4 +1,4 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 from autogen_core.models import ModelFamily, ModelInfo
 from typing import TYPE_CHECKING
 
@@ -95,6 +95,27 @@ _MODEL_METADATA: Dict[Tuple[str, str], Dict[str, bool]] = {
     ("deepseek", "deepseek-reasoner"): {"is_reasoning": True},
 }
 
+# 上下文窗口（token），用于推导每次调用的上下文预算；未登记的模型使用 DEFAULT_CONTEXT_WINDOW
+DEFAULT_CONTEXT_WINDOW = 32768
+CONTEXT_WINDOW: Dict[Tuple[str, str], int] = {
+    ("ollama", "qwen3:32b-fp16"): 32768,
+    ("openai", "gpt-5"): 400000,
+    ("gemini", "gemini-2.5-pro"): 1048576,
+    ("deepseek", "deepseek-chat"): 65536,
+    ("deepseek", "deepseek-reasoner"): 65536,
+}
+
+
+def context_budget(
+    provider: "ProviderType", model_name: str, ratio: float = 0.5
+) -> int:
+    """
+    单次调用允许发送的历史消息 token 预算：上下文窗口 * ratio，
+    剩余部分留给系统提示词、工具定义与模型输出。
+    """
+    window = CONTEXT_WINDOW.get((provider.value, model_name), DEFAULT_CONTEXT_WINDOW)
+    return int(window * ratio)
+
 
 def is_reasoning_model(provider: "ProviderType", model_name: str) -> bool:
     """
@@ -111,3 +132,25 @@ def supports_structured_output(provider: "ProviderType", model_name: str) -> boo
     """
     info = MODEL_INFO.get((provider.value, model_name))
     return bool(info and getattr(info, "structured_output", False))
+
+
+_CAPABILITY_FLAGS = ("vision", "function_calling", "json_output", "structured_output")
+
+
+def compatible_models(
+    provider: "ProviderType", model_name: str
+) -> List[Tuple[str, str]]:
+    """
+    返回能力不弱于指定模型的其他已登记模型 (provider, model)，按 MODEL_INFO 中的登记顺序。
+    用于在主模型响应过慢时选择对冲（hedge）目标。
+    """
+    info = MODEL_INFO.get((provider.value, model_name))
+    if not info:
+        return []
+    required = [flag for flag in _CAPABILITY_FLAGS if info.get(flag)]
+    return [
+        key
+        for key, candidate in MODEL_INFO.items()
+        if key != (provider.value, model_name)
+        and all(candidate.get(flag) for flag in required)
+    ]
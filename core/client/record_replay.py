@@ -0,0 +1,359 @@
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncGenerator,
+    Deque,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import (
+    ChatCompletionClient,
+    CreateResult,
+    LLMMessage,
+    ModelCapabilities,  # type: ignore[attr-defined]
+    ModelFamily,
+    ModelInfo,
+    RequestUsage,
+)
+from autogen_core.tools import Tool, ToolSchema
+from loguru import logger
+from pydantic import BaseModel
+
+from .client_wrapper import PMCAChatClientWrapper
+from .response_cache import llm_request_key
+
+# none：不等待；recorded：按录制时的耗时等待；lognormal：以录制耗时为中位数的对数正态抖动
+ReplayLatency = Literal["none", "recorded", "lognormal"]
+
+
+class PMCAReplayMissError(LookupError):
+    """回放模式下找不到对应的录制记录。"""
+
+
+@dataclass
+class PMCALLMRecordStats:
+    recorded: int = 0
+    replayed: int = 0
+    # 精确键未命中、按同模型录制顺序回放的次数
+    sequential: int = 0
+    misses: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "sequential": self.sequential,
+            "misses": self.misses,
+        }
+
+
+class PMCALLMRecordStore:
+    """
+    录制文件（JSONL，每行一次调用）：
+    {"key", "model", "streaming", "chunks", "result", "latency", "ttft"}
+    - key 与响应缓存相同（llm_request_key），同一键的多次录制按顺序循环回放
+    - strict=False 时，键未命中则按同一模型的录制顺序依次回放（适用于提示词中含 task_id 等易变内容）
+    """
+
+    def __init__(self, path: Union[str, Path], strict: bool = True) -> None:
+        self.path = Path(path)
+        self.strict = strict
+        self.stats = PMCALLMRecordStats()
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_model: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._by_key[entry["key"]].append(entry)
+                self._by_model[entry["model"]].append(entry)
+        logger.info(
+            f"[LLMReplay] loaded {sum(map(len, self._by_key.values()))} records from {self.path}"
+        )
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self.stats.recorded += 1
+
+    def lookup(self, key: str, model: str) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            entries = self._by_key.get(key)
+            if entries:
+                entry = entries[self._cursor[key] % len(entries)]
+                self._cursor[key] += 1
+                self.stats.replayed += 1
+                return entry
+            pending = self._by_model.get(model)
+            if not self.strict and pending:
+                entry = pending[0]
+                pending.rotate(-1)
+                self.stats.sequential += 1
+                return entry
+            self.stats.misses += 1
+        raise PMCAReplayMissError(f"no recorded response for model={model} key={key}")
+
+
+def _request_key(model: str, messages, tools, tool_choice, json_output, extra) -> str:
+    return llm_request_key(
+        model,
+        messages,
+        tools=tools,
+        tool_choice=tool_choice,
+        json_output=json_output,
+        extra_create_args=extra,
+    )
+
+
+class PMCARecordingChatClient(PMCAChatClientWrapper):
+    """录制模式：透传到真实客户端，并把每次成功调用的请求键、响应与耗时追加到录制文件。"""
+
+    def __init__(self, inner: ChatCompletionClient, store: PMCALLMRecordStore) -> None:
+        super().__init__(inner)
+        self._store = store
+
+    def _save(
+        self,
+        key: Optional[str],
+        result: CreateResult,
+        latency: float,
+        *,
+        chunks: Optional[List[str]] = None,
+        ttft: Optional[float] = None,
+    ) -> None:
+        if key is None:
+            return
+        self._store.append(
+            {
+                "key": key,
+                "model": self.model_name,
+                "streaming": chunks is not None,
+                "chunks": chunks or [],
+                "result": result.model_dump(mode="json"),
+                "latency": latency,
+                "ttft": ttft,
+            }
+        )
+
+    def _key(self, messages, tools, tool_choice, json_output, extra) -> Optional[str]:
+        try:
+            return _request_key(
+                self.model_name, messages, tools, tool_choice, json_output, extra
+            )
+        except (TypeError, ValueError):
+            logger.warning("[LLMRecord] request not serializable, skip recording")
+            return None
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+        started = time.perf_counter()
+        result = await super().create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self._save(key, result, time.perf_counter() - started)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+        started = time.perf_counter()
+        ttft: Optional[float] = None
+        chunks: List[str] = []
+        async for chunk in super().create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            if isinstance(chunk, CreateResult):
+                self._save(
+                    key,
+                    chunk,
+                    time.perf_counter() - started,
+                    chunks=chunks,
+                    ttft=ttft,
+                )
+            else:
+                chunks.append(chunk)
+            yield chunk
+
+
+class PMCAReplayChatClient(ChatCompletionClient):
+    """
+    回放模式：不访问任何模型服务，按请求键从录制文件返回响应；
+    可按 latency 模拟时延（scale 为整体倍率，sigma 为 lognormal 的离散程度）。
+    """
+
+    def __init__(
+        self,
+        store: PMCALLMRecordStore,
+        model: str,
+        model_info: Optional[ModelInfo] = None,
+        *,
+        latency: ReplayLatency = "none",
+        scale: float = 1.0,
+        sigma: float = 0.25,
+    ) -> None:
+        self._store = store
+        self._create_args = {"model": model}
+        self._model_info = model_info or ModelInfo(
+            vision=False,
+            function_calling=True,
+            json_output=True,
+            family=ModelFamily.UNKNOWN,
+            structured_output=True,
+        )
+        self._latency = latency
+        self._scale = scale
+        self._sigma = sigma
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def _delay(self, recorded: Optional[float]) -> float:
+        if self._latency == "none" or not recorded:
+            return 0.0
+        if self._latency == "lognormal":
+            recorded = random.lognormvariate(math.log(recorded), self._sigma)
+        return recorded * self._scale
+
+    def _replay(self, messages, tools, tool_choice, json_output, extra):
+        model = self._create_args["model"]
+        try:
+            key = _request_key(model, messages, tools, tool_choice, json_output, extra)
+        except (TypeError, ValueError):
+            key = ""
+        entry = self._store.lookup(key, model)
+        result = CreateResult.model_validate(entry["result"])
+        self._actual_usage = result.usage
+        self._total_usage = RequestUsage(
+            prompt_tokens=self._total_usage.prompt_tokens + result.usage.prompt_tokens,
+            completion_tokens=self._total_usage.completion_tokens
+            + result.usage.completion_tokens,
+        )
+        return entry, result
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        entry, result = self._replay(
+            messages, tools, tool_choice, json_output, extra_create_args
+        )
+        await asyncio.sleep(self._delay(entry.get("latency")))
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        entry, result = self._replay(
+            messages, tools, tool_choice, json_output, extra_create_args
+        )
+        chunks: List[str] = entry.get("chunks") or []
+        if not chunks and isinstance(result.content, str):
+            chunks = [result.content]
+        latency = entry.get("latency") or 0.0
+        ttft = entry.get("ttft") or latency
+        # 首 token 前等待 ttft，其余耗时均摊到后续分片
+        await asyncio.sleep(self._delay(ttft))
+        gap = self._delay(max(latency - ttft, 0.0)) / max(len(chunks), 1)
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(gap)
+        yield result
+
+    async def close(self) -> None:
+        return None
+
+    def actual_usage(self) -> RequestUsage:
+        return self._actual_usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._total_usage
+
+    def count_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        # 回放时没有分词器，按字符数粗估
+        return sum(len(str(m.content)) for m in messages) // 3
+
+    def remaining_tokens(
+        self, messages: Sequence[LLMMessage], *, tools: Sequence[Tool | ToolSchema] = []
+    ) -> int:
+        return max(0, 128000 - self.count_tokens(messages, tools=tools))
+
+    @property
+    def capabilities(self) -> ModelCapabilities:  # type: ignore[override]
+        return self._model_info  # type: ignore[return-value]
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self._model_info
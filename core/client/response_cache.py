@@ -0,0 +1,374 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+from autogen_core.tools import Tool, ToolSchema
+from loguru import logger
+from pydantic import BaseModel
+
+from .client_wrapper import PMCAChatClientWrapper
+
+
+@dataclass
+class PMCALLMCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    # 命中时节省的原始调用耗时（秒），按写入缓存时记录的耗时累计
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hit_rate, 4),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+class PMCALLMCacheStore(ABC):
+    """LLM 响应缓存存储：值为 JSON 文本，按 TTL 过期、按最近访问淘汰（LRU）。"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = PMCALLMCacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str) -> None: ...
+
+    async def close(self) -> None:
+        return None
+
+
+class PMCARedisLLMCacheStore(PMCALLMCacheStore):
+    """
+    Redis 存储：
+    - pmca:llmcache:{key} -> 值（SET EX ttl）
+    - pmca:llmcache:lru   -> ZSet（最近访问时间），超过 max_entries 时淘汰最久未访问的条目
+    """
+
+    PREFIX = "pmca:llmcache:"
+
+    def __init__(self, redis: Any, ttl_seconds: int, max_entries: int) -> None:
+        super().__init__(ttl_seconds, max_entries)
+        self.redis = redis
+        self._lru_key = f"{self.PREFIX}lru"
+
+    async def get(self, key: str) -> Optional[str]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(f"{self.PREFIX}{key}")
+            pipe.zadd(self._lru_key, {key: time.time()}, xx=True)
+            value, _ = await pipe.execute()
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"{self.PREFIX}{key}", value, ex=self.ttl_seconds or None)
+            pipe.zadd(self._lru_key, {key: time.time()})
+            pipe.zcard(self._lru_key)
+            *_, size = await pipe.execute()
+        if self.max_entries and size > self.max_entries:
+            stale = await self.redis.zpopmin(self._lru_key, size - self.max_entries)
+            if stale:
+                await self.redis.delete(
+                    *[
+                        f"{self.PREFIX}{k.decode() if isinstance(k, bytes) else k}"
+                        for k, _ in stale
+                    ]
+                )
+
+
+class PMCASqliteLLMCacheStore(PMCALLMCacheStore):
+    """本地磁盘存储（SQLite 单文件），适合单机部署与离线调试。"""
+
+    def __init__(
+        self, path: Union[str, Path], ttl_seconds: int, max_entries: int
+    ) -> None:
+        super().__init__(ttl_seconds, max_entries)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+            )
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds and row[1] + self.ttl_seconds <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return row[0]
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    " SELECT key FROM llm_cache ORDER BY accessed_at DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+
+def _tool_schema(tool: Union[Tool, ToolSchema]) -> Any:
+    return tool.schema if isinstance(tool, Tool) else tool
+
+
+def llm_request_key(
+    model: str,
+    messages: Sequence[LLMMessage],
+    *,
+    tools: Sequence[Union[Tool, ToolSchema]] = (),
+    tool_choice: Any = "auto",
+    json_output: Optional[Union[bool, type[BaseModel]]] = None,
+    extra_create_args: Mapping[str, Any] = {},
+    endpoint: Optional[str] = None,
+) -> str:
+    """
+    对一次模型请求（模型、消息、工具与采样参数）计算稳定的哈希键；无法序列化时抛出 TypeError。
+    endpoint 区分提供同名模型的不同服务（provider / base_url），为空时不计入。
+    """
+    if isinstance(json_output, type) and issubclass(json_output, BaseModel):
+        json_output_repr: Any = json_output.model_json_schema()
+    else:
+        json_output_repr = json_output
+    payload = {
+        "model": model,
+        "messages": [m.model_dump(mode="json") for m in messages],
+        "tools": [_tool_schema(t) for t in tools],
+        "tool_choice": (
+            _tool_schema(tool_choice) if isinstance(tool_choice, Tool) else tool_choice
+        ),
+        "json_output": json_output_repr,
+        "extra_create_args": dict(extra_create_args),
+    }
+    if endpoint is not None:
+        payload["endpoint"] = endpoint
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PMCACachedChatClient(PMCAChatClientWrapper):
+    """
+    确定性调用的响应缓存：
+    - 以 (服务端点, 模型, 消息, 工具, tool_choice, json_output, extra_create_args) 为键；
+      端点（provider + base_url）区分不同服务上的同名模型
+    - 命中时直接返回缓存的 CreateResult（cached=True），并累计节省的耗时
+    - 未指定 temperature 的调用补上 temperature=0（池化客户端不带 temperature，
+      否则会按服务端默认值采样，缓存下来的只是一次采样结果）
+    - 显式指定了非零 temperature 的调用不走缓存
+    """
+
+    def __init__(
+        self,
+        inner: ChatCompletionClient,
+        store: PMCALLMCacheStore,
+        endpoint: Optional[str] = None,
+    ) -> None:
+        super().__init__(inner)
+        self._store = store
+        self._endpoint = endpoint
+
+    @property
+    def stats(self) -> PMCALLMCacheStats:
+        return self._store.stats
+
+    @staticmethod
+    def _deterministic(extra_create_args: Mapping[str, Any]) -> Dict[str, Any]:
+        args = dict(extra_create_args)
+        options = args.get("options")
+        if "temperature" not in args and not (
+            isinstance(options, Mapping) and "temperature" in options
+        ):
+            args["temperature"] = 0
+        return args
+
+    @staticmethod
+    def _temperature(extra_create_args: Mapping[str, Any]) -> float:
+        options = extra_create_args.get("options")
+        if isinstance(options, Mapping) and "temperature" in options:
+            return float(options["temperature"] or 0)
+        return float(extra_create_args.get("temperature") or 0)
+
+    def _key(self, messages, tools, tool_choice, json_output, extra_create_args):
+        if self._temperature(extra_create_args) != 0:
+            return None
+        try:
+            return llm_request_key(
+                self.model_name,
+                messages,
+                tools=tools,
+                tool_choice=tool_choice,
+                json_output=json_output,
+                extra_create_args=extra_create_args,
+                endpoint=self._endpoint,
+            )
+        except (TypeError, ValueError):
+            # 含图片等不可序列化内容：直接透传
+            return None
+
+    async def _lookup(self, key: Optional[str]) -> Optional[CreateResult]:
+        if key is None:
+            self._store.stats.bypassed += 1
+            return None
+        try:
+            raw = await self._store.get(key)
+        except Exception as e:
+            logger.warning(f"[LLMCache] lookup failed: {e}")
+            return None
+        if raw is None:
+            self._store.stats.misses += 1
+            return None
+        entry = json.loads(raw)
+        self._store.stats.hits += 1
+        self._store.stats.saved_seconds += entry.get("latency", 0.0)
+        result = CreateResult.model_validate(entry["result"])
+        result.cached = True
+        return result
+
+    async def _save(self, key: Optional[str], result: CreateResult, latency: float):
+        if key is None:
+            return
+        entry = {"result": result.model_dump(mode="json"), "latency": latency}
+        try:
+            await self._store.set(key, json.dumps(entry, ensure_ascii=False))
+        except Exception as e:
+            logger.warning(f"[LLMCache] store failed: {e}")
+
+    async def create(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> CreateResult:
+        extra_create_args = self._deterministic(extra_create_args)
+        key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+        cached = await self._lookup(key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        result = await super().create(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        await self._save(key, result, time.perf_counter() - started)
+        return result
+
+    async def create_stream(
+        self,
+        messages: Sequence[LLMMessage],
+        *,
+        tools: Sequence[Tool | ToolSchema] = [],
+        tool_choice: Tool | Literal["auto", "required", "none"] = "auto",
+        json_output: Optional[bool | type[BaseModel]] = None,
+        extra_create_args: Mapping[str, Any] = {},
+        cancellation_token: Optional[CancellationToken] = None,
+    ) -> AsyncGenerator[Union[str, CreateResult], None]:
+        extra_create_args = self._deterministic(extra_create_args)
+        key = self._key(messages, tools, tool_choice, json_output, extra_create_args)
+        cached = await self._lookup(key)
+        if cached is not None:
+            if isinstance(cached.content, str):
+                yield cached.content
+            yield cached
+            return
+
+        started = time.perf_counter()
+        async for chunk in super().create_stream(
+            messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(chunk, CreateResult):
+                await self._save(key, chunk, time.perf_counter() - started)
+            yield chunk
+
+
+def create_llm_cache_store(env: Any, redis: Any = None) -> Optional[PMCALLMCacheStore]:
+    """按 LLM_CACHE_BACKEND 创建缓存存储；'none' 或 redis 不可用时返回 None。"""
+    backend = env.LLM_CACHE_BACKEND
+    if backend == "redis" and redis is not None:
+        return PMCARedisLLMCacheStore(
+            redis, env.LLM_CACHE_TTL_SECONDS, env.LLM_CACHE_MAX_ENTRIES
+        )
+    if backend == "disk":
+        return PMCASqliteLLMCacheStore(
+            env.LLM_CACHE_PATH, env.LLM_CACHE_TTL_SECONDS, env.LLM_CACHE_MAX_ENTRIES
+        )
+    return None
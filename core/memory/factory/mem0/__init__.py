@@ -1,3 +1,11 @@
-from .service import PMCAMem0LocalService
+from .registry import PMCAMem0Registry
+from .search_cache import PMCAMem0SearchCache, PMCASearchCachedClient
+from .service import PMCAMem0LocalService, PMCASharedMem0Memory
 
-__all__ = ["PMCAMem0LocalService"]
+__all__ = [
+    "PMCAMem0LocalService",
+    "PMCAMem0Registry",
+    "PMCAMem0SearchCache",
+    "PMCASearchCachedClient",
+    "PMCASharedMem0Memory",
+]
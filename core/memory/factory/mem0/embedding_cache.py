@@ -0,0 +1,278 @@
+import hashlib
+from array import array
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from loguru import logger
+
+# 已知不区分 memory_action（add / search / update）的嵌入器：不同动作共用同一条缓存
+_ACTION_AGNOSTIC_PROVIDERS = {"ollama", "openai", "azure_openai", "lmstudio"}
+
+
+@dataclass
+class PMCAEmbeddingCacheStats:
+    hits: int = 0
+    # 命中发生在持久层（磁盘 / Redis）而非进程内 LRU 的次数（已计入 hits）
+    tier_hits: int = 0
+    misses: int = 0
+    # 命中时省下的嵌入器调用耗时（秒），按首次计算时记录的耗时累计
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "tier_hits": self.tier_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+class _SqliteEmbeddingTier:
+    """磁盘层（SQLite 单文件），跨进程重启复用。"""
+
+    def __init__(self, path: Union[str, Path], ttl_seconds: int) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM embedding_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.ttl_seconds and row[1] + self.ttl_seconds <= time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embedding_cache (key, value, created_at)"
+                " VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _RedisEmbeddingTier:
+    """Redis 层（同步客户端：嵌入在 mem0 的工作线程中同步调用），多进程共享。"""
+
+    PREFIX = "pmca:embcache:"
+
+    def __init__(self, client: Any, ttl_seconds: int) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(f"{self.PREFIX}{key}")
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str) -> None:
+        self.client.set(f"{self.PREFIX}{key}", value, ex=self.ttl_seconds or None)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class PMCAEmbeddingCache:
+    """
+    嵌入向量缓存：键为 (嵌入模型, 归一化文本的 sha256)。
+    - 一级：进程内 LRU（max_entries 条）；向量以 array('f')（float32）存放，1024 维约 4 KiB/条，
+      list[float] 则约 32 KiB/条；取出时转回 list
+    - 二级（可选）：磁盘或 Redis；命中后回填一级
+    持久层出错时只记录日志，不影响嵌入结果。
+    """
+
+    def __init__(self, max_entries: int = 5000, tier: Any = None) -> None:
+        self.max_entries = max_entries
+        self.stats = PMCAEmbeddingCacheStats()
+        self._tier = tier
+        self._lru: "OrderedDict[str, Tuple[array, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+    @classmethod
+    def key(cls, model: str, text: str) -> str:
+        digest = hashlib.sha256(cls.normalize(text).encode("utf-8")).hexdigest()
+        return f"{model}:{digest}"
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+        from_tier = False
+        if entry is None and self._tier is not None:
+            try:
+                raw = self._tier.get(key)
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] tier lookup failed: {e}")
+                raw = None
+            if raw is not None:
+                data = json.loads(raw)
+                entry = (array("f", data["vector"]), data.get("latency", 0.0))
+                from_tier = True
+                self._remember(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self.stats.tier_hits += from_tier
+            self.stats.saved_seconds += entry[1]
+        return entry[0].tolist()
+
+    def set(self, key: str, vector: Sequence[float], latency: float) -> None:
+        entry = (array("f", vector), latency)
+        self._remember(key, entry)
+        if self._tier is not None:
+            try:
+                self._tier.set(
+                    key, json.dumps({"vector": list(vector), "latency": latency})
+                )
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] tier store failed: {e}")
+
+    def _remember(self, key: str, entry: Tuple[array, float]) -> None:
+        with self._lock:
+            self._lru[key] = entry
+            self._lru.move_to_end(key)
+            while self.max_entries and len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def close(self) -> None:
+        if self._tier is not None:
+            self._tier.close()
+            self._tier = None
+
+
+class PMCACachedEmbedder:
+    """
+    mem0 嵌入器的缓存包装：embed 先查缓存，未命中时调用原嵌入器并写回。
+    其余属性（config / client 等）透传给原嵌入器。
+    """
+
+    def __init__(self, inner: Any, cache: PMCAEmbeddingCache, provider: str) -> None:
+        self.inner = inner
+        self.cache = cache
+        model = getattr(getattr(inner, "config", None), "model", None) or "default"
+        self.model_key = f"{provider}/{model}"
+        self._action_agnostic = provider in _ACTION_AGNOSTIC_PROVIDERS
+
+    def __getattr__(self, name: str) -> Any:
+        # 仅在常规属性查找失败时调用；inner 未就绪（如 copy / pickle 过程中）时不递归
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def _key(self, text: str, memory_action: Optional[str]) -> str:
+        model = self.model_key
+        if memory_action and not self._action_agnostic:
+            model = f"{model}#{memory_action}"
+        return self.cache.key(model, text)
+
+    def embed(self, text: str, memory_action: Optional[str] = None) -> List[float]:
+        key = self._key(text, memory_action)
+        vector = self.cache.get(key)
+        if vector is not None:
+            return vector
+        started = time.perf_counter()
+        vector = self.inner.embed(text, memory_action)
+        self.cache.set(key, vector, time.perf_counter() - started)
+        return vector
+
+    def embed_many(
+        self,
+        texts: Sequence[str],
+        memory_action: Optional[str],
+        embed_misses: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """批量嵌入：只把未命中的文本交给 embed_misses（一次批量请求）。"""
+        keys = [self._key(text, memory_action) for text in texts]
+        vectors: List[Optional[List[float]]] = [self.cache.get(k) for k in keys]
+        misses = [i for i, v in enumerate(vectors) if v is None]
+        if misses:
+            started = time.perf_counter()
+            fresh = embed_misses([texts[i] for i in misses])
+            latency = (time.perf_counter() - started) / len(misses)
+            for i, vector in zip(misses, fresh):
+                vectors[i] = vector
+                self.cache.set(keys[i], vector, latency)
+        return vectors  # type: ignore[return-value]
+
+
+_cache: Optional[PMCAEmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def embedding_cache() -> PMCAEmbeddingCache:
+    """进程级嵌入缓存（按 MEM0_EMBED_CACHE_* 配置惰性创建）。"""
+    global _cache
+    if _cache is not None:
+        return _cache
+    with _cache_lock:
+        if _cache is None:
+            from base.configs import PMCASystemEnvConfig as env
+
+            tier: Any = None
+            if env.MEM0_EMBED_CACHE_BACKEND == "disk":
+                tier = _SqliteEmbeddingTier(
+                    env.MEM0_EMBED_CACHE_PATH, env.MEM0_EMBED_CACHE_TTL_SECONDS
+                )
+            elif env.MEM0_EMBED_CACHE_BACKEND == "redis":
+                import redis
+
+                tier = _RedisEmbeddingTier(
+                    redis.Redis(
+                        host=env.REDIS_HOST,
+                        port=env.REDIS_PORT,
+                        db=env.REDIS_DB,
+                        password=env.REDIS_PASSWORD,
+                    ),
+                    env.MEM0_EMBED_CACHE_TTL_SECONDS,
+                )
+            _cache = PMCAEmbeddingCache(env.MEM0_EMBED_CACHE_MAX_ENTRIES, tier)
+    return _cache
+
+
+def close_embedding_cache() -> None:
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            logger.info(f"Mem0 embedding cache stats: {_cache.stats.to_dict()}")
+            _cache.close()
+            _cache = None
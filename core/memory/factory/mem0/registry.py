@@ -0,0 +1,153 @@
+import copy
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+from mem0 import Memory
+from mem0.utils.factory import VectorStoreFactory
+
+from base.configs import PMCASystemEnvConfig, mem0config
+
+from .embedding_cache import PMCACachedEmbedder, close_embedding_cache, embedding_cache
+from .search_cache import PMCAMem0SearchCache
+
+
+class PMCAMem0Registry:
+    """
+    进程级 mem0 Memory 句柄注册表（每个集合一个实例，线程安全、惰性创建）：
+    - PMCAMem0LocalService（智能体的 Mem0Memory）与 PMCAMem0ToolsProvider（记忆工具）共用同一实例
+    - MEM0_SHARE_CLIENTS 开启时，第一个集合之后的实例复用首个实例的嵌入模型、LLM、图存储、
+      历史库与 Qdrant 客户端，只新建各自的向量存储句柄
+    - MEM0_EMBED_CACHE 开启时，实例的嵌入模型包装为 PMCACachedEmbedder（所有集合共用一份嵌入缓存）
+    - close_all 在进程退出时统一释放连接
+    """
+
+    _memories: Dict[str, Memory] = {}
+    _lock = threading.Lock()
+    # 按集合加锁：不同集合可以并行创建（启动预热时在线程池中并发执行）
+    _creating: Dict[str, threading.Lock] = {}
+    # 共享客户端的首个实例；其创建过程单独加锁，避免并发时重复建立全套连接
+    _base: Optional[Memory] = None
+    _base_lock = threading.Lock()
+    # 已注册智能体的集合：即使实例尚未创建（惰性初始化），也视为已供给，首次访问时由 from_config 建好集合
+    _known: Set[str] = set()
+
+    @staticmethod
+    def config_for(collection: str) -> Dict[str, Any]:
+        cfg = copy.deepcopy(mem0config.PMCAMem0LocalConfig)
+        cfg.setdefault("vector_store", {}).setdefault("config", {}).update(
+            collection_name=collection
+        )
+        return cfg
+
+    @classmethod
+    def has(cls, collection: str) -> bool:
+        return collection in cls._memories
+
+    @classmethod
+    def register(cls, collections: Iterable[str]) -> None:
+        cls._known.update(collections)
+
+    @classmethod
+    def is_known(cls, collection: str) -> bool:
+        return collection in cls._known or collection in cls._memories
+
+    @classmethod
+    def memory(cls, collection: str) -> Memory:
+        inst = cls._memories.get(collection)
+        if inst is not None:
+            return inst
+
+        with cls._lock:
+            lock = cls._creating.setdefault(collection, threading.Lock())
+        with lock:
+            inst = cls._memories.get(collection)
+            if inst is None:
+                inst = cls._create(collection)
+                cls._memories[collection] = inst
+                logger.debug(f"[Mem0Registry] created memory for '{collection}'")
+            return inst
+
+    @classmethod
+    def _create(cls, collection: str) -> Memory:
+        cfg = cls.config_for(collection)
+        if not PMCASystemEnvConfig.MEM0_SHARE_CLIENTS:
+            return cls._with_embed_cache(Memory.from_config(config_dict=cfg), cfg)
+        with cls._base_lock:
+            if cls._base is None:
+                cls._base = cls._with_embed_cache(
+                    Memory.from_config(config_dict=cfg), cfg
+                )
+                return cls._base
+            base = cls._base
+        # 派生实例浅拷贝自 base，嵌入模型（及其缓存包装）随之共享
+        return cls._derive(base, collection, cfg)
+
+    @staticmethod
+    def _with_embed_cache(memory: Memory, cfg: Dict[str, Any]) -> Memory:
+        if PMCASystemEnvConfig.MEM0_EMBED_CACHE and not isinstance(
+            memory.embedding_model, PMCACachedEmbedder
+        ):
+            provider = cfg.get("embedder", {}).get("provider", "openai")
+            memory.embedding_model = PMCACachedEmbedder(
+                memory.embedding_model, embedding_cache(), provider
+            )
+        return memory
+
+    @staticmethod
+    def _derive(base: Memory, collection: str, cfg: Dict[str, Any]) -> Memory:
+        """浅拷贝已有实例以共享各类客户端，只替换向量存储（集合）句柄。"""
+        provider = cfg["vector_store"].get("provider", "qdrant")
+        vs_config = dict(cfg["vector_store"]["config"])
+        client = getattr(base.vector_store, "client", None)
+        if provider == "qdrant" and client is not None:
+            vs_config = {
+                "collection_name": collection,
+                "embedding_model_dims": vs_config.get("embedding_model_dims"),
+                "client": client,
+            }
+
+        memory = copy.copy(base)
+        memory.vector_store = VectorStoreFactory.create(provider, vs_config)
+        memory.collection_name = collection
+        return memory
+
+    @classmethod
+    def collections(cls) -> List[str]:
+        return list(cls._memories)
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            memories, cls._memories = list(cls._memories.values()), {}
+            cls._creating = {}
+            cls._base = None
+
+        # 共享的底层客户端只关闭一次
+        closed = set()
+        for memory in memories:
+            for handle in (
+                memory.db,
+                getattr(memory.vector_store, "client", None),
+                getattr(getattr(memory, "graph", None), "graph", None),
+            ):
+                if handle is None or id(handle) in closed:
+                    continue
+                closed.add(id(handle))
+                cls._close(handle)
+        logger.info(f"[Mem0Registry] closed {len(memories)} memories")
+        close_embedding_cache()
+        PMCAMem0SearchCache.clear()
+
+    @staticmethod
+    def _close(handle: Any) -> None:
+        close: Optional[Any] = getattr(handle, "close", None)
+        if close is None:
+            # langchain Neo4jGraph 未提供 close，直接关闭驱动
+            close = getattr(getattr(handle, "_driver", None), "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"[Mem0Registry] close {type(handle).__name__} failed: {e}")
@@ -0,0 +1,151 @@
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+from base.configs import PMCASystemEnvConfig
+
+
+@dataclass
+class PMCAMem0SearchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # 写入路径触发的集合版本递增次数
+    invalidations: int = 0
+    # 检索期间集合发生写入、结果作废未缓存的次数
+    stale_drops: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "invalidations": self.invalidations,
+            "stale_drops": self.stale_drops,
+        }
+
+
+class PMCAMem0SearchCache:
+    """
+    进程级 mem0 检索结果缓存（跨任务共享）：
+    - 每个集合一个 LRU，键为 (query, user_id, filters, limit, threshold) 等检索参数
+    - 每个集合一个版本号：记忆工具的 add / update / delete 路径调用 bump 使其递增并清空该集合的缓存；
+      检索开始后版本号发生变化的结果不会写入缓存
+    - MEM0_SEARCH_CACHE_TTL_SECONDS 兜底其他进程（或绕过记忆工具）的写入
+    """
+
+    _versions: Dict[str, int] = {}
+    _entries: Dict[str, "OrderedDict[str, Tuple[float, Any]]"] = {}
+    _lock = threading.Lock()
+    stats = PMCAMem0SearchCacheStats()
+
+    @staticmethod
+    def _key(query: str, kwargs: Dict[str, Any]) -> str:
+        return json.dumps(
+            {"query": query.strip(), **kwargs}, sort_keys=True, default=str
+        )
+
+    @classmethod
+    def version(cls, collection: str) -> int:
+        return cls._versions.get(collection, 0)
+
+    @classmethod
+    def bump(cls, collection: str) -> None:
+        with cls._lock:
+            cls._versions[collection] = cls._versions.get(collection, 0) + 1
+            cls._entries.pop(collection, None)
+            cls.stats.invalidations += 1
+
+    @classmethod
+    def search(cls, collection: str, memory: Any, query: str, **kwargs: Any) -> Any:
+        """等价于 memory.search(query, **kwargs)；命中时返回缓存结果的副本。"""
+        if not PMCASystemEnvConfig.MEM0_SEARCH_CACHE:
+            return memory.search(query, **kwargs)
+
+        key = cls._key(query, kwargs)
+        ttl = PMCASystemEnvConfig.MEM0_SEARCH_CACHE_TTL_SECONDS
+        with cls._lock:
+            entries = cls._entries.get(collection)
+            hit = entries.get(key) if entries is not None else None
+            if hit is not None and (not ttl or hit[0] + ttl > time.time()):
+                entries.move_to_end(key)
+                cls.stats.hits += 1
+                return copy.deepcopy(hit[1])
+            cls.stats.misses += 1
+            version = cls._versions.get(collection, 0)
+
+        result = memory.search(query, **kwargs)
+
+        with cls._lock:
+            if cls._versions.get(collection, 0) != version:
+                cls.stats.stale_drops += 1
+                return result
+            entries = cls._entries.setdefault(collection, OrderedDict())
+            entries[key] = (time.time(), copy.deepcopy(result))
+            entries.move_to_end(key)
+            limit = PMCASystemEnvConfig.MEM0_SEARCH_CACHE_MAX_ENTRIES
+            while limit and len(entries) > limit:
+                entries.popitem(last=False)
+        return result
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
+        logger.info(f"Mem0 search cache stats: {cls.stats.to_dict()}")
+
+
+class PMCASearchCachedClient:
+    """
+    交给 Mem0Memory 使用的 mem0 Memory 代理：
+    search 走检索缓存，add / update / delete / delete_all 写入后使该集合缓存失效，其余属性透传。
+    """
+
+    def __init__(self, memory: Any, collection: str) -> None:
+        self.memory = memory
+        self.collection = collection
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "memory":
+            raise AttributeError(name)
+        return getattr(self.memory, name)
+
+    def search(self, query: str, **kwargs: Any) -> Any:
+        return PMCAMem0SearchCache.search(self.collection, self.memory, query, **kwargs)
+
+    def add(
+        self, *args: Any, output_format: Optional[str] = None, **kwargs: Any
+    ) -> Any:
+        # Mem0Memory 按类名判断是否为本地 Memory，代理会收到仅云端支持的 output_format，这里丢弃
+        try:
+            return self.memory.add(*args, **kwargs)
+        finally:
+            PMCAMem0SearchCache.bump(self.collection)
+
+    def update(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return self.memory.update(*args, **kwargs)
+        finally:
+            PMCAMem0SearchCache.bump(self.collection)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return self.memory.delete(*args, **kwargs)
+        finally:
+            PMCAMem0SearchCache.bump(self.collection)
+
+    def delete_all(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return self.memory.delete_all(*args, **kwargs)
+        finally:
+            PMCAMem0SearchCache.bump(self.collection)
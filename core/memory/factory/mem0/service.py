@@ -1,11 +1,31 @@
-import copy
 import re
 import threading
-from typing import Dict
+import time
+from typing import Dict, Iterable
 
 from loguru import logger
 from autogen_ext.memory.mem0 import Mem0Memory
-from base.configs import mem0config
+
+from .registry import PMCAMem0Registry
+from .search_cache import PMCASearchCachedClient
+
+
+class PMCASharedMem0Memory(Mem0Memory):
+    """
+    复用注册表中 mem0 Memory 的 Mem0Memory：
+    Mem0Memory.__init__ 总会 from_config 新建客户端，这里只设置同名字段，不再重复建立连接。
+    每轮的上下文检索经 PMCASearchCachedClient 走进程级检索结果缓存。
+    """
+
+    def __init__(self, user_id: str, collection: str, limit: int = 10) -> None:
+        self._user_id = user_id
+        self._limit = limit
+        self._is_cloud = False
+        self._api_key = None
+        self._config = PMCAMem0Registry.config_for(collection)
+        self._client = PMCASearchCachedClient(
+            PMCAMem0Registry.memory(collection), collection
+        )
 
 
 class PMCAMem0LocalService:
@@ -17,6 +37,9 @@ class PMCAMem0LocalService:
 
     _instances: Dict[str, Mem0Memory] = {}
     _lock = threading.Lock()
+    _creating: Dict[str, threading.Lock] = {}
+    # 各智能体记忆实例的创建耗时（秒），用于定位冷启动瓶颈
+    _init_seconds: Dict[str, float] = {}
 
     @staticmethod
     def _assistant_name_to_unified_id(assistant_name: str) -> str:
@@ -26,29 +49,21 @@ class PMCAMem0LocalService:
         s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", assistant_name)
         return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
 
+    @classmethod
+    def register_assistants(cls, assistant_names: Iterable[str]) -> None:
+        """登记已注册智能体的集合（惰性初始化时记忆工具据此认定集合已供给）。"""
+        PMCAMem0Registry.register(
+            cls._assistant_name_to_unified_id(name) for name in assistant_names
+        )
+
     @classmethod
     def instance(cls, assistant_name: str) -> Mem0Memory:
         """
-        创建新的 Mem0Memory 实例。
+        创建新的 Mem0Memory 实例（底层 mem0 Memory 取自进程级注册表，与记忆工具共用）。
         """
         try:
             unified_id = cls._assistant_name_to_unified_id(assistant_name)
-            cfg = copy.deepcopy(mem0config.PMCAMem0LocalConfig)  # 仅防御性拷贝
-
-            try:
-                cfg.setdefault("vector_store", {}).setdefault("config", {}).update(
-                    collection_name=unified_id
-                )
-            except Exception as e:
-                logger.error(f"[Mem0] set collection_name failed: {e}")
-                raise
-
-            memory = Mem0Memory(
-                user_id=unified_id,
-                is_cloud=False,
-                config=cfg,
-            )
-            return memory
+            return PMCASharedMem0Memory(user_id=unified_id, collection=unified_id)
         except Exception as e:
             logger.error(f"[Mem0] create instance failed for '{assistant_name}': {e}")
             raise
@@ -56,16 +71,34 @@ class PMCAMem0LocalService:
     @classmethod
     def memory(cls, assistant_name: str) -> Mem0Memory:
         """
-        获取或构建指定智能体的单例记忆实例（线程安全）
+        获取或构建指定智能体的单例记忆实例（线程安全；不同智能体可并行构建）
         """
         inst = cls._instances.get(assistant_name)
         if inst is not None:
             return inst
 
         with cls._lock:
+            lock = cls._creating.setdefault(assistant_name, threading.Lock())
+        with lock:
             inst = cls._instances.get(assistant_name)
             if inst is None:
+                started = time.perf_counter()
                 inst = cls.instance(assistant_name)
+                cls._init_seconds[assistant_name] = time.perf_counter() - started
                 cls._instances[assistant_name] = inst
             return inst
 
+    @classmethod
+    def init_timings(cls) -> Dict[str, float]:
+        """各智能体记忆实例的创建耗时，按耗时降序。"""
+        return dict(
+            sorted(cls._init_seconds.items(), key=lambda kv: kv[1], reverse=True)
+        )
+
+    @classmethod
+    def close_all(cls) -> None:
+        """释放所有记忆实例及其共享的底层连接。"""
+        with cls._lock:
+            cls._instances.clear()
+            cls._creating.clear()
+        PMCAMem0Registry.close_all()
@@ -21,6 +21,8 @@ class PMCAOrchestrator(PMCAAssistantMetadata):
 """
     ability: AbilityType = AbilityType.DEFAULT
 
+    llm_priority: Literal["critical", "normal", "bulk"] = "critical"
+
     tools_type: Literal["workbench", "tools", "none"] = "workbench"
 
     required_mcp_keys: List[str] = [
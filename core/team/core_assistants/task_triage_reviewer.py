@@ -19,6 +19,8 @@ class PMCATriageReviewer(PMCAAssistantMetadata):
 
     ability: AbilityType = AbilityType.DEFAULT
 
+    llm_priority: Literal["critical", "normal", "bulk"] = "critical"
+
     tools_type: Literal["workbench", "tools", "none"] = "none"
 
     required_mcp_keys: List[str] = []
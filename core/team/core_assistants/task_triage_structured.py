@@ -19,6 +19,11 @@ class PMCATriageStructured(PMCAAssistantMetadata):
 
     ability: AbilityType = AbilityType.DEFAULT
 
+    llm_priority: Literal["critical", "normal", "bulk"] = "critical"
+
+    # 结构化输出对相同的分诊结果是确定的，启用响应缓存
+    llm_cache: Optional[bool] = True
+
     tools_type: Literal["workbench", "tools", "none"] = "none"
 
     required_mcp_keys: List[str] = []
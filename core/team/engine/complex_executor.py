@@ -1,4 +1,6 @@
-from typing import List
+import asyncio
+import time
+from typing import Any, Dict, List
 from autogen_agentchat.base import ChatAgent, Team
 from autogen_agentchat.teams import RoundRobinGroupChat, SelectorGroupChat
 from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
@@ -11,9 +13,12 @@ from base.runtime.task_context import PMCATaskContext
 from core.team.common.team_messages import PMCARoutingMessages
 from core.team.core_assistants import PMCACoreAssistants
 from core.assistant.factory import PMCAAssistantFactory
+from core.assistant.factory.model_context import build_model_context
+from core.client import AbilityType
 from core.team.factory import PMCATeamFactory
 from core.team.engine.termination import PMCAComplexExecutorTermination
 
+from .selector_rules import PMCARuleBasedSelector
 from .swarm import PMCASwarm
 from .wrapper.swarm_node import PMCASwarmWrapper
 from utils.somehandler import swarm_name_to_snake, make_valid_identifier
@@ -37,6 +42,8 @@ class PMCAComplexTaskTeam(PMCATeamFactory):
         """
 
         self._participants = []
+        # swarm 包裹器名 -> 分诊结果中的团队名，供规则选择器识别点名
+        self._swarm_aliases = {}
         if not self._user_proxy:
             raise ValueError("[复杂任务节点初始化阶段] 用户代理未能正常初始化")
         self._participants.append(self._user_proxy)
@@ -46,20 +53,19 @@ class PMCAComplexTaskTeam(PMCATeamFactory):
         system_message = self._build_orchestrator_system_prompt(triage_result)
 
         # 加入orchestrator智能体作为团队的整体决策者
-        orchestrator = self.ctx.assistant_factory.create_assistant(
+        orchestrator = await self.ctx.assistant_factory.acreate_assistant(
             PMCACoreAssistants.ORCHESTRATOR.value, system_message=system_message
         )
 
         self._participants.append(orchestrator)
 
-        for team_info in triage_result.get("team"):
+        team_list = triage_result.get("team")
+        swarms = await self._build_swarms(team_list)
+
+        for team_info, swarm_team in zip(team_list, swarms):
             swarm_team_name = team_info.get("name")
             swarm_team_description = team_info.get("description")
 
-            swarm_team = await PMCASwarm.create(
-                self._ctx, swarm_team_name, swarm_team_description
-            )
-
             swarm_wrapper = PMCASwarmWrapper(
                 self._ctx,
                 swarm_team,
@@ -69,8 +75,50 @@ class PMCAComplexTaskTeam(PMCATeamFactory):
             )
 
             self._participants.append(swarm_wrapper)
+            self._swarm_aliases[swarm_wrapper.name] = [swarm_team_name]
+
+    async def _build_swarms(self, team_list: List[Dict[str, Any]]) -> List[PMCASwarm]:
+        """
+        并发构建分诊结果中的各个 swarm 团队（并发数受 COMPLEX_EXECUTOR_SETUP_CONCURRENCY 限制），
+        返回顺序与 team_list 一致；各团队的构建耗时写入任务工作台 swarm_setup_timings。
+        """
+        semaphore = asyncio.Semaphore(
+            max(1, self._ctx.task_env.COMPLEX_EXECUTOR_SETUP_CONCURRENCY)
+        )
+        timings: Dict[str, float] = {}
+
+        async def build(team_info: Dict[str, Any]) -> PMCASwarm:
+            swarm_team_name = team_info.get("name")
+            async with semaphore:
+                started = time.perf_counter()
+                # 直接传入已解析的团队条目，避免每个 swarm 重复读取 triage_result
+                swarm_team = await PMCASwarm.create(
+                    self._ctx,
+                    swarm_team_name,
+                    team_info.get("description"),
+                    team_info=team_info,
+                )
+                timings[swarm_team_name] = round(time.perf_counter() - started, 3)
+            return swarm_team
+
+        started = time.perf_counter()
+        swarms = await asyncio.gather(*(build(team_info) for team_info in team_list))
+        total = round(time.perf_counter() - started, 3)
+
+        logger.info(f"[ComplexExecutor] swarm setup {total}s: {timings}")
+        await self._ctx.task_workbench.set_item(
+            "swarm_setup_timings", {"total": total, "swarms": timings}
+        )
+        return list(swarms)
 
     def _build_team(self) -> Team:
+        # 相同对话历史下的发言人选择是确定的，启用响应缓存
+        model_client = self._ctx.llm_factory.client(
+            cache=True,
+            assistant="PMCAComplexTaskSelector",
+            task_id=self._ctx.task_id,
+            priority="critical",
+        )
         return SelectorGroupChat(
             self._participants,
             name="PMCA-COMPLEX-TASK-EXECUTOR",
@@ -78,9 +126,28 @@ class PMCAComplexTaskTeam(PMCATeamFactory):
             selector_prompt=PMCACOMPLEXTASK_SELECTORGROUP_SYSTEM_MESSAGE,
             allow_repeated_speaker=True,
             termination_condition=self._termination,
-            model_client=self._ctx.llm_factory.client(),
+            model_client=model_client,
+            selector_func=self._build_rule_selector(),
+            # 选择器每轮都会带上完整历史，按预算裁剪
+            model_context=build_model_context(
+                self._ctx,
+                "PMCAComplexTaskSelector",
+                AbilityType.DEFAULT,
+                model_client,
+            ),
         )
 
+    def _build_rule_selector(self):
+        if not self._ctx.task_env.COMPLEX_EXECUTOR_RULE_SELECTOR:
+            return None
+        # SelectorGroupChat 用 inspect.iscoroutinefunction 判断是否 await，
+        # 必须传绑定的 async 方法（带 async __call__ 的实例会被当作同步函数调用）
+        return PMCARuleBasedSelector(
+            self._ctx,
+            self._swarm_aliases,
+            user_proxy=self._user_proxy.name if self._user_proxy else None,
+        ).select
+
     def _build_orchestrator_system_prompt(self, triage_result) -> str:
         format_message = ""
         for index, team_info in enumerate(triage_result.get("team")):
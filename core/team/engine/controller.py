@@ -66,7 +66,7 @@ class PMCAFlowController:
             self._task_triage_structured = PMCATriageStructuredWrapper(
                 name="PMCATriageStructuredWrapper",
                 ctx=self._ctx,
-                wrapped_agent=self._ctx.assistant_factory.create_assistant(
+                wrapped_agent=await self._ctx.assistant_factory.acreate_assistant(
                     PMCACoreAssistants.TRIAGE_STRUCTURED.value
                 ),
             )
@@ -0,0 +1,136 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from loguru import logger
+
+from base.runtime.task_context import PMCATaskContext
+from core.team.common.team_messages import PMCARoutingMessages
+from core.team.core_assistants.core_assistants import PMCACoreAssistants
+
+
+@dataclass
+class PMCASelectorStats:
+    # 由规则直接选出发言人（省去一次选择器 LLM 调用）的次数，按规则名统计
+    rule_hits: Dict[str, int] = field(default_factory=dict)
+    # 规则无法确定、回退到 LLM 选择器的次数
+    llm_fallbacks: int = 0
+
+    @property
+    def avoided_calls(self) -> int:
+        return sum(self.rule_hits.values())
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "rule_hits": dict(self.rule_hits),
+            "avoided_calls": self.avoided_calls,
+            "llm_fallbacks": self.llm_fallbacks,
+        }
+
+
+class PMCARuleBasedSelector:
+    """
+    复杂任务执行团队的确定性发言人选择（SelectorGroupChat 的 selector_func）：
+    - 用户 / 用户代理发言后 → PMCAOrchestrator（先规划、再委派）
+    - swarm 团队上报（[SWARM_FINAL] / [SWARM_STATUS] / [SWARM_DONE]）后 → PMCAOrchestrator
+    - PMCAOrchestrator 请求用户介入（[ASSISTANT:NEEDUSER] 或点名 PMCAUserProxy）→ PMCAUserProxy
+    - PMCAOrchestrator 明确指派了一个 swarm 团队（@团队名，或“交给 / 指派给 / 请 团队名”等指令句式）→ 该团队
+      （仅在文本中提到团队名不算指派：状态汇报、计划中的 assignee 等都会提到团队）
+    其余情况（点名多个团队、没有点名等）返回 None，由 LLM 选择器决定。
+    统计只在内存中累计，任务结束时经 collect_task_metrics 写入工作台 selector_stats 键。
+    """
+
+    WORKBENCH_KEY = "selector_stats"
+    # PMCASwarmWrapper 上报给外层团队的信号（见 swarm_node._detect_swarm_signal）
+    SWARM_SIGNALS = ("[SWARM_FINAL]", "[SWARM_STATUS]", "[SWARM_DONE]")
+
+    def __init__(
+        self,
+        ctx: PMCATaskContext,
+        swarm_aliases: Dict[str, Iterable[str]],
+        *,
+        orchestrator: str = PMCACoreAssistants.ORCHESTRATOR.value,
+        user_proxy: Optional[str] = PMCACoreAssistants.USER_PROXY.value,
+    ) -> None:
+        self._ctx = ctx
+        self._orchestrator = orchestrator
+        self._user_proxy = user_proxy
+        # 参与者名 -> 指派该团队的句式（参与者名本身、分诊结果中的团队名等称呼）
+        self._swarm_patterns: Dict[str, List[re.Pattern]] = {
+            name: [
+                self._directive_pattern(alias) for alias in {name, *aliases} if alias
+            ]
+            for name, aliases in swarm_aliases.items()
+        }
+        self.stats = PMCASelectorStats()
+        ctx.add_metrics_source(self.workbench_items)
+
+    def workbench_items(self) -> Dict[str, object]:
+        return {self.WORKBENCH_KEY: self.stats.to_dict()}
+
+    # 指派句式：@点名，或指派动词 / “下一步” 等紧接团队名（可带 “团队” / “Swarm:” 前缀）
+    _DIRECTIVE_PREFIX = (
+        r"(?:@|(?:指派给|委派给|分派给|交给|交由|移交给|派给|请|下一步由|下一步[:：]|"
+        r"next speaker[:：]|hand\s*off to|assign(?:ed)? to|delegate to)\s*"
+        r"(?:团队\s*)?(?:swarm[:：]\s*)?)"
+    )
+
+    @classmethod
+    def _directive_pattern(cls, alias: str) -> re.Pattern:
+        # 英文标识符按整词结尾（避免 Analysis 命中 AnalysisReport）；中文团队名不限结尾
+        tail = r"(?![\w-])" if alias.isascii() else ""
+        return re.compile(
+            rf"{cls._DIRECTIVE_PREFIX}{re.escape(alias)}{tail}", re.IGNORECASE
+        )
+
+    def _directed_swarms(self, text: str) -> List[str]:
+        return [
+            name
+            for name, patterns in self._swarm_patterns.items()
+            if any(p.search(text) for p in patterns)
+        ]
+
+    def _select(self, message: Optional[BaseChatMessage]) -> Optional[Tuple[str, str]]:
+        if message is None:
+            return "task", self._orchestrator
+
+        source = message.source
+        text = message.to_text()
+        if source == "user" or source == self._user_proxy:
+            return "user_to_orchestrator", self._orchestrator
+        if source in self._swarm_patterns:
+            # 只有带上报信号的 swarm 消息才确定交回编排器；其他消息交给 LLM 选择器
+            if any(signal in text for signal in self.SWARM_SIGNALS):
+                return "swarm_signal", self._orchestrator
+            return None
+        if source != self._orchestrator:
+            return None
+
+        if self._user_proxy and (
+            PMCARoutingMessages.ASSISTANT_NEEDUSER.value in text
+            or f"@{self._user_proxy}" in text
+        ):
+            return "orchestrator_need_user", self._user_proxy
+
+        # 只认明确的指派；同时指派多个团队视为不确定
+        directed = self._directed_swarms(text)
+        if len(directed) == 1:
+            return "orchestrator_directive", directed[0]
+        return None
+
+    async def select(
+        self, messages: Sequence[BaseAgentEvent | BaseChatMessage]
+    ) -> Optional[str]:
+        last = next(
+            (m for m in reversed(messages) if isinstance(m, BaseChatMessage)), None
+        )
+        decision = self._select(last)
+        if decision is None:
+            self.stats.llm_fallbacks += 1
+            speaker = None
+        else:
+            rule, speaker = decision
+            self.stats.rule_hits[rule] = self.stats.rule_hits.get(rule, 0) + 1
+            logger.debug(f"[SelectorRules] {rule} -> {speaker}")
+        return speaker
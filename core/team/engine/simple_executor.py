@@ -44,7 +44,7 @@ class PMCASimpleTaskTeam(PMCATeamFactory):
             )
 
         assistant_name = triage_result.get("assistant")
-        assistant = self._ctx.assistant_factory.create_assistant(assistant_name)
+        assistant = await self._ctx.assistant_factory.acreate_assistant(assistant_name)
 
         self._participants.append(assistant)
 
@@ -1,4 +1,5 @@
-from typing import List
+import asyncio
+from typing import Any, Dict, List, Optional
 from loguru import logger
 from autogen_agentchat.base import ChatAgent, Team
 from autogen_agentchat.teams import Swarm
@@ -16,9 +17,57 @@ class PMCASwarm(PMCATeamFactory):
         name: str,
         description: str,
         use_user: bool = False,
+        team_info: Optional[Dict[str, Any]] = None,
     ) -> None:
         super().__init__(ctx, name, description, use_user=use_user)
         self._first_speaker_name = None
+        # 调用方已解析好的分诊团队条目；为空时从工作台读取 triage_result
+        self._team_info = team_info
+
+    @classmethod
+    async def create(
+        cls,
+        ctx: PMCATaskContext,
+        name: str,
+        description: str,
+        *,
+        use_user: bool = True,
+        team_info: Optional[Dict[str, Any]] = None,
+    ) -> "PMCASwarm":
+        instance = cls(ctx, name, description, use_user=use_user, team_info=team_info)
+        await instance._async_init()
+        return instance
+
+    async def _team_item(self) -> Optional[Dict[str, Any]]:
+        if self._team_info is not None:
+            return self._team_info
+        triage_result = await self._ctx.task_workbench.get_item("triage_result")
+        for team_item in triage_result.get("team"):
+            if team_item.get("name") == self._name:
+                return team_item
+        return None
+
+    def _create_assistants(self, participant_names: List[str]) -> List[ChatAgent]:
+        # 惰性模式下只登记名称与 handoffs，智能体第一次发言时才真正构建
+        factory = self._ctx.assistant_factory
+        create = (
+            factory.create_lazy_assistant
+            if self._ctx.task_env.SWARM_LAZY_ASSISTANTS
+            else factory.create_assistant
+        )
+        assistants: List[ChatAgent] = []
+        for name in participant_names:
+            # 为每个智能体计算其 handoffs 列表，即名单中除自己外的所有人
+            # 这是实现“全连接”网络的关键
+            dynamic_handoffs = [
+                p_name for p_name in participant_names if p_name != name
+            ]
+
+            # swarm 内的执行属于批量工作，排在分诊/选择器调用之后
+            assistants.append(
+                create(name, handoffs=dynamic_handoffs or None, llm_priority="bulk")
+            )
+        return assistants
 
     def _build_team_termination(self):
         return (
@@ -31,54 +80,47 @@ class PMCASwarm(PMCATeamFactory):
         """
         self._participants = []
 
-        triage_result = await self._ctx.task_workbench.get_item("triage_result")
-        triage_team_list = triage_result.get("team")
-        for team_item in triage_team_list:
-            if team_item.get("name") == self._name:
-                # 1. 获取本次 Swarm 的参与者名单
-                participant_names = team_item.get("participants", [])
-
-                # 如果名单为空，则此 Swarm 无需构建，直接跳出
-                if not participant_names:
-                    break
+        team_item = await self._team_item()
+        if team_item is None:
+            return
 
-                # 2. 创建所有智能体实例
-                for name in participant_names:
-                    # 为每个智能体计算其 handoffs 列表，即名单中除自己外的所有人
-                    # 这是实现“全连接”网络的关键
-                    dynamic_handoffs = [
-                        p_name for p_name in participant_names if p_name != name
-                    ]
+        # 1. 获取本次 Swarm 的参与者名单
+        participant_names = team_item.get("participants", [])
 
-                    assistant = self._ctx.assistant_factory.create_assistant(
-                        name, handoffs=dynamic_handoffs or None
-                    )
-                    self._participants.append(assistant)
+        # 如果名单为空，则此 Swarm 无需构建
+        if not participant_names:
+            return
 
-                # 3. 将指定的“第一发言人”移动到列表的最前面
-                # 分诊结果保证了 participants[0] 是第一发言人
-                self._first_speaker_name = participant_names[0]
+        # 2. 创建所有智能体实例（记忆 / 客户端初始化是阻塞调用，放到工作线程中，
+        #    使多个 swarm 的构建可以并行；惰性模式下构建推迟到首次发言）
+        if self._ctx.task_env.SWARM_LAZY_ASSISTANTS:
+            self._participants.extend(self._create_assistants(participant_names))
+        else:
+            self._participants.extend(
+                await asyncio.to_thread(self._create_assistants, participant_names)
+            )
 
-                try:
-                    # 找到第一发言人的当前索引
-                    speaker_index = next(
-                        i
-                        for i, p in enumerate(self._participants)
-                        if p.name == self._first_speaker_name
-                    )
-                    # 将其移动到列表首位
-                    first_speaker = self._participants.pop(speaker_index)
-                    self._participants.insert(0, first_speaker)
-                except StopIteration:
-                    # 健壮性处理：如果因意外情况找不到指定的第一发言人，
-                    # 列表将保持其初始顺序，第一个被创建的智能体将成为发言人。
-                    logger.warning(
-                        f"在 Swarm '{self._name}' 中未找到指定的第一发言人 '{self._first_speaker_name}'。"
-                        "将使用默认顺序。"
-                    )
+        # 3. 将指定的“第一发言人”移动到列表的最前面
+        # 分诊结果保证了 participants[0] 是第一发言人
+        self._first_speaker_name = participant_names[0]
 
-                # 找到并处理完当前 Swarm 后，即可退出循环
-                break
+        try:
+            # 找到第一发言人的当前索引
+            speaker_index = next(
+                i
+                for i, p in enumerate(self._participants)
+                if p.name == self._first_speaker_name
+            )
+            # 将其移动到列表首位
+            first_speaker = self._participants.pop(speaker_index)
+            self._participants.insert(0, first_speaker)
+        except StopIteration:
+            # 健壮性处理：如果因意外情况找不到指定的第一发言人，
+            # 列表将保持其初始顺序，第一个被创建的智能体将成为发言人。
+            logger.warning(
+                f"在 Swarm '{self._name}' 中未找到指定的第一发言人 '{self._first_speaker_name}'。"
+                "将使用默认顺序。"
+            )
 
     def _build_team(self) -> Team:
         participants_list = [
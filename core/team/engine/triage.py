@@ -31,10 +31,12 @@ class PMCATriageTeam(PMCATeamFactory):
         self._participants = []
 
         self._participants.append(
-            self.ctx.assistant_factory.create_assistant(PMCACoreAssistants.TRIAGE.value)
+            await self.ctx.assistant_factory.acreate_assistant(
+                PMCACoreAssistants.TRIAGE.value
+            )
         )
         self._participants.append(
-            self.ctx.assistant_factory.create_assistant(
+            await self.ctx.assistant_factory.acreate_assistant(
                 PMCACoreAssistants.TRIAGE_REVIEWER.value
             )
         )
@@ -8,6 +8,7 @@ from autogen_core import CancellationToken
 from loguru import logger
 
 from base.runtime.task_context import PMCATaskContext
+from core.client.instrumentation import set_llm_node
 from core.team.common.team_messages import PMCARoutingMessages
 from core.team.engine.complex_executor import PMCAComplexTaskTeam
 from core.team.factory import PMCATeamFactory
@@ -31,6 +32,7 @@ class PMCAComplexTaskExecutorWrapper(BaseChatAgent):
         messages: Sequence[BaseChatMessage],
         cancellation_token: CancellationToken,
     ) -> AsyncGenerator[Union[BaseAgentEvent, BaseChatMessage, Response], None]:
+        set_llm_node(self.name)
         logger.info(
             f"[{self.name}] complex-node stream start; new_messages={len(messages)}"
         )
@@ -71,6 +73,7 @@ class PMCAComplexTaskExecutorWrapper(BaseChatAgent):
         messages: Sequence[BaseChatMessage],
         cancellation_token: CancellationToken,
     ) -> Response:
+        set_llm_node(self.name)
         logger.info(
             f"[{self.name}] complex-node non-stream start; new_messages={len(messages)}"
         )
@@ -8,6 +8,7 @@ from autogen_agentchat.messages import BaseChatMessage, TextMessage
 from autogen_core import CancellationToken
 
 from base.runtime.task_context import PMCATaskContext
+from core.client.instrumentation import set_llm_node
 from core.team.common.team_messages import PMCARoutingMessages
 from core.team.engine.simple_executor import PMCASimpleTaskTeam
 from core.team.factory import PMCATeamFactory
@@ -39,6 +40,7 @@ class PMCASimpleTaskExecutorWrapper(BaseChatAgent):
     ) -> Response:
         """收到新消息时调用团队运行，并返回团队的最终回复."""
 
+        set_llm_node(self.name)
         logger.info(f"节点 '{self.name}' 已激活，开始动态执行简单任务...")
 
         # 1. 【运行时创建团队】
@@ -11,6 +11,8 @@ from autogen_agentchat.messages import BaseChatMessage, TextMessage, BaseAgentEv
 from autogen_core import CancellationToken
 
 from base.runtime import PMCATaskContext
+from core.assistant.factory.prewarm import triage_assistants
+from core.client.instrumentation import set_llm_node
 from base.runtime.event.system_event import (
     TriageEvent,
     TriageSummaryEvent,
@@ -122,6 +124,7 @@ class PMCATriageStructuredWrapper(BaseChatAgent):
         cancellation_token: CancellationToken,
     ) -> AsyncGenerator[Union[BaseAgentEvent, BaseChatMessage, Response], None]:
         # 黑板幂等
+        set_llm_node(self.name)
         await init_task_blackboard(
             self._ctx,
             [TriageEvent, TriageSummaryEvent, AssistantStatusEvent],
@@ -146,8 +149,6 @@ class PMCATriageStructuredWrapper(BaseChatAgent):
 
                 try:
                     structured = json.loads(json_str)
-                    # 二次 JSON 化试探，确保完全可序列化（处理潜在 Pydantic 字段）
-                    _ = json.dumps(_to_jsonable(structured), ensure_ascii=False)
                     await self._ctx.task_workbench.set_item("triage_result", structured)
                     logger.debug(f"[{self.name}] stored triage_result")
 
@@ -207,6 +208,7 @@ class PMCATriageStructuredWrapper(BaseChatAgent):
         messages: Sequence[BaseChatMessage],
         cancellation_token: CancellationToken,
     ) -> Response:
+        set_llm_node(self.name)
         transcript = await self._ctx.task_workbench.get_item("triage_transcript")
         upstream: list[BaseChatMessage] = []
         ctx_msg = _make_context_prefix(transcript, self.name) if transcript else None
@@ -244,10 +246,13 @@ class PMCATriageStructuredWrapper(BaseChatAgent):
             return
         try:
             structured = json.loads(json_str)
-            # 二次 JSON 化试探，确保完全可序列化（处理潜在 Pydantic 字段）
-            _ = json.dumps(_to_jsonable(structured), ensure_ascii=False)
             await self._ctx.task_workbench.set_item("triage_result", structured)
             logger.debug(f"[{self.name}] stored triage_result")
+            # 分诊结果已确定：保留选中智能体的预热资源，丢弃其余
+            if self._ctx.assistant_prewarmer is not None:
+                await self._ctx.assistant_prewarmer.commit(
+                    triage_assistants(structured)
+                )
         except json.JSONDecodeError as e:
             logger.error(f"[{self.name}] parse JSON failed: {e}; raw={json_str}")
         except Exception as e:
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Sequence, AsyncGenerator, Union, Optional, Any
 from dataclasses import asdict, is_dataclass
-import json
 import re
 from uuid import uuid4
 
@@ -17,6 +16,7 @@ from autogen_agentchat.messages import (
 from autogen_core import CancellationToken, TopicId, SingleThreadedAgentRuntime
 
 from base.runtime.task_context import PMCATaskContext
+from core.client.instrumentation import set_llm_node
 from core.team.factory import PMCATeamFactory
 
 from utils.somehandler import swarm_name_to_snake, make_valid_identifier
@@ -157,6 +157,7 @@ class PMCASwarmWrapper(BaseChatAgent):
         messages: Sequence[BaseChatMessage],
         cancellation_token: CancellationToken,
     ) -> AsyncGenerator[Union[BaseAgentEvent, BaseChatMessage, Response], None]:
+        set_llm_node(self.name)
         effective_task: Optional[Sequence[BaseChatMessage]] = messages or None
         logger.debug(f"[{self.name}] swarm stream start, new_messages={len(messages)}")
 
@@ -168,10 +169,9 @@ class PMCASwarmWrapper(BaseChatAgent):
 
         async for item in stream:
             if isinstance(item, TaskResult):
-                # 1) 轻量化 transcript 并入库（JSON 友好化 + 试探序列化）
+                # 1) 轻量化 transcript 并入库（JSON 友好化；序列化由 workbench codec 完成）
                 transcript = _simplify_messages(item.messages)
                 try:
-                    _ = json.dumps(transcript, ensure_ascii=False)
                     await self._ctx.task_workbench.set_item(
                         self._transcript_key, transcript
                     )
@@ -199,6 +199,7 @@ class PMCASwarmWrapper(BaseChatAgent):
         messages: Sequence[BaseChatMessage],
         cancellation_token: CancellationToken,
     ) -> Response:
+        set_llm_node(self.name)
         effective_task: Optional[Sequence[BaseChatMessage]] = messages or None
         logger.debug(
             f"[{self.name}] swarm non-stream start, new_messages={len(messages)}"
@@ -211,7 +212,6 @@ class PMCASwarmWrapper(BaseChatAgent):
 
         transcript = _simplify_messages(result.messages)
         try:
-            _ = json.dumps(transcript, ensure_ascii=False)
             await self._ctx.task_workbench.set_item(self._transcript_key, transcript)
             logger.debug(
                 f"[{self.name}] stored {self._transcript_key} ({len(transcript)})"
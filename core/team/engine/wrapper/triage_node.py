@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import Sequence, AsyncGenerator, Union, Optional, Any
 
 from loguru import logger
@@ -14,6 +13,7 @@ from autogen_agentchat.messages import (
 from autogen_core import CancellationToken
 
 from base.runtime.task_context import PMCATaskContext
+from core.client.instrumentation import set_llm_node
 from core.team.factory import PMCATeamFactory
 from core.team.common.team_messages import PMCARoutingMessages
 
@@ -115,6 +115,7 @@ class PMCATriageTeamWrapper(BaseChatAgent):
         messages: Sequence[BaseChatMessage],
         cancellation_token: CancellationToken,
     ) -> AsyncGenerator[Union[BaseAgentEvent, BaseChatMessage, Response], None]:
+        set_llm_node(self.name)
         effective_task: Optional[Sequence[BaseChatMessage]] = messages or None
         logger.debug(f"[{self.name}] triage stream start, new_messages={len(messages)}")
 
@@ -137,7 +138,6 @@ class PMCATriageTeamWrapper(BaseChatAgent):
                 logger.error(transcript)
 
                 try:
-                    _ = json.dumps(transcript, ensure_ascii=False)
                     await self._ctx.task_workbench.set_item(
                         "triage_transcript", transcript
                     )
@@ -196,6 +196,10 @@ class PMCATriageTeamWrapper(BaseChatAgent):
                     chat_message=TextMessage(source=self.name, content=content)
                 )
             else:
+                # 分诊讨论中点到的智能体：提前在后台预热其执行资源
+                prewarmer = self._ctx.assistant_prewarmer
+                if prewarmer is not None and isinstance(item, BaseChatMessage):
+                    prewarmer.observe(item.to_text())
                 yield item
 
     # 非流式（少数需要一次性结果的地方）
@@ -204,6 +208,7 @@ class PMCATriageTeamWrapper(BaseChatAgent):
         messages: Sequence[BaseChatMessage],
         cancellation_token: CancellationToken,
     ) -> Response:
+        set_llm_node(self.name)
         effective_task: Optional[Sequence[BaseChatMessage]] = messages or None
         logger.debug(
             f"[{self.name}] triage non-stream start, new_messages={len(messages)}"
@@ -216,7 +221,6 @@ class PMCATriageTeamWrapper(BaseChatAgent):
 
         transcript = _simplify_messages(result.messages)
         try:
-            _ = json.dumps(transcript, ensure_ascii=False)
             await self._ctx.task_workbench.set_item("triage_transcript", transcript)
             logger.debug(f"[{self.name}] stored triage_transcript ({len(transcript)})")
         except Exception as e:
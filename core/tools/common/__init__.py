@@ -1,4 +1,16 @@
 from .server import merge_functional_workbenches
+from .mcp_pool import (
+    PMCAMcpSessionPool,
+    PMCAPooledMcpWorkbench,
+    close_mcp_session_pool,
+    mcp_session_pool,
+)
 
 
-__all__ = ["merge_functional_workbenches"]
+__all__ = [
+    "merge_functional_workbenches",
+    "PMCAMcpSessionPool",
+    "PMCAPooledMcpWorkbench",
+    "close_mcp_session_pool",
+    "mcp_session_pool",
+]
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+from autogen_core import CancellationToken
+from autogen_core.tools import ToolResult, ToolSchema, Workbench
+from autogen_ext.tools.mcp import McpServerParams, McpWorkbench
+from loguru import logger
+
+
+@dataclass
+class PMCAMcpServerStats:
+    connects: int = 0
+    leases: int = 0
+    tool_calls: int = 0
+    list_tools_hits: int = 0
+    list_tools_misses: int = 0
+    health_failures: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class _PooledServer:
+    """单个 MCP 服务的共享会话：惰性连接、并发上限、工具 schema 缓存与断线重连。"""
+
+    def __init__(
+        self, key: str, params: McpServerParams, max_concurrency: int, tools_ttl: float
+    ) -> None:
+        self.key = key
+        self.params = params
+        self.stats = PMCAMcpServerStats()
+        self._tools_ttl = tools_ttl
+        self._workbench: Optional[McpWorkbench] = None
+        self._lock = asyncio.Lock()
+        self._tools_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._tools: Optional[List[ToolSchema]] = None
+        self._tools_at = 0.0
+
+    async def _connected(self) -> McpWorkbench:
+        if self._workbench is not None:
+            return self._workbench
+        async with self._lock:
+            if self._workbench is None:
+                workbench = McpWorkbench(server_params=self.params)
+                await workbench.start()
+                self._workbench = workbench
+                self.stats.connects += 1
+                logger.debug(f"[McpPool] connected {self.key}")
+        return self._workbench
+
+    async def _reconnect(self) -> None:
+        async with self._lock:
+            workbench, self._workbench, self._tools = self._workbench, None, None
+        if workbench is not None:
+            try:
+                await workbench.stop()
+            except Exception as e:
+                logger.debug(f"[McpPool] stop {self.key} failed: {e}")
+
+    def _cached_tools(self) -> Optional[List[ToolSchema]]:
+        if self._tools is None:
+            return None
+        if self._tools_ttl and time.monotonic() - self._tools_at >= self._tools_ttl:
+            return None
+        return self._tools
+
+    async def list_tools(self, refresh: bool = False) -> List[ToolSchema]:
+        cached = None if refresh else self._cached_tools()
+        if cached is not None:
+            self.stats.list_tools_hits += 1
+            return cached
+
+        # 并发的未命中合并为一次请求
+        async with self._tools_lock:
+            cached = None if refresh else self._cached_tools()
+            if cached is not None:
+                self.stats.list_tools_hits += 1
+                return cached
+            self.stats.list_tools_misses += 1
+            try:
+                tools = await (await self._connected()).list_tools()
+            except Exception:
+                # 会话可能已断开：重连后重试一次
+                await self._reconnect()
+                tools = await (await self._connected()).list_tools()
+            self._tools, self._tools_at = tools, time.monotonic()
+            return tools
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Optional[Mapping[str, Any]],
+        cancellation_token: Optional[CancellationToken],
+        call_id: Optional[str],
+    ) -> ToolResult:
+        workbench = await self._connected()
+        self.stats.tool_calls += 1
+        if self._slots is None:
+            return await workbench.call_tool(
+                name, arguments, cancellation_token, call_id
+            )
+        async with self._slots:
+            return await workbench.call_tool(
+                name, arguments, cancellation_token, call_id
+            )
+
+    async def health_check(self) -> bool:
+        """保活：对已连接的会话刷新一次工具列表；失败时断开，下次使用时重连。"""
+        if self._workbench is None:
+            return True
+        try:
+            await self.list_tools(refresh=True)
+            return True
+        except Exception as e:
+            self.stats.health_failures += 1
+            logger.warning(f"[McpPool] health check {self.key} failed: {e}")
+            await self._reconnect()
+            return False
+
+    async def close(self) -> None:
+        await self._reconnect()
+
+
+class PMCAPooledMcpWorkbench(Workbench):
+    """
+    从 PMCAMcpSessionPool 租用的 Workbench：工具调用转发到进程级共享会话。
+    start / stop 不会建立或关闭真实连接（由连接池统一管理）。
+    """
+
+    def __init__(self, server: _PooledServer) -> None:
+        self._server = server
+
+    @property
+    def server_params(self) -> McpServerParams:
+        return self._server.params
+
+    async def list_tools(self) -> List[ToolSchema]:
+        return await self._server.list_tools()
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Mapping[str, Any] | None = None,
+        cancellation_token: CancellationToken | None = None,
+        call_id: str | None = None,
+    ) -> ToolResult:
+        return await self._server.call_tool(
+            name, arguments, cancellation_token, call_id
+        )
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def reset(self) -> None:
+        return None
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        return None
+
+
+class PMCAMcpSessionPool:
+    """
+    进程级 MCP 会话池：按 (服务键, 连接参数) 共享一个长连接，所有任务的智能体从中租用 Workbench。
+    - 首次使用时连接，之后只在健康检查失败或会话断开时重连
+    - 每个服务的工具调用受 max_concurrency 限制；list_tools 结果缓存 tools_ttl 秒
+    - keepalive_seconds > 0 时后台定期做健康检查
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        tools_ttl: float = 300.0,
+        keepalive_seconds: float = 60.0,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._tools_ttl = tools_ttl
+        self._keepalive_seconds = keepalive_seconds
+        self._servers: Dict[str, _PooledServer] = {}
+        # 租用可能来自工作线程（swarm / 惰性智能体 / 预热的同步构建），get-or-create 需加锁
+        self._servers_lock = threading.Lock()
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, env: Any) -> "PMCAMcpSessionPool":
+        return cls(
+            max_concurrency=env.MCP_POOL_MAX_CONCURRENCY,
+            tools_ttl=env.MCP_POOL_TOOLS_TTL_SECONDS,
+            keepalive_seconds=env.MCP_POOL_KEEPALIVE_SECONDS,
+        )
+
+    def lease(self, key: str, params: McpServerParams) -> PMCAPooledMcpWorkbench:
+        pool_key = f"{key}:{params.model_dump_json()}"
+        with self._servers_lock:
+            server = self._servers.get(pool_key)
+            if server is None:
+                server = self._servers[pool_key] = _PooledServer(
+                    key, params, self._max_concurrency, self._tools_ttl
+                )
+            server.stats.leases += 1
+        self._ensure_keepalive()
+        return PMCAPooledMcpWorkbench(server)
+
+    def _ensure_keepalive(self) -> None:
+        if self._keepalive_seconds <= 0 or self._keepalive_task is not None:
+            return
+        try:
+            self._keepalive_task = asyncio.get_running_loop().create_task(
+                self._keepalive()
+            )
+        except RuntimeError:
+            # 不在事件循环中（同步构建阶段）：下次租用时再启动
+            pass
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self._keepalive_seconds)
+            for server in list(self._servers.values()):
+                await server.health_check()
+
+    async def health_check(self) -> Dict[str, bool]:
+        return {
+            server.key: await server.health_check()
+            for server in list(self._servers.values())
+        }
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            server.key: server.stats.to_dict()
+            for server in list(self._servers.values())
+        }
+
+    async def close_all(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            try:
+                await self._keepalive_task
+            except BaseException:
+                pass
+            self._keepalive_task = None
+        with self._servers_lock:
+            servers = list(self._servers.values())
+            self._servers.clear()
+        for server in servers:
+            await server.close()
+
+
+_pool: Optional[PMCAMcpSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def mcp_session_pool() -> PMCAMcpSessionPool:
+    """进程级默认会话池（按 MCP_POOL_* 配置惰性创建；可在工作线程中调用）。"""
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            from base.configs import PMCASystemEnvConfig
+
+            _pool = PMCAMcpSessionPool.from_config(PMCASystemEnvConfig)
+    return _pool
+
+
+async def close_mcp_session_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        logger.info(f"MCP session pool closed: {pool.stats()}")
+        await pool.close_all()
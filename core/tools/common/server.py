@@ -23,7 +23,14 @@ def build_functional_workbenches(ctx: "PMCATaskContext") -> List[Workbench]:
     读取 .env 中的 FUNCTIONAL_MCP_SERVER（单值）和/或 FUNCTIONAL_SERVER_*（多值），
     统一构造成 McpWorkbench 列表（自动判断SSE|HTTP）。
     """
+    from .mcp_pool import mcp_session_pool
+
     server_params_map = ctx.task_env.get_functional_servers()
+    if ctx.task_env.MCP_POOL:
+        return [
+            mcp_session_pool().lease(key, params)
+            for key, params in server_params_map.items()
+        ]
     return [McpWorkbench(server_params=params) for params in server_params_map.values()]
 
 
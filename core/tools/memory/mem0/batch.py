@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from loguru import logger
+from mem0 import Memory
+
+from core.memory.factory.mem0.embedding_cache import PMCACachedEmbedder
+
+# 批量事实抽取的分组输出约定：替换单条抽取提示词中的 “输出格式要求” 部分（含示例）
+GROUPED_FACT_EXTRACTION_FORMAT = """**输出格式要求（批量输入）:**
+本次输入包含多条相互独立的内容，每条以 "[序号]" 开头。请分别对每一条独立抽取事实，
+不要把不同条目的信息合并。你必须返回一个 JSON 对象，其根键为 "items"：
+{"items": [{"index": 序号, "facts": ["事实1", "事实2"]}]}
+没有可抽取事实的条目，facts 输出空数组。
+禁止使用 Markdown 代码块包裹，禁止在 JSON 前后添加任何其他文本。
+
+"""
+
+# 单条抽取提示词中输出格式部分的起止标记（见 base/configs/mem0config.py）
+_FORMAT_SECTION_START = "**输出格式要求:**"
+_FORMAT_SECTION_END = "**重要准则:**"
+
+
+def grouped_extraction_prompt(prompt: str) -> str:
+    """把单条事实抽取提示词改写为分组版本：替换输出格式与示例，去掉引用单条格式（"facts"）的行。"""
+    start = prompt.find(_FORMAT_SECTION_START)
+    end = prompt.find(_FORMAT_SECTION_END, start)
+    if start < 0 or end < 0:
+        return prompt.rstrip() + "\n\n" + GROUPED_FACT_EXTRACTION_FORMAT
+    tail = "\n".join(
+        line for line in prompt[end:].splitlines() if '"facts"' not in line
+    )
+    return prompt[:start] + GROUPED_FACT_EXTRACTION_FORMAT + tail
+
+
+def embed_batch(memory: Memory, texts: Sequence[str]) -> List[List[float]]:
+    """
+    对多条文本做一次批量嵌入请求：
+    - Ollama：client.embed(input=[...])
+    - OpenAI 兼容：client.embeddings.create(input=[...])
+    - 其他嵌入器：退化为逐条 embed
+    嵌入模型带缓存包装时，只对未命中缓存的文本发起请求。
+    """
+    if not texts:
+        return []
+    embedder = memory.embedding_model
+    if isinstance(embedder, PMCACachedEmbedder):
+        return embedder.embed_many(
+            texts, "add", lambda misses: _embed_uncached(embedder.inner, misses)
+        )
+    return _embed_uncached(embedder, texts)
+
+
+def _embed_uncached(embedder: Any, texts: Sequence[str]) -> List[List[float]]:
+    client = getattr(embedder, "client", None)
+    model = getattr(embedder.config, "model", None)
+    try:
+        if client is not None and hasattr(client, "embed") and model:
+            response = client.embed(model=model, input=list(texts))
+            vectors = response["embeddings"]
+            if len(vectors) == len(texts):
+                return [list(v) for v in vectors]
+        embeddings_api = getattr(client, "embeddings", None)
+        if embeddings_api is not None and hasattr(embeddings_api, "create") and model:
+            response = embeddings_api.create(input=list(texts), model=model)
+            return [d.embedding for d in response.data]
+    except Exception as e:
+        logger.warning(f"[Mem0Batch] batched embedding failed, fallback: {e}")
+    return [embedder.embed(text, "add") for text in texts]
+
+
+def extract_facts_grouped(
+    memory: Memory, contents: Sequence[str], group_size: int
+) -> List[Optional[List[str]]]:
+    """
+    按 group_size 条一组做事实抽取（每组一次 LLM 调用）。
+    返回与 contents 对齐的事实列表；某组调用或解析失败（含缺少 "items"）时，该组条目为 None。
+    """
+    system_prompt = grouped_extraction_prompt(
+        memory.config.custom_fact_extraction_prompt
+        or "从输入中抽取值得长期记忆的事实。"
+    )
+
+    out: List[Optional[List[str]]] = [None] * len(contents)
+    step = max(1, group_size)
+    for start in range(0, len(contents), step):
+        group = contents[start : start + step]
+        user_prompt = "Input:\n" + "\n".join(
+            f"[{i}] {text}" for i, text in enumerate(group)
+        )
+        try:
+            response = memory.llm.generate_response(
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format={"type": "json_object"},
+            )
+            text = response.strip()
+            if text.startswith("```"):
+                text = text.strip("`").split("\n", 1)[-1]
+            items = json.loads(text).get("items")
+            if not isinstance(items, list):
+                raise ValueError(f"missing 'items' in response: {text[:200]}")
+        except Exception as e:
+            logger.warning(f"[Mem0Batch] grouped fact extraction failed: {e}")
+            continue
+        for item in items:
+            index = item.get("index")
+            if isinstance(index, int) and 0 <= index < len(group):
+                out[start + index] = [str(f) for f in item.get("facts") or [] if f]
+        # 模型漏掉的条目视为没有事实
+        for i in range(len(group)):
+            if out[start + i] is None:
+                out[start + i] = []
+    return out
+
+
+def insert_batch(
+    memory: Memory,
+    texts: Sequence[str],
+    vectors: Sequence[List[float]],
+    metadatas: Sequence[Dict[str, Any]],
+) -> List[str]:
+    """一次 upsert 写入多条记忆；payload 字段与 mem0 单条写入保持一致，并补写历史记录。"""
+    created_at = datetime.now(timezone.utc).isoformat()
+    ids = [str(uuid.uuid4()) for _ in texts]
+    payloads = []
+    for text, metadata in zip(texts, metadatas):
+        payload = dict(metadata)
+        payload.update(
+            data=text,
+            hash=hashlib.md5(text.encode()).hexdigest(),
+            created_at=created_at,
+        )
+        payloads.append(payload)
+
+    memory.vector_store.insert(vectors=list(vectors), ids=ids, payloads=payloads)
+    for memory_id, payload in zip(ids, payloads):
+        memory.db.add_history(
+            memory_id,
+            None,
+            payload["data"],
+            "ADD",
+            created_at=created_at,
+            actor_id=payload.get("actor_id"),
+            role=payload.get("role"),
+        )
+    return ids
+
+
+def add_to_graph(
+    memory: Memory, contents: Sequence[str], filters: Dict[str, Any]
+) -> List[Optional[str]]:
+    """
+    与 m.add 一致，把每条原文写入图存储（未配置图存储时跳过）。
+    返回与 contents 对齐的错误信息（成功为 None）。
+    """
+    if not getattr(memory, "enable_graph", False):
+        return [None] * len(contents)
+    errors: List[Optional[str]] = []
+    for content in contents:
+        try:
+            memory.graph.add(content, dict(filters))
+            errors.append(None)
+        except Exception as e:
+            logger.warning(f"[Mem0Batch] graph add failed: {e}")
+            errors.append(str(e))
+    return errors
+
+
+def existing_hashes(
+    memory: Memory,
+    digests: Sequence[str],
+    filters: Dict[str, Any],
+) -> Set[str]:
+    """
+    digests 中已存在于集合（满足 filters）的内容 hash，用于跳过与已有记忆完全相同的写入。
+    一次按 hash 过滤的 scroll（Qdrant MatchAny），而不是逐条近邻检索；查询失败时视为都不存在。
+    """
+    wanted = list(dict.fromkeys(digests))
+    if not wanted:
+        return set()
+    store = memory.vector_store
+    try:
+        from qdrant_client.models import FieldCondition, Filter, MatchAny
+
+        base = store._create_filter(filters)
+        conditions = list(base.must) if base is not None else []
+        conditions.append(FieldCondition(key="hash", match=MatchAny(any=wanted)))
+        found: Set[str] = set()
+        offset = None
+        while True:
+            points, offset = store.client.scroll(
+                collection_name=store.collection_name,
+                scroll_filter=Filter(must=conditions),
+                limit=len(wanted),
+                offset=offset,
+                with_payload=["hash"],
+                with_vectors=False,
+            )
+            found.update((p.payload or {}).get("hash") for p in points)
+            if offset is None:
+                return found
+    except Exception as e:
+        logger.warning(f"[Mem0Batch] hash lookup failed: {e}")
+        return set()
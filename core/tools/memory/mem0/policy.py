@@ -7,5 +7,8 @@ class PMCAMem0OpsPolicy:
     ALLOW_AUTO_CREATE: bool = False
     DEFAULT_ADD_INFER: bool = True  # 抽取失败是否不落库（更干净）
     MAX_LIST_BATCH: int = 1000
+    MAX_ADD_BATCH: int = 100  # 批量写入单次最多条数
+    FACT_GROUP_SIZE: int = 8  # 批量写入 infer 时，每次事实抽取 LLM 调用合并的条数
+    BATCH_ADD_GRAPH: bool = False  # 批量写入是否同步写图存储（每条一次图抽取，含多次 LLM 调用；大批量时抵消分组抽取的收益）
     HTTP_TIMEOUT_S: int = 800
     DEFAULT_QDRANT_DISTANCE: str = "Cosine"  # 与嵌入一致（bge-m3）
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 import copy
+import hashlib
 import threading
 import unicodedata
 from typing import Any, Dict, List, Optional, Tuple
@@ -12,6 +13,14 @@ from loguru import logger
 from mem0 import Memory
 
 from base.configs import mem0config
+from core.memory.factory.mem0 import PMCAMem0Registry, PMCAMem0SearchCache
+from .batch import (
+    add_to_graph,
+    embed_batch,
+    existing_hashes,
+    extract_facts_grouped,
+    insert_batch,
+)
 from .policy import PMCAMem0OpsPolicy
 from core.tools.factory import PMCAToolProvider
 
@@ -50,8 +59,7 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             raise ValueError("memory_contract 必须是 dict")
         self._contract_by_assistant[assistant_name] = contract
 
-    # ======== 内部缓存/锁 ========
-    _mem_cache: Dict[str, Tuple[Memory, str]] = {}
+    # ======== 内部锁（Memory 实例由 PMCAMem0Registry 统一缓存） ========
     _lock = threading.Lock()
 
     def _ensure_contract_loaded(self, assistant_name: str) -> None:
@@ -346,6 +354,7 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
         ):
             if user_id or agent_id or run_id:
                 res = m.delete_all(user_id=user_id, agent_id=agent_id, run_id=run_id)
+                self._invalidate(m)
                 return {"ok": True, "raw": res, "mode": "delete_all"}
             return {
                 "ok": False,
@@ -369,8 +378,15 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             if mid:
                 m.delete(mid)
                 deleted += 1
+        if deleted:
+            self._invalidate(m)
         return {"ok": True, "deleted": deleted, "mode": "list_then_delete"}
 
+    @staticmethod
+    def _invalidate(m: Memory) -> None:
+        """集合发生写入：递增版本号，使其检索结果缓存失效。"""
+        PMCAMem0SearchCache.bump(m.collection_name)
+
     # ======== Memory 实例解析（与你之前一致的单例+集合切换） ========
     @classmethod
     def _memory_for(
@@ -380,34 +396,28 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
         create_if_missing: bool = False,
         check_exists: bool = True,
     ) -> Tuple[Memory, str]:
-        pair = cls._mem_cache.get(target_assistant)
-        if pair:
-            return pair
-
         collection_name = _snake(target_assistant)
-        with cls._lock:
-            pair = cls._mem_cache.get(target_assistant)
-            if pair:
-                return pair
+        # 与智能体的 Mem0Memory 共用进程级注册表中的同一实例；
+        # 已注册智能体的集合在惰性初始化下可能尚未创建，memory() 会经 from_config 建好
+        if PMCAMem0Registry.is_known(collection_name):
+            return PMCAMem0Registry.memory(collection_name), collection_name
 
-            cfg = copy.deepcopy(mem0config.PMCAMem0LocalConfig)
-            cfg.setdefault("vector_store", {}).setdefault("config", {}).update(
-                collection_name=collection_name
-            )
+        with cls._lock:
+            if not PMCAMem0Registry.has(collection_name):
+                cfg = PMCAMem0Registry.config_for(collection_name)
 
-            if create_if_missing and not PMCAMem0OpsPolicy.ALLOW_AUTO_CREATE:
-                raise RuntimeError(f"全局已禁用自动创建集合：{collection_name}")
+                if create_if_missing and not PMCAMem0OpsPolicy.ALLOW_AUTO_CREATE:
+                    raise RuntimeError(f"全局已禁用自动创建集合：{collection_name}")
 
-            if check_exists and not cls._qdrant_collection_exists(collection_name, cfg):
-                if create_if_missing:
-                    cls._qdrant_create_collection(collection_name, cfg)
-                else:
-                    raise RuntimeError(f"目标集合未供给: {collection_name}")
+                if check_exists and not cls._qdrant_collection_exists(
+                    collection_name, cfg
+                ):
+                    if create_if_missing:
+                        cls._qdrant_create_collection(collection_name, cfg)
+                    else:
+                        raise RuntimeError(f"目标集合未供给: {collection_name}")
 
-            memory = Memory.from_config(config_dict=cfg)
-            pair = (memory, collection_name)
-            cls._mem_cache[target_assistant] = pair
-            return pair
+            return PMCAMem0Registry.memory(collection_name), collection_name
 
     # ======== 统一 add（保留你原有统一封装思想；此处只融合“契约”与 infer 覆盖） ========
     def _add_unified(
@@ -465,6 +475,7 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             kwargs.pop("infer", None)
             kwargs.pop("metadata", None)
             res = m.add(content, **{k: v for k, v in kwargs.items() if v is not None})
+        self._invalidate(m)
 
         mem_id = self._extract_first_id(res)
         if not mem_id:
@@ -475,6 +486,118 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             }
         return {"ok": True, "id": mem_id, "raw": res}
 
+    # ======== 批量 add：统一校验、一次嵌入、一次 upsert；infer 时分组抽取事实 ========
+    def _add_batch_unified(
+        self,
+        m: Memory,
+        *,
+        items: List[Dict[str, Any]],
+        user_id: str,
+        agent_id: str,
+        run_id: Optional[str],
+        assistant_name: str,
+    ) -> Dict[str, Any]:
+        if len(items) > PMCAMem0OpsPolicy.MAX_ADD_BATCH:
+            return {
+                "ok": False,
+                "error": f"单次最多写入 {PMCAMem0OpsPolicy.MAX_ADD_BATCH} 条，当前 {len(items)} 条",
+            }
+
+        results: List[Dict[str, Any]] = [
+            {"index": i, "ok": False} for i in range(len(items))
+        ]
+        # 1) 逐条套用契约
+        valid: List[Tuple[int, str, Dict[str, Any]]] = []
+        infer_override: Optional[bool] = None
+        for i, item in enumerate(items):
+            content = item.get("content") if isinstance(item, dict) else None
+            if not isinstance(content, str) or not content.strip():
+                results[i]["error"] = "content 不能为空"
+                continue
+            canon_md, md_err, infer_override = self._apply_contract_on_metadata(
+                assistant_name, item.get("metadata")
+            )
+            if md_err:
+                results[i]["error"] = md_err
+                continue
+            md = dict(canon_md or {})
+            md.update(user_id=user_id, agent_id=agent_id, role="user")
+            if run_id:
+                md["run_id"] = run_id
+            valid.append((i, content, md))
+
+        infer_value = (
+            infer_override
+            if isinstance(infer_override, bool)
+            else PMCAMem0OpsPolicy.DEFAULT_ADD_INFER
+        )
+
+        # 2) 待写入文本：infer 时为分组抽取出的事实，否则为原文
+        rows: List[Tuple[int, str, Dict[str, Any]]] = []
+        if infer_value and valid:
+            facts = extract_facts_grouped(
+                m, [c for _, c, _ in valid], PMCAMem0OpsPolicy.FACT_GROUP_SIZE
+            )
+            for (i, _, md), item_facts in zip(valid, facts):
+                if item_facts is None:
+                    results[i]["error"] = "事实抽取失败"
+                elif not item_facts:
+                    results[i]["error"] = "未抽取到可存的记忆"
+                else:
+                    rows.extend((i, fact, md) for fact in item_facts)
+        else:
+            rows = valid
+
+        # 3) 跳过与已有记忆（一次按 hash 过滤的查询）或本批次内完全相同的内容，其余一次批量嵌入
+        digests = [hashlib.md5(text.encode()).hexdigest() for _, text, _ in rows]
+        seen = existing_hashes(m, digests, {"user_id": user_id})
+        fresh = []
+        for (i, text, md), digest in zip(rows, digests):
+            if digest in seen:
+                results[i]["skipped"] = results[i].get("skipped", 0) + 1
+                results[i]["ok"] = True
+                continue
+            seen.add(digest)
+            fresh.append((i, text, md))
+        vectors = embed_batch(m, [text for _, text, _ in fresh])
+        to_insert = [
+            (i, text, md, vector) for (i, text, md), vector in zip(fresh, vectors)
+        ]
+
+        # 4) 一次 upsert
+        if to_insert:
+            ids = insert_batch(
+                m,
+                [text for _, text, _, _ in to_insert],
+                [vector for _, _, _, vector in to_insert],
+                [md for _, _, md, _ in to_insert],
+            )
+            self._invalidate(m)
+            for (i, _, _, _), mem_id in zip(to_insert, ids):
+                results[i].setdefault("ids", []).append(mem_id)
+                results[i]["ok"] = True
+                results[i].pop("error", None)
+
+        # 5) 图存储：与 m.add 一样按原文写入（每条一次图抽取），只处理有新记忆写入的条目
+        if to_insert and PMCAMem0OpsPolicy.BATCH_ADD_GRAPH:
+            written = sorted({i for i, _, _, _ in to_insert})
+            graph_filters = {"user_id": user_id, "agent_id": agent_id}
+            if run_id:
+                graph_filters["run_id"] = run_id
+            contents = {i: c for i, c, _ in valid}
+            errors = add_to_graph(m, [contents[i] for i in written], graph_filters)
+            for i, error in zip(written, errors):
+                if error:
+                    results[i]["graph_error"] = error
+
+        added = sum(len(r.get("ids", [])) for r in results)
+        return {
+            "ok": any(r["ok"] for r in results),
+            "added": added,
+            "infer": infer_value,
+            "results": results,
+        }
+
     # =========================
     # 对外：为某个“调用者智能体”暴露工具集
     # =========================
@@ -563,14 +686,16 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             dict: { ok: bool, items: List[...], raw: Any, error?: str }
             """
             try:
-                m, _ = _self_mem()
+                m, collection = _self_mem()
                 flt = filters.copy() if isinstance(filters, dict) else {}
                 flt.setdefault("user_id", assistant_name)
                 if run_id:
                     flt["run_id"] = run_id
                 if only_written_by_me:
                     flt["agent_id"] = assistant_name
-                res = m.search(
+                res = PMCAMem0SearchCache.search(
+                    collection,
+                    m,
                     query,
                     user_id=_snake(assistant_name),
                     limit=limit,
@@ -679,6 +804,7 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
                     if metadata is not None:
                         data["metadata"] = metadata
                 res = m.update(memory_id, data=data)
+                self._invalidate(m)
                 return {"ok": True, "id": memory_id, "raw": res}
             except Exception as e:
                 logger.exception("update_memory failed")
@@ -699,6 +825,7 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             try:
                 m, _ = _self_mem()
                 m.delete(memory_id)
+                self._invalidate(m)
                 return {"ok": True, "id": memory_id}
             except Exception as e:
                 logger.exception("delete_memory failed")
@@ -841,6 +968,54 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             )
         )
 
+        def add_memories_for_other(
+            target_assistant: str,
+            items: List[Dict[str, Any]],
+            run_id: Optional[str] = None,
+        ) -> Dict[str, Any]:
+            """
+            [代办] 为目标智能体批量写入记忆。
+
+            参数
+            ----
+            target_assistant : str
+                目标智能体名。
+            items : List[dict]
+                每条形如 {"content": str, "metadata": dict(可选)}。
+            run_id : str, optional
+                批次标识（整批共用）。
+
+            返回
+            ----
+            dict: { ok, added, infer, results: [{index, ok, ids?, skipped?, error?}], error? }
+            """
+            try:
+                m, _ = _target_mem(target_assistant)
+                contract_holder = (
+                    target_assistant
+                    if PMCAMem0OpsPolicy.CONTRACT_SCOPE == "target"
+                    else assistant_name
+                )
+                return self._add_batch_unified(
+                    m,
+                    items=items,
+                    user_id=_snake(target_assistant),
+                    agent_id=assistant_name,
+                    run_id=run_id,
+                    assistant_name=contract_holder,
+                )
+            except Exception as e:
+                logger.exception("add_memories_for_other failed")
+                return {"ok": False, "error": str(e)}
+
+        tools.append(
+            FunctionTool(
+                name="add_memories_for_other",
+                description="[other] 为目标智能体批量写入多条记忆（一次嵌入、一次写入，返回逐条结果）",
+                func=add_memories_for_other,
+            )
+        )
+
         def search_memories_for_other(
             target_assistant: str,
             query: str,
@@ -854,14 +1029,16 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             [代办] 在“目标智能体”的集合中检索。
             """
             try:
-                m, _ = _target_mem(target_assistant)
+                m, collection = _target_mem(target_assistant)
                 flt = filters.copy() if isinstance(filters, dict) else {}
                 flt.setdefault("user_id", target_assistant)
                 if run_id:
                     flt["run_id"] = run_id
                 if only_written_by_me:
                     flt["agent_id"] = assistant_name
-                res = m.search(
+                res = PMCAMem0SearchCache.search(
+                    collection,
+                    m,
                     query,
                     user_id=_snake(target_assistant),
                     limit=limit,
@@ -915,6 +1092,7 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
                     if metadata is not None:
                         data["metadata"] = metadata
                 res = m.update(memory_id, data=data)
+                self._invalidate(m)
                 return {"ok": True, "id": memory_id, "raw": res}
             except Exception as e:
                 logger.exception("update_memory_for_other failed")
@@ -937,6 +1115,7 @@ class PMCAMem0ToolsProvider(PMCAToolProvider):
             try:
                 m, _ = _target_mem(target_assistant)
                 m.delete(memory_id)
+                self._invalidate(m)
                 return {"ok": True, "id": memory_id}
             except Exception as e:
                 logger.exception("delete_memory_for_other failed")
@@ -18,9 +18,25 @@ async def main():
         event_classes=[TriageEvent, TriageSummaryEvent, AssistantStatusEvent],
     )
 
-    controller = PMCAFlowController(task_ctx)
-    flow = await controller.overall_graph
-    await Console(flow.run_stream())
+    try:
+        controller = PMCAFlowController(task_ctx)
+        flow = await controller.overall_graph
+        await Console(flow.run_stream())
+    finally:
+        # 各清理步骤互不依赖：任一步失败（如 Redis 不可用）仍继续释放后续资源
+        try:
+            await runtime.collect_task_metrics(task_ctx)
+        except Exception as e:
+            logger.warning(f"任务计量写入失败: {e}")
+        try:
+            await runtime.archive_task_context(task_ctx)
+        except Exception as e:
+            logger.warning(f"任务工作台归档失败: {e}")
+        try:
+            await task_ctx.close()
+        except Exception as e:
+            logger.warning(f"任务上下文关闭失败: {e}")
+        await runtime.shutdown()
 
 
 if __name__ == "__main__":
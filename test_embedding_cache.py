@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from core.memory.factory.mem0.embedding_cache import (
+    PMCACachedEmbedder,
+    PMCAEmbeddingCache,
+)
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.config = SimpleNamespace(model="bge-m3")
+        self.calls = []
+
+    def embed(self, text, memory_action=None):
+        self.calls.append((text, memory_action))
+        return [float(len(text)), 0.5, -1.0]
+
+
+def test_normalize_and_key():
+    assert PMCAEmbeddingCache.normalize("  a　b \n\tc ") == "a b c"
+    # NFKC：全角字符与半角等价
+    assert PMCAEmbeddingCache.normalize("ＡＢＣ１") == "ABC1"
+    assert PMCAEmbeddingCache.key("m", " x  y") == PMCAEmbeddingCache.key("m", "x y")
+    assert PMCAEmbeddingCache.key("m", "x") != PMCAEmbeddingCache.key("n", "x")
+
+
+def test_lru_eviction_and_stats():
+    cache = PMCAEmbeddingCache(max_entries=2)
+    cache.set("a", [1.0], 0.5)
+    cache.set("b", [2.0], 0.5)
+    assert cache.get("a") == [1.0]  # a 变为最近使用
+    cache.set("c", [3.0], 0.5)  # 淘汰最久未用的 b
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+    assert cache.stats.saved_seconds == 1.5
+
+
+def test_get_returns_independent_float32_copy():
+    cache = PMCAEmbeddingCache()
+    cache.set("k", [0.1, 0.2], 0.0)
+    vector = cache.get("k")
+    vector.append(9.0)
+
+    again = cache.get("k")
+    assert len(again) == 2
+    assert abs(again[0] - 0.1) < 1e-6
+
+
+def test_cached_embedder_shares_entries_across_actions():
+    inner = FakeEmbedder()
+    embedder = PMCACachedEmbedder(inner, PMCAEmbeddingCache(), "ollama")
+
+    first = embedder.embed("你好  世界", "add")
+    second = embedder.embed("你好 世界", "search")
+
+    assert first == second
+    assert len(inner.calls) == 1
+
+
+def test_embed_many_only_requests_misses():
+    inner = FakeEmbedder()
+    embedder = PMCACachedEmbedder(inner, PMCAEmbeddingCache(), "ollama")
+    embedder.embed("a", "add")
+    requested = []
+
+    def embed_misses(texts):
+        requested.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    vectors = embedder.embed_many(["a", "bb", "a"], "add", embed_misses)
+
+    assert requested == [["bb"]]
+    assert vectors[0] == vectors[2] == [1.0, 0.5, -1.0]
+    assert vectors[1] == [2.0]
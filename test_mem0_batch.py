@@ -0,0 +1,84 @@
+import json
+from types import SimpleNamespace
+
+from base.configs.mem0config import CUSTOM_FACT_EXTRACTION_PROMPT
+from core.tools.memory.mem0.batch import (
+    GROUPED_FACT_EXTRACTION_FORMAT,
+    extract_facts_grouped,
+    grouped_extraction_prompt,
+)
+
+
+class FakeLLM:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def generate_response(self, messages, response_format=None):
+        self.prompts.append(messages[-1]["content"])
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def fake_memory(responses, prompt=CUSTOM_FACT_EXTRACTION_PROMPT):
+    return SimpleNamespace(
+        config=SimpleNamespace(custom_fact_extraction_prompt=prompt),
+        llm=FakeLLM(responses),
+    )
+
+
+def test_grouped_prompt_replaces_single_item_format():
+    prompt = grouped_extraction_prompt(CUSTOM_FACT_EXTRACTION_PROMPT)
+
+    assert GROUPED_FACT_EXTRACTION_FORMAT in prompt
+    assert '"facts":' not in prompt.replace(GROUPED_FACT_EXTRACTION_FORMAT, "")
+    assert "**输出格式要求:**" not in prompt
+    # 格式段之外的内容保留
+    assert "**重要准则:**" in prompt
+    head = CUSTOM_FACT_EXTRACTION_PROMPT.split("**输出格式要求:**")[0]
+    assert prompt.startswith(head)
+
+
+def test_grouped_prompt_appends_format_without_markers():
+    prompt = grouped_extraction_prompt("抽取事实。")
+    assert prompt.startswith("抽取事实。")
+    assert prompt.endswith(GROUPED_FACT_EXTRACTION_FORMAT)
+
+
+def test_extract_facts_grouped_aligns_items():
+    responses = [
+        json.dumps(
+            {
+                "items": [
+                    {"index": 1, "facts": ["b1", ""]},
+                    {"index": 0, "facts": ["a1", "a2"]},
+                    {"index": 9, "facts": ["越界"]},
+                ]
+            },
+            ensure_ascii=False,
+        ),
+        '```json\n{"items": [{"index": 0, "facts": []}]}\n```',
+    ]
+    memory = fake_memory(responses)
+
+    facts = extract_facts_grouped(memory, ["a", "b", "c", "d"], group_size=2)
+
+    # 第二组：c 为空事实，d 被模型遗漏也视为空
+    assert facts == [["a1", "a2"], ["b1"], [], []]
+    assert memory.llm.prompts[0] == "Input:\n[0] a\n[1] b"
+    assert memory.llm.prompts[1] == "Input:\n[0] c\n[1] d"
+
+
+def test_extract_facts_grouped_failed_group_is_none():
+    responses = [
+        '{"facts": ["单条格式"]}',
+        RuntimeError("LLM down"),
+        '{"items": [{"index": 0, "facts": ["e1"]}]}',
+    ]
+    memory = fake_memory(responses)
+
+    facts = extract_facts_grouped(memory, ["a", "b", "c", "d", "e"], group_size=2)
+
+    assert facts == [None, None, None, None, ["e1"]]
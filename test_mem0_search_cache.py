@@ -0,0 +1,77 @@
+import pytest
+
+from base.configs import PMCASystemEnvConfig
+from core.memory.factory.mem0.search_cache import (
+    PMCAMem0SearchCache,
+    PMCAMem0SearchCacheStats,
+)
+
+
+class FakeMemory:
+    def __init__(self, on_search=None):
+        self.calls = 0
+        self.on_search = on_search
+
+    def search(self, query, **kwargs):
+        self.calls += 1
+        if self.on_search is not None:
+            self.on_search()
+        return {"results": [{"memory": f"{query}#{self.calls}"}]}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(PMCASystemEnvConfig, "MEM0_SEARCH_CACHE", True)
+    monkeypatch.setattr(PMCASystemEnvConfig, "MEM0_SEARCH_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr(PMCASystemEnvConfig, "MEM0_SEARCH_CACHE_MAX_ENTRIES", 256)
+    monkeypatch.setattr(PMCAMem0SearchCache, "_versions", {})
+    monkeypatch.setattr(PMCAMem0SearchCache, "_entries", {})
+    monkeypatch.setattr(PMCAMem0SearchCache, "stats", PMCAMem0SearchCacheStats())
+
+
+def test_hit_returns_copy():
+    memory = FakeMemory()
+    first = PMCAMem0SearchCache.search("c", memory, "q", user_id="u", limit=5)
+    first["results"].clear()
+    second = PMCAMem0SearchCache.search("c", memory, "q", user_id="u", limit=5)
+
+    assert memory.calls == 1
+    assert second == {"results": [{"memory": "q#1"}]}
+    assert PMCAMem0SearchCache.stats.hits == 1
+
+
+def test_bump_invalidates_collection_only():
+    memory = FakeMemory()
+    PMCAMem0SearchCache.search("c", memory, "q")
+    PMCAMem0SearchCache.search("other", memory, "q")
+
+    PMCAMem0SearchCache.bump("c")
+    assert PMCAMem0SearchCache.version("c") == 1
+    assert PMCAMem0SearchCache.version("other") == 0
+
+    PMCAMem0SearchCache.search("c", memory, "q")
+    PMCAMem0SearchCache.search("other", memory, "q")
+    assert memory.calls == 3
+    assert PMCAMem0SearchCache.stats.invalidations == 1
+
+
+def test_write_during_search_is_not_cached():
+    """检索期间集合发生写入：结果照常返回，但不写入缓存。"""
+    memory = FakeMemory(on_search=lambda: PMCAMem0SearchCache.bump("c"))
+    result = PMCAMem0SearchCache.search("c", memory, "q")
+
+    assert result == {"results": [{"memory": "q#1"}]}
+    assert PMCAMem0SearchCache.stats.stale_drops == 1
+
+    memory.on_search = None
+    PMCAMem0SearchCache.search("c", memory, "q")
+    PMCAMem0SearchCache.search("c", memory, "q")
+    assert memory.calls == 2
+
+
+def test_key_ignores_surrounding_whitespace_only():
+    memory = FakeMemory()
+    PMCAMem0SearchCache.search("c", memory, "  q ", limit=5)
+    PMCAMem0SearchCache.search("c", memory, "q", limit=5)
+    PMCAMem0SearchCache.search("c", memory, "q", limit=10)
+    assert memory.calls == 2
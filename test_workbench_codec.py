@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from base.runtime.workbench_codec import (
+    _HEADER_LEN,
+    _MAGIC,
+    PMCAValueCodec,
+    orjson,
+    zstandard,
+)
+
+VALUE = {"task": "分诊", "items": [1, 2.5, None, True], "nested": {"k": "v"}}
+
+
+@pytest.mark.parametrize(
+    "codec, compression",
+    [
+        ("json", "none"),
+        pytest.param(
+            "orjson",
+            "none",
+            marks=pytest.mark.skipif(orjson is None, reason="orjson 未安装"),
+        ),
+        pytest.param(
+            "json",
+            "zstd",
+            marks=pytest.mark.skipif(zstandard is None, reason="zstandard 未安装"),
+        ),
+    ],
+)
+def test_round_trip_with_header(codec, compression):
+    value_codec = PMCAValueCodec(codec, compression, compress_threshold=0)
+    raw = value_codec.encode(VALUE)
+
+    assert raw.startswith(_MAGIC)
+    assert raw[len(_MAGIC)] == value_codec.codec.codec_id
+    assert raw[len(_MAGIC) + 1] == value_codec.compressor.compression_id
+    assert value_codec.decode(raw) == VALUE
+
+
+def test_decode_uses_header_not_current_config():
+    """按头部解码：配置切换后仍能读出旧配置写入的值。"""
+    raw = PMCAValueCodec("json").encode(VALUE)
+    reader = PMCAValueCodec("orjson" if orjson is not None else "json")
+    assert reader.decode(raw) == VALUE
+
+
+def test_legacy_json_values_decode():
+    """无头部的旧数据按 JSON 文本解码（bytes 与 str 均可）。"""
+    codec = PMCAValueCodec()
+    legacy = json.dumps(VALUE, ensure_ascii=False)
+
+    assert codec.decode(legacy) == VALUE
+    assert codec.decode(legacy.encode("utf-8")) == VALUE
+    assert codec.decode(None) is None
+    assert codec.decode(b"") is None
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard 未安装")
+def test_compression_threshold():
+    codec = PMCAValueCodec("json", "zstd", compress_threshold=256)
+    small = {"text": "x" * 10}
+    large = {"text": "x" * 4096}
+
+    small_raw = codec.encode(small)
+    large_raw = codec.encode(large)
+
+    # 小于阈值不压缩，头部记录为 none
+    assert small_raw[len(_MAGIC) + 1] == 0
+    assert small_raw[_HEADER_LEN:] == json.dumps(small).encode("utf-8")
+    # 达到阈值时压缩
+    assert large_raw[len(_MAGIC) + 1] == codec.compressor.compression_id
+    assert len(large_raw) < len(json.dumps(large))
+    assert codec.decode(small_raw) == small
+    assert codec.decode(large_raw) == large
+
+
+def test_unknown_codec_rejected():
+    with pytest.raises(ValueError):
+        PMCAValueCodec("pickle")
+    with pytest.raises(ValueError):
+        PMCAValueCodec(compression="brotli")